@@ -0,0 +1,181 @@
+# Copyright 2021 99cloud
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""JSON responses of the API.
+
+``APIJSONResponse`` writes JSON with the library chosen by ``json_library``,
+it is the default response class of the routes of the API, see ``APIRoute``.
+
+The handlers of the extension API build the items of a listing as plain
+dicts. ``model_response`` turns them into the JSON body of the response in
+one step, FastAPI returns a ``Response`` as is, without validating it
+against the response model of the route again.
+
+When ``validate_responses`` is enabled the content is validated once by the
+response model and written by pydantic. Otherwise the content is trusted:
+it is only projected onto the fields of the response model, so that the
+body has the same keys, and written by ``dumps``.
+"""
+
+from __future__ import annotations
+
+import datetime
+import enum
+import functools
+import json
+import types
+import uuid
+from decimal import Decimal
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    List,
+    Mapping,
+    Optional,
+    Tuple,
+    Type,
+    Union,
+    get_args,
+    get_origin,
+)
+
+import orjson
+from fastapi import routing
+from fastapi.datastructures import Default, DefaultPlaceholder
+from pydantic import BaseModel
+from pydantic_core import to_json
+from starlette.responses import JSONResponse, Response
+
+from skyline_apiserver.config import CONF
+from skyline_apiserver.types import JSONLibrary
+
+_Projector = Callable[[Any], Any]
+_NoneType = type(None)
+
+
+def _default(obj: Any) -> Any:
+    """Encode the values json does not know, orjson already does most."""
+    if isinstance(obj, BaseModel):
+        return obj.model_dump(mode="json")
+    if isinstance(obj, enum.Enum):
+        return obj.value
+    if isinstance(obj, uuid.UUID):
+        return str(obj)
+    if isinstance(obj, (datetime.datetime, datetime.date, datetime.time)):
+        return obj.isoformat()
+    if isinstance(obj, Decimal):
+        return int(obj) if obj == obj.to_integral_value() else float(obj)
+    if isinstance(obj, (set, frozenset)):
+        return list(obj)
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def dumps(content: Any) -> bytes:
+    """Serialize ``content`` with the library chosen by ``json_library``."""
+    if CONF.default.json_library == JSONLibrary.orjson:
+        return orjson.dumps(content, default=_default, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(
+        content,
+        default=_default,
+        ensure_ascii=False,
+        allow_nan=False,
+        indent=None,
+        separators=(",", ":"),
+    ).encode("utf-8")
+
+
+class APIJSONResponse(JSONResponse):
+    """JSON response written by ``dumps``."""
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
+
+
+class APIRoute(routing.APIRoute):
+    """Route writing its responses with ``APIJSONResponse`` by default.
+
+    The response class of the route is left as a default rather than set:
+    FastAPI writes the response model of a route with pydantic directly when
+    no response class is set, which is faster than ``APIJSONResponse`` on
+    the python objects of the model. Routes without a response model, and
+    the FastAPI versions without that fast path, use ``APIJSONResponse``.
+    """
+
+    def __init__(self, path: str, endpoint: Callable[..., Any], **kwargs: Any) -> None:
+        response_class = kwargs.get("response_class")
+        if response_class is None or isinstance(response_class, DefaultPlaceholder):
+            kwargs["response_class"] = Default(APIJSONResponse)
+        super().__init__(path, endpoint, **kwargs)
+
+
+def _value_projector(annotation: Any) -> Optional[_Projector]:
+    """Return how to project a value of ``annotation``, None to keep it."""
+    origin = get_origin(annotation)
+    if origin in (Union, types.UnionType):
+        args = [arg for arg in get_args(annotation) if arg is not _NoneType]
+        return _value_projector(args[0]) if len(args) == 1 else None
+    if origin in (list, List):
+        args = get_args(annotation)
+        item = _value_projector(args[0]) if args else None
+        if item is None:
+            return None
+        return lambda value: value if value is None else [item(v) for v in value]
+    if isinstance(annotation, type) and issubclass(annotation, BaseModel):
+        return _model_projector(annotation)
+    return None
+
+
+@functools.lru_cache(maxsize=None)
+def _model_projector(model: Type[BaseModel]) -> _Projector:
+    fields: List[Tuple[str, Any, Optional[_Projector]]] = []
+    for name, field in model.model_fields.items():
+        default = None if field.is_required() else field.get_default(call_default_factory=True)
+        fields.append((field.alias or name, default, _value_projector(field.annotation)))
+
+    def project(value: Any) -> Any:
+        if value is None:
+            return None
+        if isinstance(value, BaseModel):
+            value = value.__dict__
+        obj: Dict[str, Any] = {}
+        for key, default, projector in fields:
+            item = value.get(key, default)
+            obj[key] = item if projector is None else projector(item)
+        return obj
+
+    return project
+
+
+def dump_json(model: Type[BaseModel], content: Any) -> bytes:
+    """Serialize ``content`` as an instance of ``model``."""
+    if CONF.default.validate_responses:
+        return to_json(model.model_validate(content))
+    return dumps(_model_projector(model)(content))
+
+
+def model_response(
+    model: Type[BaseModel],
+    content: Any,
+    headers: Optional[Mapping[str, str]] = None,
+) -> Response:
+    """Return ``content`` serialized as ``model``, see ``dump_json``.
+
+    FastAPI does not copy the headers set on the ``Response`` parameter of a
+    handler to a response the handler returns, pass them as ``headers``.
+    """
+    return Response(dump_json(model, content), headers=headers, media_type="application/json")
+
+
+__all__ = ("APIJSONResponse", "APIRoute", "dump_json", "dumps", "model_response")
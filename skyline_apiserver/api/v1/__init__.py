@@ -14,9 +14,10 @@
 
 from fastapi import APIRouter
 
+from skyline_apiserver.api.responses import APIRoute
 from skyline_apiserver.api.v1 import contrib, extension, login, policy, prometheus, setting
 
-api_router = APIRouter()
+api_router = APIRouter(route_class=APIRoute)
 api_router.include_router(login.router, tags=["Login"])
 api_router.include_router(extension.router, tags=["Extension"])
 api_router.include_router(prometheus.router, tags=["Prometheus"])
@@ -24,10 +24,11 @@ from starlette.requests import Request
 
 from skyline_apiserver import schemas
 from skyline_apiserver.api import deps
+from skyline_apiserver.api.responses import APIRoute
 from skyline_apiserver.client.openstack import system
 from skyline_apiserver.client.openstack.system import get_domains, get_endpoints, get_regions
 
-router = APIRouter()
+router = APIRouter(route_class=APIRoute)
 
 
 @router.get(
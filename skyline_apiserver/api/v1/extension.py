@@ -14,7 +14,7 @@
 
 from __future__ import annotations
 
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Set, Tuple, Union
 
 from cinderclient.exceptions import NotFound
 from dateutil import parser
@@ -22,28 +22,245 @@ from fastapi import status
 from fastapi.param_functions import Depends, Header, Query
 from fastapi.routing import APIRouter
 from starlette.requests import Request
+from starlette.responses import Response, StreamingResponse
 
 from skyline_apiserver import schemas
 from skyline_apiserver.api import deps
-from skyline_apiserver.api.wrapper.openstack import OSPort, OSServer, OSVolume, OSVolumeSnapshot
+from skyline_apiserver.api.responses import APIRoute, dump_json, model_response
+from skyline_apiserver.api.wrapper.openstack import OSPort
 from skyline_apiserver.api.wrapper.skyline import Port, Server, Service, Volume, VolumeSnapshot
 from skyline_apiserver.client import utils
-from skyline_apiserver.client.openstack import cinder, glance, keystone, neutron, nova
+from skyline_apiserver.client.aio import AsyncOpenStackClient
+from skyline_apiserver.client.openstack import cinder, glance, neutron, nova
 from skyline_apiserver.client.utils import generate_session, get_system_session
 from skyline_apiserver.config import CONF
+from skyline_apiserver.core.projects import PROJECTS
 from skyline_apiserver.log import LOG
-from skyline_apiserver.schemas.extension import (
-    ComputeServicesResponseBase,
-    PortsResponseBase,
-    RecycleServersResponseBase,
-)
+from skyline_apiserver.schemas.extension import ComputeServicesResponseBase, PortsResponseBase
 from skyline_apiserver.types import constants
+from skyline_apiserver.utils.cache import TTLCache
+from skyline_apiserver.utils.fanout import FanOut
 from skyline_apiserver.utils.roles import assert_system_admin_or_reader, is_system_reader_no_admin
 
-router = APIRouter()
+router = APIRouter(route_class=APIRoute)
 
 STEP = constants.ID_UUID_RANGE_STEP
 
+SERVER_NAMES: Optional[TTLCache] = None
+NETWORK_NAMES: Optional[TTLCache] = None
+IMAGES: Optional[TTLCache] = None
+
+_MISSING = object()
+
+
+def get_server_name_cache() -> TTLCache:
+    global SERVER_NAMES
+    if SERVER_NAMES is None:
+        SERVER_NAMES = TTLCache(
+            maxsize=CONF.default.server_name_cache_size,
+            ttl=CONF.default.server_name_cache_ttl,
+        )
+    return SERVER_NAMES
+
+
+def get_server_names(
+    profile: schemas.Profile,
+    session: Any,
+    global_request_id: str,
+    server_ids: Iterable[str],
+    all_projects: bool,
+    soft_deleted: bool = False,
+) -> Dict[str, Optional[str]]:
+    """Resolve the names of servers by id.
+
+    Only the servers missing from the cache are looked up. Nova keeps a
+    single ``uuid`` filter value per listing, so each server is a call of
+    its own, the calls run concurrently. ``soft_deleted`` also looks for the
+    servers not found in the recycle bin. Names, and servers not found, are
+    cached for ``server_name_cache_ttl`` seconds.
+    """
+    cache = get_server_name_cache()
+    scope = "*" if all_projects else profile.project.id
+
+    def cache_key(server_id: str) -> Any:
+        return (profile.region, scope, soft_deleted, server_id)
+
+    names: Dict[str, Optional[str]] = {}
+    missing = []
+    for server_id in set(server_ids):
+        name = cache.get(cache_key(server_id), _MISSING)
+        if name is _MISSING:
+            missing.append(server_id)
+        else:
+            names[server_id] = name
+
+    statuses = [{}, {"status": "soft_deleted", "deleted": True}] if soft_deleted else [{}]
+
+    def lookup(server_id: str) -> None:
+        name = None
+        for extra_opts in statuses:
+            servers = nova.list_servers(
+                profile=profile,
+                session=session,
+                global_request_id=global_request_id,
+                search_opts={"uuid": server_id, "all_tenants": all_projects, **extra_opts},
+                detailed=False,
+            )
+            if servers:
+                name = servers[0].name
+                break
+        names[server_id] = name
+        cache.set(cache_key(server_id), name)
+
+    fanout = FanOut(max_concurrency=CONF.default.fanout_concurrency)
+    for server_id in missing:
+        fanout.submit("server_names", lookup, server_id)
+    fanout.wait()
+    return names
+
+
+def get_network_name_cache() -> TTLCache:
+    global NETWORK_NAMES
+    if NETWORK_NAMES is None:
+        NETWORK_NAMES = TTLCache(
+            maxsize=CONF.default.network_name_cache_size,
+            ttl=CONF.default.network_name_cache_ttl,
+        )
+    return NETWORK_NAMES
+
+
+def get_network_names(
+    profile: schemas.Profile,
+    session: Any,
+    global_request_id: str,
+    network_ids: Set[str],
+    all_projects: bool,
+) -> Dict[str, str]:
+    """Resolve the names of networks, cached per region for every user.
+
+    Neutron is only called for the networks missing from the cache, the
+    shared networks and the networks of the project, or of all projects,
+    are then listed by chunks of ids and all of them are cached.
+    """
+    cache = get_network_name_cache()
+    names: Dict[str, str] = {}
+    missing = []
+    for network_id in network_ids:
+        name = cache.get((profile.region, network_id), _MISSING)
+        if name is _MISSING:
+            missing.append(network_id)
+        else:
+            names[network_id] = name
+    if not missing:
+        return names
+
+    network_params: Dict[str, Any] = {}
+    if not all_projects:
+        network_params["project_id"] = profile.project.id
+    fanout = FanOut(max_concurrency=CONF.default.fanout_concurrency)
+    batches = [
+        fanout.submit(
+            "networks",
+            neutron.list_networks,
+            profile=profile,
+            session=session,
+            global_request_id=global_request_id,
+            **{"shared": True},
+        )
+    ]
+    # We should split the network_ids with 100 number.
+    # If we do not do this, the length of url will be too long to do request.
+    for i in range(0, len(missing), STEP):
+        batches.append(
+            fanout.submit(
+                "networks",
+                neutron.list_networks,
+                profile=profile,
+                session=session,
+                global_request_id=global_request_id,
+                **{**network_params, "id": set(missing[i : i + STEP])},
+            )
+        )
+    fanout.wait()
+    for batch in batches:
+        for net in batch.result().get("networks", []):
+            cache.set((profile.region, net["id"]), net["name"])
+            names[net["id"]] = net["name"]
+    return names
+
+
+def get_image_cache() -> TTLCache:
+    global IMAGES
+    if IMAGES is None:
+        IMAGES = TTLCache(
+            maxsize=CONF.default.image_cache_size,
+            ttl=CONF.default.image_cache_ttl,
+        )
+    return IMAGES
+
+
+def get_cached_image_metadata(
+    profile: schemas.Profile,
+    image_ids: List[str],
+) -> Tuple[Dict[str, Dict[str, Any]], List[List[str]]]:
+    """Return the cached name and os distro of images, and the chunks of
+    image ids missing from the cache of the region.
+    """
+    cache = get_image_cache()
+    image_mappings: Dict[str, Dict[str, Any]] = {}
+    missing = []
+    for image_id in image_ids:
+        image_info = cache.get((profile.region, image_id), _MISSING)
+        if image_info is _MISSING:
+            missing.append(image_id)
+        elif image_info is not None:
+            image_mappings[image_id] = image_info
+    return image_mappings, [missing[i : i + STEP] for i in range(0, len(missing), STEP)]
+
+
+def list_image_metadata(
+    profile: schemas.Profile,
+    session: Any,
+    global_request_id: str,
+    image_ids: List[str],
+) -> Dict[str, Dict[str, Any]]:
+    """List one chunk of images from glance and merge them into the cache
+    of the region. Images glance does not return are cached as missing too.
+    """
+    cache = get_image_cache()
+    image_mappings: Dict[str, Dict[str, Any]] = {}
+    images = glance.list_images(
+        profile=profile,
+        session=session,
+        global_request_id=global_request_id,
+        filters={"id": "in:" + ",".join(image_ids)},
+    )
+    for image in images:
+        image_mappings[image.id] = {
+            "name": image.name,
+            "image_os_distro": getattr(image, "os_distro", None),
+        }
+    for image_id in image_ids:
+        cache.set((profile.region, image_id), image_mappings.get(image_id))
+    return image_mappings
+
+
+def get_image_metadata(
+    profile: schemas.Profile,
+    session: Any,
+    global_request_id: str,
+    image_ids: List[str],
+) -> Dict[str, Dict[str, Any]]:
+    """Return the name and os distro of images, cached per region.
+
+    Only the images missing from the cache are listed from glance, by
+    chunks of ids.
+    """
+    image_mappings, chunks = get_cached_image_metadata(profile, image_ids)
+    for chunk in chunks:
+        image_mappings.update(list_image_metadata(profile, session, global_request_id, chunk))
+    return image_mappings
+
 
 @router.get(
     "/extension/servers",
@@ -124,7 +341,7 @@ def list_servers(
             "Also passed to Nova API if supported."
         ),
     ),
-) -> schemas.ServersResponse:
+) -> Union[schemas.ServersResponse, Response]:
     original_ip = deps.get_original_ip(request)
     all_projects = all_projects or False
     if all_projects:
@@ -141,23 +358,21 @@ def list_servers(
 
     # Check first if we supply the project_name filter.
     if project_name:
-        filter_projects = keystone.list_projects(
-            profile=profile,
-            session=system_session,
+        filter_project_ids = PROJECTS.find_ids(
+            profile.region,
+            project_name,
             global_request_id=x_openstack_request_id,
-            all_projects=all_projects,
-            search_opts={"name": project_name},
         )
-        if not filter_projects:
+        if not filter_project_ids:
             return schemas.ServersResponse(**{"servers": []})
         else:
             # Projects will not have the same name or same id in the same domain
-            filter_project = filter_projects[0]
+            filter_project_id = filter_project_ids[0]
             # When we both supply the project_id and project_name filter, if the project's id does
             # not equal the project_id, just return [].
-            if project_id and filter_project.id != project_id:
+            if project_id and filter_project_id != project_id:
                 return schemas.ServersResponse(**{"servers": []})
-            project_id = filter_project.id
+            project_id = filter_project_id
 
     search_opts = {
         "name": name,
@@ -170,24 +385,25 @@ def list_servers(
     }
     if ip is not None:
         search_opts["ip"] = ip
-    servers = nova.list_servers(
-        profile=profile,
-        session=current_session,
-        global_request_id=x_openstack_request_id,
-        search_opts=search_opts,
-        marker=marker,
-        limit=limit,
-        sort_keys=[sort_key.value for sort_key in sort_keys] if sort_keys else None,
-        sort_dirs=[sort_dirs.value] if sort_dirs else None,
-    )
+    fanout = FanOut(max_concurrency=CONF.default.fanout_concurrency)
+    with fanout.timer("servers"):
+        servers = nova.list_servers(
+            profile=profile,
+            session=current_session,
+            global_request_id=x_openstack_request_id,
+            search_opts=search_opts,
+            marker=marker,
+            limit=limit,
+            sort_keys=[sort_key.value for sort_key in sort_keys] if sort_keys else None,
+            sort_dirs=[sort_dirs.value] if sort_dirs else None,
+        )
 
     result: List = []
     server_ids = set()
     image_ids = set()
     root_device_ids = set()
     for server in servers:
-        origin_data = OSServer(server).to_dict()
-        server = Server(server).to_dict()
+        server, origin_data = Server(server).to_dicts()
         server["origin_data"] = origin_data
         result.append(server)
         server_ids.add(server["id"])
@@ -196,36 +412,61 @@ def list_servers(
         for volume_attached in server["volumes_attached"]:
             root_device_ids.add(volume_attached["id"])
 
-    # Get all images and merge image_mappings
-    images = []
-    image_ids_list = list(image_ids)
-    for i in range(0, len(image_ids_list), STEP):
-        images_batch = glance.list_images(
+    # The images, root device volumes and projects only depend on the
+    # servers, so their lookups run concurrently.
+    # Each chunk of images missing from the cache is its own lookup.
+    image_mappings, image_chunks = get_cached_image_metadata(profile, list(image_ids))
+    image_batches = [
+        fanout.submit(
+            "images",
+            list_image_metadata,
             profile=profile,
             session=system_session,
             global_request_id=x_openstack_request_id,
-            filters={"id": "in:" + ",".join(image_ids_list[i : i + STEP])},
+            image_ids=chunk,
         )
-        images.extend(images_batch)
-    image_mappings = {
-        image.id: {
-            "name": image.name,
-            "image_os_distro": getattr(image, "os_distro", None),
-        }
-        for image in images
-    }
-
-    # Get all root device volumes and merge ser_image_mappings
+        for chunk in image_chunks
+    ]
     root_device_ids_list = list(root_device_ids)
-    volumes = []
-    for i in range(0, len(root_device_ids_list), STEP):
-        volumes_batch = cinder.list_volumes(
+    volume_batches = [
+        fanout.submit(
+            "volumes",
+            cinder.list_volumes,
             profile=profile,
             session=system_session,
             global_request_id=x_openstack_request_id,
             search_opts={"id": root_device_ids_list[i : i + STEP], "all_tenants": True},
         )
-        volumes.extend(volumes_batch)
+        for i in range(0, len(root_device_ids_list), STEP)
+    ]
+    project_id_name_map: Dict[str, str] = {}
+    project_lookups = {}
+    if all_projects:
+        project_id_name_map, missing_project_ids = PROJECTS.get_cached_names(
+            profile.region,
+            {server["project_id"] for server in result},
+        )
+        project_lookups = {
+            project_id: fanout.submit(
+                "projects",
+                PROJECTS.lookup,
+                profile.region,
+                project_id,
+                global_request_id=x_openstack_request_id,
+            )
+            for project_id in missing_project_ids
+        }
+    fanout.wait()
+    for project_id, lookup in project_lookups.items():
+        name = lookup.result()
+        if name is not None:
+            project_id_name_map[project_id] = name
+
+    for batch in image_batches:
+        image_mappings.update(batch.result())
+
+    # Merge ser_image_mappings
+    volumes = [volume for batch in volume_batches for volume in batch.result()]
     ser_image_mappings = {}
     for volume in volumes:
         image_meta = getattr(volume, "volume_image_metadata", None)
@@ -252,19 +493,17 @@ def list_servers(
             server["image_name"] = None
             server["image_os_distro"] = None
     if all_projects:
-        projects = keystone.list_projects(
-            profile=profile,
-            session=current_session,
-            global_request_id=x_openstack_request_id,
-            all_projects=True,
-        )
-        project_id_name_map = {project.id: project.name for project in projects}
         for server in result:
             server["project_name"] = project_id_name_map.get(
                 server["project_id"], server["project_id"]
             )
 
-    return schemas.ServersResponse(**{"servers": result})
+    LOG.debug(f"List servers timings: {fanout.timings()}")
+    return model_response(
+        schemas.ServersResponse,
+        {"servers": result},
+        headers={"Server-Timing": fanout.server_timing()},
+    )
 
 
 @router.get(
@@ -337,7 +576,7 @@ def list_recycle_servers(
             "(only fixed, not floating). Also passed to Nova API if supported."
         ),
     ),
-) -> schemas.RecycleServersResponse:
+) -> Union[schemas.RecycleServersResponse, Response]:
     original_ip = deps.get_original_ip(request)
     all_projects = all_projects or False
     if all_projects:
@@ -349,25 +588,22 @@ def list_recycle_servers(
         project_id = None
         project_name = None
 
-    current_session = generate_session(profile, original_ip=original_ip)
     system_session = get_system_session(original_ip=original_ip)
 
     # Check first if we supply the project_name filter.
     if project_name:
-        filter_projects = keystone.list_projects(
-            profile=profile,
-            session=system_session,
+        filter_project_ids = PROJECTS.find_ids(
+            profile.region,
+            project_name,
             global_request_id=x_openstack_request_id,
-            all_projects=all_projects,
-            search_opts={"name": project_name},
         )
-        if not filter_projects:
+        if not filter_project_ids:
             return schemas.RecycleServersResponse(**{"recycle_servers": []})
         else:
-            filter_project = filter_projects[0]
-            if project_id and filter_project.id != project_id:
+            filter_project_id = filter_project_ids[0]
+            if project_id and filter_project_id != project_id:
                 return schemas.RecycleServersResponse(**{"recycle_servers": []})
-            project_id = filter_project.id
+            project_id = filter_project_id
 
     # The deleted args will be ignored if non-admin user. So we have to use system session.
     # System session don't have current project info. So we have to use all_tenants & project_id.
@@ -394,15 +630,14 @@ def list_recycle_servers(
         sort_dirs=[sort_dirs.value] if sort_dirs else None,
     )
 
-    result: List[RecycleServersResponseBase] = []
+    result: List[Dict[str, Any]] = []
     server_ids = []
     image_ids = []
     root_device_ids = []
     for server in servers:
-        origin_data = OSServer(server).to_dict()
-        server = Server(server).to_dict()
+        server, origin_data = Server(server).to_dicts()
         server["origin_data"] = origin_data
-        result.append(RecycleServersResponseBase.parse_obj(server))
+        result.append(server)
         server_ids.append(server["id"])
         if server["image"] and server["image"] not in image_ids:
             image_ids.append(server["image"])
@@ -410,22 +645,12 @@ def list_recycle_servers(
             root_device_ids.append(volume_attached["id"])
 
     # Get all images and merge image_mappings
-    images = []
-    for i in range(0, len(image_ids), STEP):
-        images_batch = glance.list_images(
-            profile=profile,
-            session=system_session,
-            global_request_id=x_openstack_request_id,
-            filters={"id": "in:" + ",".join(image_ids[i : i + STEP])},
-        )
-        images.extend(images_batch)
-    image_mappings = {
-        image.id: {
-            "name": image.name,
-            "image_os_distro": getattr(image, "os_distro", None),
-        }
-        for image in images
-    }
+    image_mappings = get_image_metadata(
+        profile=profile,
+        session=system_session,
+        global_request_id=x_openstack_request_id,
+        image_ids=image_ids,
+    )
 
     # Get all root device volumes and merge ser_image_mappings
     root_device_ids = list(set(root_device_ids))
@@ -451,38 +676,34 @@ def list_recycle_servers(
 
     # enrich server
     for recycle_server in result:
-        recycle_server.host = recycle_server.host if all_projects else None
-        recycle_server.project_name = None
-        recycle_server.deleted_at = recycle_server.updated_at
-        recycle_server.reclaim_timestamp = (
-            parser.isoparse(str(recycle_server.updated_at or "")).timestamp()
+        recycle_server["host"] = recycle_server["host"] if all_projects else None
+        recycle_server["project_name"] = None
+        recycle_server["deleted_at"] = recycle_server["updated_at"]
+        recycle_server["reclaim_timestamp"] = (
+            parser.isoparse(str(recycle_server["updated_at"] or "")).timestamp()
             + CONF.openstack.reclaim_instance_interval
         )
-        ser_image_mapping = ser_image_mappings.get(recycle_server.id)
+        ser_image_mapping = ser_image_mappings.get(recycle_server["id"])
         if ser_image_mapping:
-            recycle_server.image = ser_image_mapping["image"]
-            recycle_server.image_name = ser_image_mapping["image_name"]
-            recycle_server.image_os_distro = ser_image_mapping["image_os_distro"]
-        elif recycle_server.image:
-            image_info = image_mappings.get(recycle_server.image, {})
-            recycle_server.image_name = image_info.get("name", "")
-            recycle_server.image_os_distro = image_info.get("image_os_distro", "")
+            recycle_server.update(ser_image_mapping)
+        elif recycle_server["image"]:
+            image_info = image_mappings.get(recycle_server["image"], {})
+            recycle_server["image_name"] = image_info.get("name", "")
+            recycle_server["image_os_distro"] = image_info.get("image_os_distro", "")
         else:
-            recycle_server.image_name = None
-            recycle_server.image_os_distro = None
+            recycle_server["image_name"] = None
+            recycle_server["image_os_distro"] = None
     if all_projects:
-        projects = keystone.list_projects(
-            profile=profile,
-            session=current_session,
+        project_id_name_map = PROJECTS.get_names(
+            profile.region,
+            {recycle_server["project_id"] for recycle_server in result},
             global_request_id=x_openstack_request_id,
-            all_projects=True,
         )
-        project_id_name_map = {project.id: project.name for project in projects}
         for recycle_server in result:
-            recycle_server.project_name = project_id_name_map.get(
-                recycle_server.project_id, recycle_server.project_id
+            recycle_server["project_name"] = project_id_name_map.get(
+                recycle_server["project_id"], recycle_server["project_id"]
             )
-    return schemas.RecycleServersResponse(recycle_servers=result)
+    return model_response(schemas.RecycleServersResponse, {"recycle_servers": result})
 
 
 @router.get(
@@ -545,7 +766,7 @@ def list_volumes(
     uuid: Optional[List[str]] = Query(
         None, description="Filter the list of volumes by the given volumes UUID."
     ),
-) -> schemas.VolumesResponse:
+) -> Union[schemas.VolumesResponse, Response]:
     original_ip = deps.get_original_ip(request)
     all_projects = all_projects or False
     current_session = generate_session(profile, original_ip=original_ip)
@@ -603,55 +824,28 @@ def list_volumes(
         sort=sort,
     )
     result = []
-    server_ids_set = set()
+    server_ids = set()
     for volume in volumes:
-        origin_data = OSVolume(volume).to_dict()
-        volume = Volume(volume).to_dict()
+        volume, origin_data = Volume(volume).to_dicts()
         volume["origin_data"] = origin_data
         result.append(volume)
         for attachment in volume["attachments"]:
             server_id = attachment.get("server_id")
             if server_id:
-                server_ids_set.add(server_id)
+                server_ids.add(server_id)
 
     # Sometimes, the servers have been soft deleted, but the volumes will
     # be still displayed on the volume page. If we do not get the recycle
     # servers, the attachment server name for those volumes which are attached
     # to these servers will be blank.
-    server_ids = list(server_ids_set)
-    server_name_map = {}
-    servers = []
-    for server_id in server_ids:
-        normal_servers = nova.list_servers(
-            profile=profile,
-            session=current_session,
-            global_request_id=x_openstack_request_id,
-            search_opts={
-                "uuid": server_id,
-                "all_tenants": all_projects,
-            },
-        )
-        if normal_servers:
-            servers.extend(normal_servers)
-
-    # Query soft deleted server
-    for server_id in server_ids:
-        soft_deleted_servers = nova.list_servers(
-            profile=profile,
-            session=current_session,
-            global_request_id=x_openstack_request_id,
-            search_opts={
-                "uuid": server_id,
-                "status": "soft_deleted",
-                "deleted": True,
-                "all_tenants": all_projects,
-            },
-        )
-        if soft_deleted_servers:
-            servers.extend(soft_deleted_servers)
-
-    for server in servers:
-        server_name_map[server.id] = server.name
+    server_name_map = get_server_names(
+        profile=profile,
+        session=current_session,
+        global_request_id=x_openstack_request_id,
+        server_ids=server_ids,
+        all_projects=all_projects,
+        soft_deleted=True,
+    )
 
     for volume in result:
         for attachment in volume["attachments"]:
@@ -659,7 +853,7 @@ def list_volumes(
             if server_id:
                 attachment["server_name"] = server_name_map.get(server_id)
 
-    return schemas.VolumesResponse(**{"count": count, "volumes": result})
+    return model_response(schemas.VolumesResponse, {"count": count, "volumes": result})
 
 
 @router.get(
@@ -710,7 +904,7 @@ def list_volume_snapshots(
     uuid: Optional[str] = Query(
         None, description="Filter the list of snapshots by the given snapshot UUID."
     ),
-) -> schemas.VolumeSnapshotsResponse:
+) -> Union[schemas.VolumeSnapshotsResponse, Response]:
     original_ip = deps.get_original_ip(request)
     all_projects = all_projects or False
     if all_projects:
@@ -777,22 +971,19 @@ def list_volume_snapshots(
     volume_ids = []
     snapshot_ids = []
     for volume_snapshot in volume_snapshots:
-        origin_data = OSVolumeSnapshot(volume_snapshot).to_dict()
-        volume_snapshot = VolumeSnapshot(volume_snapshot).to_dict()
+        volume_snapshot, origin_data = VolumeSnapshot(volume_snapshot).to_dicts()
         volume_snapshot["origin_data"] = origin_data
         result.append(volume_snapshot)
         volume_ids.append(volume_snapshot["volume_id"])
         snapshot_ids.append(volume_snapshot["id"])
 
+    proj_mappings = {}
     if all_projects:
-        projects = keystone.list_projects(
-            profile=profile,
-            session=current_session,
+        proj_mappings = PROJECTS.get_names(
+            profile.region,
+            {snapshot["project_id"] for snapshot in result},
             global_request_id=x_openstack_request_id,
-            all_projects=all_projects,
         )
-    else:
-        projects = []
 
     volume_ids = list(set(volume_ids))
     all_volumes = []
@@ -826,7 +1017,6 @@ def list_volume_snapshots(
         )
         all_volumes_from_snapshot.extend(volumes_from_snapshot)
 
-    proj_mappings = {project.id: project.name for project in projects}
     vol_mappings = {}
     for volume in all_volumes:
         vol_mappings[volume.id] = {
@@ -849,15 +1039,23 @@ def list_volume_snapshots(
             snapshot["volume_name"] = vol_mapping["name"]
             snapshot["host"] = vol_mapping["host"] if all_projects else None
         snapshot["child_volumes"] = child_volumes.get(snapshot["id"], [])
-    return schemas.VolumeSnapshotsResponse(**{"count": count, "volume_snapshots": result})
+    return model_response(
+        schemas.VolumeSnapshotsResponse,
+        {"count": count, "volume_snapshots": result},
+    )
 
 
 @router.get(
     "/extension/ports",
-    description="List Ports.",
+    description=(
+        "List Ports. With stream, the ports of all the pages from the marker on are "
+        "returned and limit is the size of the pages requested from neutron."
+    ),
     responses={
+        400: {"model": schemas.BadRequestMessage},
         401: {"model": schemas.UnauthorizedMessage},
         403: {"model": schemas.ForbiddenMessage},
+        404: {"model": schemas.NotFoundMessage},
         500: {"model": schemas.InternalServerErrorMessage},
     },
     response_model=schemas.PortsResponse,
@@ -915,7 +1113,14 @@ def list_ports(
     uuid: Optional[List[str]] = Query(
         None, description="Filter the list of ports by the given port UUID."
     ),
-) -> schemas.PortsResponse:
+    stream: bool = Query(
+        False,
+        description=(
+            "Stream the ports of all the pages from the marker on, page by page. "
+            "The limit is then the size of the pages requested from neutron."
+        ),
+    ),
+) -> Union[schemas.PortsResponse, Response]:
     original_ip = deps.get_original_ip(request)
     all_projects = all_projects or False
     if all_projects:
@@ -971,72 +1176,111 @@ def list_ports(
         kwargs["sort_dir"] = sort_dir
         kwargs["sort_key"] = sort_keys
 
-    ports = neutron.list_ports(
+    if stream:
+        kwargs["limit"] = limit or constants.EXTENSION_STREAM_PAGE_SIZE
+    pages = neutron.list_ports(
         current_session,
         profile.region,
         x_openstack_request_id,
         **kwargs,
     )
+    # The first page is requested and enriched before the response starts,
+    # so that its errors are returned with their status code.
+    page = neutron.next_page(pages)
+    result = _enrich_ports(
+        profile=profile,
+        session=current_session,
+        global_request_id=x_openstack_request_id,
+        ports=page.get("ports", []) if page else [],
+        all_projects=all_projects,
+    )
+    if stream:
+        return StreamingResponse(
+            _stream_ports(
+                profile=profile,
+                session=current_session,
+                global_request_id=x_openstack_request_id,
+                ports=result,
+                pages=pages,
+                all_projects=all_projects,
+            ),
+            media_type="application/json",
+        )
+    return model_response(schemas.PortsResponse, {"ports": result})
 
-    server_ids = []
+
+def _enrich_ports(
+    profile: schemas.Profile,
+    session: Any,
+    global_request_id: str,
+    ports: List[Dict[str, Any]],
+    all_projects: bool,
+) -> List[Dict[str, Any]]:
+    server_ids = set()
     network_ids = []
-    result: List[PortsResponseBase] = []
-    for port in ports.next().get("ports", []):
+    result: List[Dict[str, Any]] = []
+    for port in ports:
         origin_data = OSPort(port).to_dict()
         port = Port(port).to_dict()
         port["origin_data"] = origin_data
-        result.append(PortsResponseBase.parse_obj(port))
+        result.append(port)
         if port["device_owner"] == "compute:nova":
-            server_ids.append(port["device_id"])
+            server_ids.add(port["device_id"])
         network_ids.append(port["network_id"])
 
-    network_params: Dict[str, Any] = {}
-    shared_nets = neutron.list_networks(
+    network_mappings = get_network_names(
         profile=profile,
-        session=current_session,
-        global_request_id=x_openstack_request_id,
-        **{"shared": True},
+        session=session,
+        global_request_id=global_request_id,
+        network_ids=set(network_ids),
+        all_projects=all_projects,
     )
-    networks_result = []
-    shared_nets_list = shared_nets.get("networks", [])
-    networks_result.extend(shared_nets_list)
+    ser_mappings = get_server_names(
+        profile=profile,
+        session=session,
+        global_request_id=global_request_id,
+        server_ids=server_ids,
+        all_projects=all_projects,
+    )
+    for port in result:
+        port["server_name"] = ser_mappings.get(port["device_id"])
+        port["network_name"] = network_mappings.get(port["network_id"])
+    return result
 
-    if not all_projects:
-        network_params["project_id"] = profile.project.id
-    network_ids = list(set(network_ids))
-    # We should split the network_ids with 100 number.
-    # If we do not do this, the length of url will be too long to do request.
-    for i in range(0, len(network_ids), STEP):
-        network_params["id"] = set(network_ids[i : i + STEP])
-        nets = neutron.list_networks(
-            profile=profile,
-            session=current_session,
-            global_request_id=x_openstack_request_id,
-            **network_params,
-        )
-        nets_list = nets.get("networks", [])
-        networks_result.extend(nets_list)
 
-    server_ids = list(set(server_ids))
-    ser_mappings = {}
-    for server_id in server_ids:
-        servers = nova.list_servers(
-            profile=profile,
-            session=current_session,
-            global_request_id=x_openstack_request_id,
-            search_opts={
-                "uuid": server_id,
-                "all_tenants": all_projects,
-            },
-        )
-        if servers:
-            server = servers[0]
-            ser_mappings[server.id] = server.name
-    network_mappings = {net["id"]: net["name"] for net in networks_result}
-    for port in result:
-        port.server_name = ser_mappings.get(port.device_id)
-        port.network_name = network_mappings.get(port.network_id)
-    return schemas.PortsResponse(ports=result)
+def _stream_ports(
+    profile: schemas.Profile,
+    session: Any,
+    global_request_id: str,
+    ports: List[Dict[str, Any]],
+    pages: Iterable[Dict[str, Any]],
+    all_projects: bool,
+) -> Iterator[bytes]:
+    """Write the ports response page by page as neutron returns them.
+
+    ``ports`` are the enriched ports of the first page, the other pages are
+    requested as the response is written. Only one page of ports is held in
+    memory. The status code is sent with the first chunk, an error on a
+    later page is raised again to abort the response instead of ending it.
+    """
+    yield b'{"ports":[' + b",".join(dump_json(PortsResponseBase, port) for port in ports)
+    separator = b"," if ports else b""
+    try:
+        for page in pages:
+            result = _enrich_ports(
+                profile=profile,
+                session=session,
+                global_request_id=global_request_id,
+                ports=page.get("ports", []),
+                all_projects=all_projects,
+            )
+            if result:
+                yield separator + b",".join(dump_json(PortsResponseBase, port) for port in result)
+                separator = b","
+    except Exception as e:
+        LOG.error(f"Failed to stream ports, aborting the response: {e}")
+        raise
+    yield b"]}"
 
 
 @router.get(
@@ -1052,7 +1296,7 @@ def list_ports(
     response_description="OK",
     response_model_exclude_none=True,
 )
-def compute_services(
+async def compute_services(
     request: Request,
     profile: schemas.Profile = Depends(deps.get_profile_update_jwt),
     x_openstack_request_id: str = Header(
@@ -1078,12 +1322,11 @@ def compute_services(
         kwargs["binary"] = binary
     if host is not None:
         kwargs["host"] = host
-    services = nova.list_services(
-        profile=profile,
+    services = await AsyncOpenStackClient(
         session=system_session,
+        region=profile.region,
         global_request_id=x_openstack_request_id,
-        **kwargs,
-    )
+    ).list_services(**kwargs)
     services = [
         ComputeServicesResponseBase.parse_obj(Service(service).to_dict()) for service in services
     ]
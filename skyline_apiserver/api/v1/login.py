@@ -32,6 +32,7 @@ from starlette.responses import Response
 
 from skyline_apiserver import schemas
 from skyline_apiserver.api import deps
+from skyline_apiserver.api.responses import APIRoute
 from skyline_apiserver.client import utils
 from skyline_apiserver.client.openstack.keystone import get_token_data, get_user, revoke_token
 from skyline_apiserver.client.openstack.system import (
@@ -39,9 +40,11 @@ from skyline_apiserver.client.openstack.system import (
     get_project_scope_token,
     get_projects,
 )
-from skyline_apiserver.client.utils import generate_session, get_system_session
+from skyline_apiserver.client.utils import evict_session, generate_session, get_system_session
 from skyline_apiserver.config import CONF
+from skyline_apiserver.core.revocation import REVOKED_TOKENS
 from skyline_apiserver.core.security import (
+    evict_profile,
     generate_profile,
     generate_profile_by_token,
     parse_access_token,
@@ -50,7 +53,7 @@ from skyline_apiserver.db import api as db_api
 from skyline_apiserver.log import LOG
 from skyline_apiserver.types import constants
 
-router = APIRouter()
+router = APIRouter(route_class=APIRoute)
 
 TOTP_ERROR_INVALID = "invalid_totp"
 TOTP_ERROR_RECEIPT_EXPIRED = "receipt_expired"
@@ -221,6 +224,7 @@ def _get_totp_session(
     totp_auth.add_method(v3_auth.ReceiptMethod(receipt=receipt))
     return Session(
         auth=totp_auth,
+        session=utils.get_http_session(),
         original_ip=original_ip,
         verify=CONF.default.cafile,
         timeout=constants.DEFAULT_TIMEOUT,
@@ -276,6 +280,7 @@ def _get_projects_and_unscope_token(
 
     session = Session(
         auth=unscope_auth,
+        session=utils.get_http_session(),
         original_ip=original_ip,
         verify=CONF.default.cafile,
         timeout=constants.DEFAULT_TIMEOUT,
@@ -667,6 +672,9 @@ def logout(
             session = generate_session(profile, original_ip=original_ip)
             revoke_token(profile, session, x_openstack_request_id, token.keystone_token)
             db_api.revoke_token(profile.uuid, profile.exp)
+            REVOKED_TOKENS.add(profile.uuid, profile.exp)
+            evict_profile(token)
+            evict_session(profile)
         except Exception as e:
             LOG.debug(str(e))
     response.delete_cookie(CONF.default.session_name)
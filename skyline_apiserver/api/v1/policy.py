@@ -28,13 +28,14 @@ from starlette.requests import Request
 
 from skyline_apiserver import schemas
 from skyline_apiserver.api import deps
+from skyline_apiserver.api.responses import APIRoute
 from skyline_apiserver.client.utils import generate_session, get_access, get_system_scope_access
 from skyline_apiserver.config import CONF
 from skyline_apiserver.log import LOG
 from skyline_apiserver.policy import ENFORCER, UserContext
 from skyline_apiserver.types import constants
 
-router = APIRouter()
+router = APIRouter(route_class=APIRoute)
 
 
 def _generate_target(profile: schemas.Profile) -> Dict[str, str]:
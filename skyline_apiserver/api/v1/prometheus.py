@@ -22,12 +22,13 @@ from httpx import codes
 
 from skyline_apiserver import schemas
 from skyline_apiserver.api import deps
+from skyline_apiserver.api.responses import APIRoute
 from skyline_apiserver.config import CONF
 from skyline_apiserver.types import constants
 from skyline_apiserver.utils.httpclient import _http_request
 from skyline_apiserver.utils.roles import is_system_admin_or_reader
 
-router = APIRouter()
+router = APIRouter(route_class=APIRoute)
 
 
 def get_prometheus_query_response(
@@ -21,12 +21,13 @@ from fastapi.routing import APIRouter
 
 from skyline_apiserver import schemas
 from skyline_apiserver.api import deps
+from skyline_apiserver.api.responses import APIRoute
 from skyline_apiserver.config import CONF
-from skyline_apiserver.db import api as db_api
+from skyline_apiserver.db import async_api as db_api
 from skyline_apiserver.types import constants
 from skyline_apiserver.utils.roles import assert_system_admin
 
-router = APIRouter()
+router = APIRouter(route_class=APIRoute)
 
 
 def assert_setting_key_exist(key: str):
@@ -49,7 +50,7 @@ def assert_setting_key_exist(key: str):
     status_code=status.HTTP_200_OK,
     response_description="OK",
 )
-def show_setting(
+async def show_setting(
     key: str,
     profile: schemas.Profile = Depends(deps.get_profile_update_jwt),
 ) -> schemas.Setting:
@@ -57,7 +58,7 @@ def show_setting(
     value = getattr(CONF.setting, key)
     hidden = key in constants.SETTINGS_HIDDEN_SET
     restart_service = key in constants.SETTINGS_RESTART_SET
-    db_setting = db_api.get_setting(key)
+    db_setting = await db_api.get_setting(key)
     if db_setting:
         value = db_setting.value
     return schemas.Setting(
@@ -81,13 +82,13 @@ def show_setting(
     status_code=status.HTTP_200_OK,
     response_description="ok",
 )
-def update_setting(
+async def update_setting(
     setting: schemas.UpdateSetting,
     profile: schemas.Profile = Depends(deps.get_profile_update_jwt),
 ) -> schemas.Setting:
     assert_system_admin(profile=profile, exception="Not allowed to update settings.")
     assert_setting_key_exist(setting.key)
-    db_setting = db_api.update_setting(setting.key, setting.value)
+    db_setting = await db_api.update_setting(setting.key, setting.value)
     hidden = setting.key in constants.SETTINGS_HIDDEN_SET
     restart_service = setting.key in constants.SETTINGS_RESTART_SET
     return schemas.Setting(
@@ -109,7 +110,7 @@ def update_setting(
     status_code=status.HTTP_200_OK,
     response_description="OK",
 )
-def list_settings(
+async def list_settings(
     profile: schemas.Profile = Depends(deps.get_profile_update_jwt),
 ) -> schemas.Settings:
     settings = {
@@ -121,7 +122,7 @@ def list_settings(
         )
         for k in CONF.setting.base_settings
     }
-    db_settings = db_api.list_settings()
+    db_settings = await db_api.list_settings()
     for item in db_settings:
         if item.key in CONF.setting.base_settings:
             settings[item.key].value = item.value
@@ -141,13 +142,13 @@ def list_settings(
     status_code=status.HTTP_200_OK,
     response_description="OK",
 )
-def reset_setting(
+async def reset_setting(
     key: str,
     profile: schemas.Profile = Depends(deps.get_profile_update_jwt),
 ) -> schemas.Setting:
     assert_system_admin(profile, exception="Not allowed to reset settings.")
     assert_setting_key_exist(key)
-    db_api.delete_setting(key)
+    await db_api.delete_setting(key)
     value = getattr(CONF.setting, key)
     return schemas.Setting(
         key=key,
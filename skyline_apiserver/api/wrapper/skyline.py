@@ -14,19 +14,76 @@
 
 from __future__ import annotations
 
-from typing import Any, Dict, List
+import functools
+from operator import itemgetter
+from typing import Any, Callable, Dict, FrozenSet, List, Sequence, Tuple
+
+from skyline_apiserver.api.wrapper.openstack import OSServer, OSVolume, OSVolumeSnapshot
+
+
+@functools.lru_cache(maxsize=None)
+def _class_attrs(cls: type) -> FrozenSet[str]:
+    return frozenset(dir(cls))
+
+
+def _row_getter(indexes: Sequence[int]) -> Callable[[Tuple[Any, ...]], Tuple[Any, ...]]:
+    if len(indexes) == 1:
+        index = indexes[0]
+        return lambda row: (row[index],)
+    if not indexes:
+        return lambda row: ()
+    return itemgetter(*indexes)
 
 
 class APIResourceWrapper(object):
-    """Simple wrapper for api objects."""
+    """Simple wrapper for api objects.
+
+    Define _attrs_mapping on the child class, it maps every key of
+    ``to_dict`` to the attribute of the api object it is read from. A key of
+    _formatters is computed from the attribute of the api object given with
+    it instead. _origin_attrs are the attributes kept as the origin data of
+    the api object, see ``to_dicts``.
+
+    The extractor of every child class is compiled when the class is
+    defined, every attribute is then read once per api object.
+    """
 
     _attrs: List[str] = []
     _attrs_mapping: Dict[str, Any] = {}
+    _formatters: Dict[str, Tuple[str, Callable[[Any], Any]]] = {}
+    _origin_attrs: Sequence[str] = ()
     _apiresource: Any = None
 
+    _fields: Tuple[str, ...] = ()
+    _view_getter: Any = staticmethod(_row_getter(()))
+    _origin_getter: Any = staticmethod(_row_getter(()))
+    _formatted: Tuple[Tuple[str, int, Callable[[Any], Any]], ...] = ()
+
     def __init__(self, apiresource: Any) -> None:
         self._apiresource = apiresource
 
+    def __init_subclass__(cls, **kwargs: Any) -> None:
+        super().__init_subclass__(**kwargs)
+        sources = [
+            cls._formatters[key][0] if key in cls._formatters else value
+            for key, value in cls._attrs_mapping.items()
+        ]
+        # Every attribute is read once, even if both views use it.
+        fields = tuple(dict.fromkeys([*sources, *cls._origin_attrs]))
+        index = {field: i for i, field in enumerate(fields)}
+        cls._fields = fields
+        cls._view_getter = staticmethod(  # type: ignore
+            _row_getter([index[source] for source in sources])
+        )
+        cls._origin_getter = staticmethod(  # type: ignore
+            _row_getter([index[attr] for attr in cls._origin_attrs])
+        )
+        cls._formatted = tuple(
+            (key, index[source], formatter)
+            for key, (source, formatter) in cls._formatters.items()
+            if key in cls._attrs_mapping
+        )
+
     def __getattribute__(self, attr: str) -> Any:
         try:
             return object.__getattribute__(self, attr)
@@ -39,18 +96,67 @@ class APIResourceWrapper(object):
             self.to_dict(),
         )
 
-    def _get_value(self, key: str) -> Any:
-        if isinstance(self._apiresource, dict):
-            value = self._apiresource.get(key, None)
-        else:
-            value = getattr(self._apiresource, key, None)
-        return value
+    def _read(self) -> Tuple[Any, ...]:
+        resource = self._apiresource
+        if isinstance(resource, dict):
+            return tuple(map(resource.get, self._fields))
+        # The attributes of the python-*client resources live in __dict__, a
+        # loaded resource has no other attribute than those of its class.
+        values = getattr(resource, "__dict__", {})
+        if values.get("_loaded") is True:
+            class_attrs = _class_attrs(type(resource))
+            return tuple(
+                [
+                    (
+                        values.get(field)
+                        if field in values or field not in class_attrs
+                        else getattr(resource, field, None)
+                    )
+                    for field in self._fields
+                ]
+            )
+        return tuple([getattr(resource, field, None) for field in self._fields])
+
+    def _view(self, row: Tuple[Any, ...]) -> Dict[str, Any]:
+        obj = dict(zip(self._attrs_mapping, self._view_getter(row)))
+        for key, index, formatter in self._formatted:
+            obj[key] = formatter(row[index])
+        return obj
 
     def to_dict(self) -> Dict[str, Any]:
-        obj: Dict[str, Any] = {}
-        for key, value in self._attrs_mapping.items():
-            obj[key] = self._get_value(value)
-        return obj
+        return self._view(self._read())
+
+    def to_dicts(self) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+        """Return ``to_dict`` and the origin data of the api object."""
+        row = self._read()
+        return self._view(row), dict(zip(self._origin_attrs, self._origin_getter(row)))
+
+
+def _flavor_name(flavor: Any) -> Any:
+    return flavor["original_name"] if flavor else None
+
+
+def _image_id(image: Any) -> Any:
+    return image["id"] if image else None
+
+
+def _addresses(address_type: str) -> Callable[[Any], List[Any]]:
+    def format_addresses(addresses: Any) -> List[Any]:
+        return [
+            address.get("addr")
+            for network_addresses in addresses.values()
+            for address in network_addresses
+            if address.get("OS-EXT-IPS:type") == address_type
+        ]
+
+    return format_addresses
+
+
+def _ips(excluded: str) -> Callable[[Any], List[Any]]:
+    def format_ips(fixed_ips: Any) -> List[Any]:
+        return [ip["ip_address"] for ip in fixed_ips or () if excluded not in ip["ip_address"]]
+
+    return format_ips
 
 
 class Server(APIResourceWrapper):
@@ -81,47 +187,13 @@ class Server(APIResourceWrapper):
         "metadata": "metadata",
     }
 
-    def _format_flavor(self, obj: Dict[str, Any], key: str, return_key: str) -> None:
-        flavor = self._get_value(key)
-        obj[return_key] = flavor["original_name"] if flavor else None
-
-    def _format_addr(
-        self,
-        obj: Dict[str, Any],
-        key: str,
-        address_type: str,
-        return_key: str,
-    ) -> None:
-        addresses = []
-        for _, v in self._get_value(key).items():
-            addresses.extend(v)
-        _addresses = []
-        for address in addresses:
-            if address.get("OS-EXT-IPS:type") == address_type:
-                _addresses.append(address.get("addr"))
-        obj[return_key] = _addresses
-
-    def _format_image(self, obj: Dict[str, Any], key: str, return_key: str) -> None:
-        image = self._get_value(key)
-        obj[return_key] = image["id"] if image else None
-
-    def to_dict(self) -> Dict[str, Any]:
-        obj: Dict[str, Any] = {}
-        for key, value in self._attrs_mapping.items():
-            if key == "flavor":
-                self._format_flavor(obj, "flavor", key)
-                continue
-            if value == "fixed_addresses":
-                self._format_addr(obj, "addresses", "fixed", key)
-                continue
-            if value == "floating_addresses":
-                self._format_addr(obj, "addresses", "floating", key)
-                continue
-            if value == "image":
-                self._format_image(obj, "image", key)
-                continue
-            obj[key] = self._get_value(value)
-        return obj
+    _formatters = {
+        "image": ("image", _image_id),
+        "fixed_addresses": ("addresses", _addresses("fixed")),
+        "floating_addresses": ("addresses", _addresses("floating")),
+        "flavor": ("flavor", _flavor_name),
+    }
+    _origin_attrs = OSServer._attrs
 
 
 class Volume(APIResourceWrapper):
@@ -145,6 +217,7 @@ class Volume(APIResourceWrapper):
         "created_at": "created_at",
         "volume_image_metadata": "volume_image_metadata",
     }
+    _origin_attrs = OSVolume._attrs
 
 
 class VolumeSnapshot(APIResourceWrapper):
@@ -161,6 +234,7 @@ class VolumeSnapshot(APIResourceWrapper):
         "created_at": "created_at",
         "metadata": "metadata",
     }
+    _origin_attrs = OSVolumeSnapshot._attrs
 
 
 class Flavor(APIResourceWrapper):
@@ -234,30 +308,7 @@ class Port(APIResourceWrapper):
         "fixed_ips": "fixed_ips",
     }
 
-    def _format_ip(
-        self,
-        obj: Dict[str, Any],
-        key: str,
-        return_key: str,
-    ) -> None:
-        ips = []
-        fixed_ips = self._get_value(key)
-        if fixed_ips:
-            for ip in fixed_ips:
-                if return_key == "ipv4" and ":" not in ip["ip_address"]:
-                    ips.append(ip["ip_address"])
-                elif return_key == "ipv6" and "." not in ip["ip_address"]:
-                    ips.append(ip["ip_address"])
-        obj[return_key] = ips
-
-    def to_dict(self) -> Dict[str, Any]:
-        obj: Dict[str, Any] = {}
-        for key, value in self._attrs_mapping.items():
-            if key == "ipv4":
-                self._format_ip(obj, "fixed_ips", key)
-                continue
-            if key == "ipv6":
-                self._format_ip(obj, "fixed_ips", key)
-                continue
-            obj[key] = self._get_value(value)
-        return obj
+    _formatters = {
+        "ipv4": ("fixed_ips", _ips(":")),
+        "ipv6": ("fixed_ips", _ips(".")),
+    }
@@ -0,0 +1,165 @@
+# Copyright 2021 99cloud
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Asyncio client of the compute services API.
+
+Requests go through one ``httpx.AsyncClient`` per worker process, the
+keystoneauth session of the caller only provides the token and the service
+catalog. Services are returned as the dicts of the API response.
+
+It only backs the asynchronous ``/extension/compute-services`` handler. The
+other extension handlers still use the python-*client libraries from the
+threadpool.
+"""
+
+from __future__ import annotations
+
+from typing import Any, Dict, List, Optional, Tuple
+
+import httpx
+from fastapi import status
+from fastapi.exceptions import HTTPException
+from keystoneauth1.exceptions.http import Unauthorized
+from keystoneauth1.session import Session
+from starlette.concurrency import run_in_threadpool
+
+from skyline_apiserver import version
+from skyline_apiserver.client import utils
+from skyline_apiserver.config import CONF
+from skyline_apiserver.types import constants
+
+ASYNC_HTTP_CLIENT: Optional[httpx.AsyncClient] = None
+
+
+def get_async_http_client() -> httpx.AsyncClient:
+    global ASYNC_HTTP_CLIENT
+    if ASYNC_HTTP_CLIENT is None:
+        limits = httpx.Limits(
+            max_connections=None,
+            max_keepalive_connections=CONF.openstack.http_pool_maxsize,
+        )
+        verify: Any = CONF.default.cafile or True
+        ASYNC_HTTP_CLIENT = httpx.AsyncClient(
+            # httpx only retries failed connections, like the sync pool.
+            transport=httpx.AsyncHTTPTransport(
+                verify=verify,
+                limits=limits,
+                retries=CONF.openstack.http_connect_retries,
+            ),
+            timeout=constants.DEFAULT_TIMEOUT,
+            headers={"User-Agent": f"skyline-apiserver/{version.version}"},
+        )
+    return ASYNC_HTTP_CLIENT
+
+
+async def close_async_http_client() -> None:
+    global ASYNC_HTTP_CLIENT
+    if ASYNC_HTTP_CLIENT is not None:
+        await ASYNC_HTTP_CLIENT.aclose()
+        ASYNC_HTTP_CLIENT = None
+
+
+def _query(params: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    """Drop unset filters, as the python-*client libraries do."""
+    query: Dict[str, Any] = {}
+    for key, value in (params or {}).items():
+        if value is None or value is False or value == "" or value == []:
+            continue
+        query[key] = str(value).lower() if isinstance(value, bool) else value
+    return query
+
+
+class AsyncOpenStackClient:
+    """List the compute services on behalf of ``session``.
+
+    The token and the endpoints come from ``session``, they are only
+    resolved in the threadpool when the token has to be re-issued.
+    """
+
+    def __init__(
+        self,
+        session: Session,
+        region: str,
+        global_request_id: Optional[str] = None,
+    ) -> None:
+        self.session = session
+        self.region = region
+        self.global_request_id = global_request_id
+
+    def _auth(self, service: str) -> Tuple[str, Dict[str, str]]:
+        endpoint = utils.get_endpoint(self.region, service, session=self.session)
+        headers = dict(self.session.get_auth_headers() or {})
+        return endpoint, headers
+
+    async def _prepare(self, service: str) -> Tuple[str, Dict[str, str]]:
+        try:
+            if self.session.auth._needs_reauthenticate():  # type: ignore
+                endpoint, headers = await run_in_threadpool(self._auth, service)
+            else:
+                endpoint, headers = self._auth(service)
+        except Unauthorized as e:
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail=str(e),
+            )
+        except Exception as e:
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail=str(e),
+            )
+        headers["Accept"] = "application/json"
+        if self.global_request_id:
+            headers["X-OpenStack-Request-ID"] = self.global_request_id
+        if self.session.original_ip:
+            headers["Forwarded"] = f"for={self.session.original_ip};by=skyline-apiserver"
+        return endpoint, headers
+
+    async def _get(self, url: str, headers: Dict[str, str], params: Any = None) -> Any:
+        try:
+            response = await get_async_http_client().get(url, headers=headers, params=params)
+        except httpx.HTTPError as e:
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail=str(e),
+            )
+        if response.status_code == status.HTTP_401_UNAUTHORIZED:
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail=response.text,
+            )
+        if response.is_error:
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail=response.text,
+            )
+        return response.json()
+
+    async def list_services(
+        self,
+        version: str = constants.NOVA_API_VERSION,
+        **kwargs: Any,
+    ) -> List[Dict[str, Any]]:
+        endpoint, headers = await self._prepare("compute")
+        headers["X-OpenStack-Nova-API-Version"] = version
+        headers["OpenStack-API-Version"] = f"compute {version}"
+        # The services API is not paginated.
+        body = await self._get(f"{endpoint}/os-services", headers, _query(kwargs))
+        return body.get("services", [])
+
+
+__all__ = (
+    "AsyncOpenStackClient",
+    "close_async_http_client",
+    "get_async_http_client",
+)
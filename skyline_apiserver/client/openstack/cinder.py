@@ -36,17 +36,14 @@ def list_volumes(
     sort: Optional[str] = None,
 ) -> Any:
     try:
-        cc = utils.cinder_client(
-            region=profile.region,
-            session=session,
-            global_request_id=global_request_id,
-        )
-        return cc.volumes.list(
-            search_opts=search_opts,
-            limit=limit,
-            marker=marker,
-            sort=sort,
-        )
+        cc = utils.cinder_client(region=profile.region, session=session)
+        with utils.client_request(session.original_ip, global_request_id):
+            return cc.volumes.list(
+                search_opts=search_opts,
+                limit=limit,
+                marker=marker,
+                sort=sort,
+            )
     except Unauthorized as e:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -69,17 +66,14 @@ def list_volume_snapshots(
     sort: Optional[str] = None,
 ) -> Any:
     try:
-        cc = utils.cinder_client(
-            region=profile.region,
-            session=session,
-            global_request_id=global_request_id,
-        )
-        return cc.volume_snapshots.list(
-            search_opts=search_opts,
-            limit=limit,
-            marker=marker,
-            sort=sort,
-        )
+        cc = utils.cinder_client(region=profile.region, session=session)
+        with utils.client_request(session.original_ip, global_request_id):
+            return cc.volume_snapshots.list(
+                search_opts=search_opts,
+                limit=limit,
+                marker=marker,
+                sort=sort,
+            )
     except Unauthorized as e:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -99,10 +93,9 @@ def get_volume_snapshot(
     snapshot_id: str,
 ) -> Any:
     try:
-        cc = utils.cinder_client(
-            session=session, region=region, global_request_id=global_request_id
-        )
-        return cc.volume_snapshots.get(snapshot_id)
+        cc = utils.cinder_client(session=session, region=region)
+        with utils.client_request(session.original_ip, global_request_id):
+            return cc.volume_snapshots.get(snapshot_id)
     except Unauthorized as e:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
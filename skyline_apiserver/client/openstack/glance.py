@@ -35,12 +35,11 @@ def list_images(
         kwargs = {}
         if filters:
             kwargs["filters"] = filters
-        ic = utils.image_client(
-            session=session,
-            region=profile.region,
-            global_request_id=global_request_id,
-        )
-        return ic.image.images(**kwargs)
+        ic = utils.image_client(session=session, region=profile.region)
+        # The images are requested as they are iterated, so all the pages
+        # are listed for this request here.
+        with utils.client_request(session.original_ip, global_request_id):
+            return list(ic.image.images(**kwargs))
     except Unauthorized as e:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
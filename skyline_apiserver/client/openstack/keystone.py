@@ -34,14 +34,11 @@ def list_projects(
 ) -> Any:
     try:
         search_opts = search_opts if search_opts else {}
-        kc = utils.keystone_client(
-            session=session,
-            region=profile.region,
-            global_request_id=global_request_id,
-        )
+        kc = utils.keystone_client(session=session, region=profile.region)
         if not all_projects:
             search_opts["user"] = profile.user.id
-        return kc.projects.list(**search_opts)
+        with utils.client_request(session.original_ip, global_request_id):
+            return kc.projects.list(**search_opts)
     except Unauthorized as e:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -65,13 +62,10 @@ def revoke_token(
     :type token: str or :class:`keystoneclient.access.AccessInfo`
     """
     try:
-        kc = utils.keystone_client(
-            session=session,
-            region=profile.region,
-            global_request_id=global_request_id,
-        )
+        kc = utils.keystone_client(session=session, region=profile.region)
         kwargs = {"token": token}
-        kc.tokens.revoke_token(**kwargs)
+        with utils.client_request(session.original_ip, global_request_id):
+            kc.tokens.revoke_token(**kwargs)
     except Unauthorized as e:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -86,9 +80,11 @@ def revoke_token(
 
 def get_token_data(token: str, region: str, session: Session) -> Any:
     kc = utils.keystone_client(session=session, region=region)
-    return kc.tokens.get_token_data(token=token)
+    with utils.client_request(session.original_ip, None):
+        return kc.tokens.get_token_data(token=token)
 
 
 def get_user(id: str, region: str, session: Session) -> Any:
     kc = utils.keystone_client(session=session, region=region)
-    return kc.users.get(id)
+    with utils.client_request(session.original_ip, None):
+        return kc.users.get(id)
@@ -14,13 +14,18 @@
 
 from __future__ import annotations
 
-from typing import Any
+from typing import Any, Dict, Iterator, Optional
 
 from fastapi import status
 from fastapi.exceptions import HTTPException
 from keystoneauth1.exceptions.http import Unauthorized
 from keystoneauth1.session import Session
-from neutronclient.v2_0.client import _GeneratorWithMeta
+from neutronclient.common.exceptions import (
+    BadRequest,
+    Forbidden,
+    NotFound,
+    Unauthorized as NeutronUnauthorized,
+)
 
 from skyline_apiserver import schemas
 from skyline_apiserver.client import utils
@@ -33,12 +38,9 @@ def list_networks(
     **kwargs: Any,
 ) -> Any:
     try:
-        nc = utils.neutron_client(
-            session=session,
-            region=profile.region,
-            global_request_id=global_request_id,
-        )
-        return nc.list_networks(**kwargs)
+        nc = utils.neutron_client(session=session, region=profile.region)
+        with utils.client_request(session.original_ip, global_request_id):
+            return nc.list_networks(**kwargs)
     except Unauthorized as e:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -57,14 +59,14 @@ def list_ports(
     global_request_id: str,
     retrieve_all: bool = False,
     **kwargs: Any,
-) -> _GeneratorWithMeta:
+) -> Any:
     try:
-        nc = utils.neutron_client(
-            session=session,
-            region=region_name,
-            global_request_id=global_request_id,
-        )
-        return nc.list_ports(retrieve_all=retrieve_all, **kwargs)
+        nc = utils.neutron_client(session=session, region=region_name)
+        if retrieve_all:
+            with utils.client_request(session.original_ip, global_request_id):
+                return nc.list_ports(retrieve_all=True, **kwargs)
+        pages = nc.list_ports(retrieve_all=False, **kwargs)
+        return _request_pages(pages, session.original_ip, global_request_id)
     except Unauthorized as e:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -75,3 +77,53 @@ def list_ports(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=str(e),
         )
+
+
+def _request_pages(
+    pages: Iterator[Dict[str, Any]],
+    original_ip: Optional[str],
+    global_request_id: str,
+) -> Iterator[Dict[str, Any]]:
+    # The pages may be iterated after the call that listed them, e.g. by a
+    # streaming response, each one is requested for that call.
+    while True:
+        with utils.client_request(original_ip, global_request_id):
+            page = next(pages, None)
+        if page is None:
+            return
+        yield page
+
+
+def next_page(pages: Iterator[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+    """Return the next page of a paged listing, None after the last one.
+
+    The pages of a listing are only requested from neutron as they are
+    iterated, the errors of the requests are raised here.
+    """
+    try:
+        return next(pages, None)
+    except BadRequest as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e),
+        )
+    except (Unauthorized, NeutronUnauthorized) as e:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail=str(e),
+        )
+    except Forbidden as e:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail=str(e),
+        )
+    except NotFound as e:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=str(e),
+        )
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=str(e),
+        )
@@ -35,20 +35,19 @@ def list_servers(
     limit: Optional[int] = None,
     sort_keys: Optional[List[str]] = None,
     sort_dirs: Optional[List[str]] = None,
+    detailed: bool = True,
 ) -> Any:
     try:
-        nc = utils.nova_client(
-            region=profile.region,
-            session=session,
-            global_request_id=global_request_id,
-        )
-        return nc.servers.list(
-            search_opts=search_opts,
-            marker=marker,
-            limit=limit,
-            sort_keys=sort_keys,
-            sort_dirs=sort_dirs,
-        )
+        nc = utils.nova_client(region=profile.region, session=session)
+        with utils.client_request(session.original_ip, global_request_id):
+            return nc.servers.list(
+                detailed=detailed,
+                search_opts=search_opts,
+                marker=marker,
+                limit=limit,
+                sort_keys=sort_keys,
+                sort_dirs=sort_dirs,
+            )
     except BadRequest as e:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -78,12 +77,9 @@ def list_services(
     **kwargs: Any,
 ) -> Any:
     try:
-        nc = utils.nova_client(
-            region=profile.region,
-            session=session,
-            global_request_id=global_request_id,
-        )
-        return nc.services.list(**kwargs)
+        nc = utils.nova_client(region=profile.region, session=session)
+        with utils.client_request(session.original_ip, global_request_id):
+            return nc.services.list(**kwargs)
     except Unauthorized as e:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
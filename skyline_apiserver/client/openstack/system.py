@@ -43,6 +43,7 @@ def get_project_scope_token(
 
     session = Session(
         auth=scope_auth,
+        session=utils.get_http_session(),
         original_ip=original_ip,
         verify=CONF.default.cafile,
         timeout=constants.DEFAULT_TIMEOUT,
@@ -76,7 +77,8 @@ def get_endpoints(region: str, original_ip: Optional[str] = None) -> Dict[str, A
         path = PurePath("/").joinpath(CONF.openstack.nginx_prefix, region.lower(), service)
         endpoints[service] = str(path)
     nc = utils.neutron_client(session=system_session, region=region)
-    neutron_extentions = nc.list_extensions()
+    with utils.client_request(system_session.original_ip, None):
+        neutron_extentions = nc.list_extensions()
     ext_list = (
         neutron_extentions["extensions"]
         if isinstance(neutron_extentions, dict) and "extensions" in neutron_extentions
@@ -97,12 +99,9 @@ def get_projects(
     user: str,
     original_ip: Optional[str] = None,
 ) -> List[Any]:
-    kc = utils.keystone_client(
-        session=get_system_session(original_ip=original_ip),
-        region=region,
-        global_request_id=global_request_id,
-    )
-    projects = kc.projects.list(user=user)
+    kc = utils.keystone_client(session=get_system_session(original_ip=original_ip), region=region)
+    with utils.client_request(original_ip, global_request_id):
+        projects = kc.projects.list(user=user)
     return projects
 
 
@@ -111,12 +110,9 @@ def get_domains(
     region: str,
     original_ip: Optional[str] = None,
 ) -> Any:
-    kc = utils.keystone_client(
-        session=get_system_session(original_ip=original_ip),
-        region=region,
-        global_request_id=global_request_id,
-    )
-    domains = [i.name for i in kc.domains.list(enabled=True)]
+    kc = utils.keystone_client(session=get_system_session(original_ip=original_ip), region=region)
+    with utils.client_request(original_ip, global_request_id):
+        domains = [i.name for i in kc.domains.list(enabled=True)]
     return domains
 
 
@@ -14,26 +14,133 @@
 
 from __future__ import annotations
 
-from typing import Any, Optional
+import hashlib
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from http.cookiejar import DefaultCookiePolicy
+from typing import Any, Callable, Dict, Iterator, Optional, Tuple
 
 import openstack
+import requests
 from cinderclient.client import Client as CinderClient
+from dateutil import parser
 from keystoneauth1.access.access import AccessInfoV3
 from keystoneauth1.identity.v3 import Password, Token
-from keystoneauth1.session import Session
+from keystoneauth1.session import Session, TCPKeepAliveAdapter
 from keystoneclient.client import Client as KeystoneClient
 from keystoneclient.httpclient import HTTPClient
 from neutronclient.v2_0.client import Client as NeutronClient
 from novaclient.client import Client as NovaClient
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 from skyline_apiserver import schemas
 from skyline_apiserver.config import CONF
+from skyline_apiserver.log import LOG
 from skyline_apiserver.types import constants
+from skyline_apiserver.utils.cache import TTLCache
 
 SESSION = None
+USER_SESSIONS: Optional[TTLCache] = None
+HTTP_SESSION: Optional[requests.Session] = None
+ENDPOINT_INDEXES: Optional[TTLCache] = None
+CLIENTS: Optional[TTLCache] = None
+
+# The client address and global request id of the calls of cached clients.
+CLIENT_REQUEST: ContextVar[Tuple[Optional[str], Optional[str]]] = ContextVar(
+    "skyline_client_request",
+    default=(None, None),
+)
+
+
+def get_http_session() -> requests.Session:
+    """Return the HTTP connection pool shared by all keystoneauth sessions."""
+    global HTTP_SESSION
+    if HTTP_SESSION is None:
+        adapter_cls = TCPKeepAliveAdapter if CONF.openstack.http_keepalive else HTTPAdapter
+        # Only retry connection errors, a request that reached the API is
+        # never sent twice.
+        retries = Retry(
+            total=None,
+            connect=CONF.openstack.http_connect_retries,
+            read=0,
+            status=0,
+            other=0,
+            redirect=False,
+            backoff_factor=0.1,
+        )
+        adapter = adapter_cls(
+            pool_connections=CONF.openstack.http_pool_connections,
+            pool_maxsize=CONF.openstack.http_pool_maxsize,
+            max_retries=retries,
+        )
+        http_session = requests.Session()
+        # The pool is shared by all users, keep no cookies between requests.
+        http_session.cookies.set_policy(DefaultCookiePolicy(allowed_domains=[]))
+        http_session.mount("https://", adapter)
+        http_session.mount("http://", adapter)
+        HTTP_SESSION = http_session
+    return HTTP_SESSION
+
+
+def http_pool_stats() -> Dict[str, Dict[str, int]]:
+    """Return the connection usage of the shared pool per API host."""
+    stats: Dict[str, Dict[str, int]] = {}
+    if HTTP_SESSION is None:
+        return stats
+    adapters = {id(adapter): adapter for adapter in HTTP_SESSION.adapters.values()}
+    for adapter in adapters.values():
+        pools = adapter.poolmanager.pools
+        for key in pools.keys():
+            pool = pools.get(key)
+            if pool is None:
+                continue
+            # The queue of a pool is filled with None up to its size, only the
+            # other items are idle connections.
+            queue = list(pool.pool.queue) if pool.pool is not None else []
+            stats[f"{key.key_scheme}://{key.key_host}:{key.key_port}"] = {
+                "connections": pool.num_connections,
+                "requests": pool.num_requests,
+                "idle": sum(conn is not None for conn in queue),
+                "maxsize": pool.pool.maxsize if pool.pool is not None else 0,
+            }
+    return stats
+
+
+def get_session_pool() -> TTLCache:
+    global USER_SESSIONS
+    if USER_SESSIONS is None:
+        USER_SESSIONS = TTLCache(
+            maxsize=CONF.default.keystone_session_pool_size,
+            ttl=CONF.default.keystone_session_pool_ttl,
+        )
+    return USER_SESSIONS
+
+
+def _session_pool_key(profile: schemas.Profile) -> Tuple[str, str, str]:
+    token_hash = hashlib.sha256(profile.keystone_token.encode("utf-8")).hexdigest()
+    return (token_hash, profile.project.id, profile.region)
 
 
 def generate_session(profile: schemas.Profile, original_ip: Optional[str] = None) -> Any:
+    """Return a project scoped session of the user of ``profile``.
+
+    Authenticated sessions are pooled until the keystone token expires, a
+    pooled session is reused through a wrapper carrying ``original_ip``.
+    """
+    pool = get_session_pool()
+    key = _session_pool_key(profile)
+    pooled = pool.get(key)
+    if pooled is not None:
+        return Session(
+            auth=pooled.auth,
+            session=pooled.session,
+            original_ip=original_ip,
+            verify=CONF.default.cafile,
+            timeout=constants.DEFAULT_TIMEOUT,
+        )
+
     auth_url = get_endpoint(
         region=profile.region,
         service="identity",
@@ -47,14 +154,25 @@ def generate_session(profile: schemas.Profile, original_ip: Optional[str] = None
     auth = Token(**kwargs)
     session = Session(
         auth=auth,
+        session=get_http_session(),
         original_ip=original_ip,
         verify=CONF.default.cafile,
         timeout=constants.DEFAULT_TIMEOUT,
     )
     session.auth.auth_ref = session.auth.get_auth_ref(session)  # type: ignore # noqa E501
+    try:
+        expires_at = parser.isoparse(profile.keystone_token_exp)
+    except ValueError:
+        LOG.debug(f"Invalid keystone token expiration time: {profile.keystone_token_exp}")
+    else:
+        pool.set(key, session, ttl=expires_at.timestamp() - time.time())
     return session
 
 
+def evict_session(profile: schemas.Profile) -> None:
+    get_session_pool().pop(_session_pool_key(profile))
+
+
 def get_system_session(original_ip: Optional[str] = None) -> Session:
     global SESSION
     if SESSION is None:
@@ -68,7 +186,10 @@ def get_system_session(original_ip: Optional[str] = None) -> Session:
             reauthenticate=True,
         )
         SESSION = Session(
-            auth=auth, verify=CONF.default.cafile, timeout=constants.DEFAULT_TIMEOUT
+            auth=auth,
+            session=get_http_session(),
+            verify=CONF.default.cafile,
+            timeout=constants.DEFAULT_TIMEOUT,
         )
 
     if original_ip is None:
@@ -94,6 +215,7 @@ def get_system_scope_access(
     scope_auth = Token(auth_url, keystone_token, system_scope="all")
     session = Session(
         auth=scope_auth,
+        session=get_http_session(),
         original_ip=original_ip,
         verify=CONF.default.cafile,
         timeout=constants.DEFAULT_TIMEOUT,
@@ -108,93 +230,196 @@ def get_access(session: Session) -> AccessInfoV3:
     return auth.auth_ref  # type: ignore
 
 
+def get_endpoint_index(access: AccessInfoV3) -> Dict[Tuple[str, str, str], str]:
+    """Return the (region, service type, interface) to URL index of ``access``.
+
+    The index is bound to the token of ``access``, a re-issued token gets a
+    new index built from its own service catalog.
+    """
+    global ENDPOINT_INDEXES
+    if ENDPOINT_INDEXES is None:
+        ENDPOINT_INDEXES = TTLCache(
+            maxsize=CONF.default.keystone_session_pool_size + 1,
+            ttl=CONF.default.keystone_session_pool_ttl,
+        )
+    index = ENDPOINT_INDEXES.get(access.auth_token)
+    if index is None:
+        index = {}
+        ENDPOINT_INDEXES.set(access.auth_token, index)
+    return index
+
+
 def get_endpoint(region: str, service: str, session: Session) -> Any:
     access = get_access(session=session)
-    service_catalog = access.service_catalog
-    endpoint = service_catalog.get_urls(
-        region_name=region,
-        service_type=service,
-        interface=CONF.openstack.interface_type,
-    )
-    if not endpoint:
-        raise ValueError("Endpoint not found")
-    return endpoint[0]
+    index = get_endpoint_index(access)
+    key = (region, service, CONF.openstack.interface_type)
+    endpoint = index.get(key)
+    if endpoint is None:
+        # The catalog lookup resolves service type aliases, so the index is
+        # filled from it on first use instead of from the raw catalog.
+        urls = access.service_catalog.get_urls(
+            region_name=region,
+            service_type=service,
+            interface=CONF.openstack.interface_type,
+        )
+        if not urls:
+            raise ValueError("Endpoint not found")
+        endpoint = index[key] = urls[0]
+    return endpoint
+
+
+def get_client_cache() -> TTLCache:
+    global CLIENTS
+    if CLIENTS is None:
+        CLIENTS = TTLCache(
+            maxsize=CONF.default.client_cache_size,
+            ttl=CONF.default.keystone_session_pool_ttl,
+        )
+    return CLIENTS
+
+
+@contextmanager
+def client_request(
+    original_ip: Optional[str], global_request_id: Optional[str]
+) -> Iterator[None]:
+    """Send the calls of cached clients in the block for this request."""
+    token = CLIENT_REQUEST.set((original_ip, global_request_id))
+    try:
+        yield
+    finally:
+        CLIENT_REQUEST.reset(token)
+
+
+class ClientSession(Session):
+    """Session of the cached clients, shared by the requests of a user.
+
+    The client address and the global request id are not attributes of the
+    session, they are read from ``CLIENT_REQUEST`` on every call.
+    """
+
+    @property  # type: ignore[override]
+    def original_ip(self) -> Optional[str]:
+        return CLIENT_REQUEST.get()[0]
+
+    @original_ip.setter
+    def original_ip(self, value: Optional[str]) -> None:
+        pass
+
+    def request(self, url: str, method: str, **kwargs: Any) -> Any:  # type: ignore[override]
+        global_request_id = CLIENT_REQUEST.get()[1]
+        if kwargs.get("global_request_id") is None and global_request_id:
+            kwargs["global_request_id"] = global_request_id
+        return super().request(url, method, **kwargs)
+
+
+def _cached_client(
+    factory: Callable[[Session], Any],
+    session: Session,
+    region: str,
+    service: str,
+    version: Optional[str],
+) -> Any:
+    """Return the client built by ``factory``, reusing a cached one.
+
+    Sessions are ephemeral wrappers around a pooled auth plugin, so clients
+    are keyed by that plugin and built on a ``ClientSession`` of their own.
+    The calls of the client are made for a request inside ``client_request``.
+    """
+    cache = get_client_cache()
+    key = (session.auth, region, service, version)
+    client = cache.get(key)
+    if client is None:
+        client = factory(
+            ClientSession(
+                auth=session.auth,
+                session=session.session,
+                verify=session.verify,
+                timeout=session.timeout,
+            ),
+        )
+        cache.set(key, client)
+    return client
 
 
 def keystone_client(
     session: Session,
     region: str,
-    global_request_id: Optional[str] = None,
     version: str = constants.KEYSTONE_API_VERSION,
 ) -> HTTPClient:
-    endpoint = get_endpoint(region, "identity", session=session)
-    client = KeystoneClient(
-        version=version,
-        session=session,
-        endpoint=endpoint,
-        global_request_id=global_request_id,
-        interface=CONF.openstack.interface_type,
-    )
-    return client
+    def build(session: Session) -> Any:
+        endpoint = get_endpoint(region, "identity", session=session)
+        client = KeystoneClient(
+            version=version,
+            session=session,
+            endpoint=endpoint,
+            interface=CONF.openstack.interface_type,
+        )
+        return client
+
+    return _cached_client(build, session, region, "identity", version)
 
 
 def image_client(
     session: Session,
     region: str,
-    global_request_id: Optional[str] = None,
 ) -> HTTPClient:
-    endpoint = get_endpoint(region, "image", session=session)
-    client = openstack.connection.Connection(
-        session=session,
-        endpoint=endpoint,
-        global_request_id=global_request_id,
-    )
-    return client
+    def build(session: Session) -> Any:
+        endpoint = get_endpoint(region, "image", session=session)
+        client = openstack.connection.Connection(
+            session=session,
+            endpoint=endpoint,
+        )
+        return client
+
+    return _cached_client(build, session, region, "image", None)
 
 
 def nova_client(
     session: Session,
     region: str,
-    global_request_id: Optional[str] = None,
     version: str = constants.NOVA_API_VERSION,
 ) -> HTTPClient:
-    endpoint = get_endpoint(region, "compute", session=session)
-    client = NovaClient(
-        version=version,
-        session=session,
-        endpoint_override=endpoint,
-        global_request_id=global_request_id,
-    )
-    return client
+    def build(session: Session) -> Any:
+        endpoint = get_endpoint(region, "compute", session=session)
+        client = NovaClient(
+            version=version,
+            session=session,
+            endpoint_override=endpoint,
+        )
+        return client
+
+    return _cached_client(build, session, region, "compute", version)
 
 
 def cinder_client(
     session: Session,
     region: str,
-    global_request_id: Optional[str] = None,
     version: str = constants.CINDER_API_VERSION,
 ) -> HTTPClient:
-    endpoint = get_endpoint(region, "block-storage", session=session)
-    client = CinderClient(
-        version=version,
-        session=session,
-        endpoint_override=endpoint,
-        global_request_id=global_request_id,
-    )
-    return client
+    def build(session: Session) -> Any:
+        endpoint = get_endpoint(region, "block-storage", session=session)
+        client = CinderClient(
+            version=version,
+            session=session,
+            endpoint_override=endpoint,
+        )
+        return client
+
+    return _cached_client(build, session, region, "block-storage", version)
 
 
 def neutron_client(
     session: Session,
     region: str,
-    global_request_id: Optional[str] = None,
     version: str = constants.NEUTRON_API_VERSION,
 ) -> NeutronClient:
-    endpoint = get_endpoint(region, "network", session=session)
-    client = NeutronClient(
-        version=version,
-        session=session,
-        endpoint_override=endpoint,
-        global_request_id=global_request_id,
-    )
-    return client
+    def build(session: Session) -> Any:
+        endpoint = get_endpoint(region, "network", session=session)
+        client = NeutronClient(
+            version=version,
+            session=session,
+            endpoint_override=endpoint,
+        )
+        return client
+
+    return _cached_client(build, session, region, "network", version)
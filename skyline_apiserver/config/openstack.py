@@ -199,6 +199,40 @@ sso_region = Opt(
     default="RegionOne",
 )
 
+http_pool_connections = Opt(
+    name="http_pool_connections",
+    description=(
+        "Number of OpenStack API hosts whose HTTP connections are kept in the "
+        "connection pool shared by all sessions of a worker process."
+    ),
+    schema=StrictInt,
+    default=32,
+)
+
+http_pool_maxsize = Opt(
+    name="http_pool_maxsize",
+    description="Maximum number of idle HTTP connections kept per OpenStack API host",
+    schema=StrictInt,
+    default=50,
+)
+
+http_keepalive = Opt(
+    name="http_keepalive",
+    description="Enable TCP keep-alive on the HTTP connections to the OpenStack APIs",
+    schema=StrictBool,
+    default=True,
+)
+
+http_connect_retries = Opt(
+    name="http_connect_retries",
+    description=(
+        "Number of times a failed connection to an OpenStack API is retried. "
+        "Requests that already reached the API are never retried."
+    ),
+    schema=StrictInt,
+    default=1,
+)
+
 GROUP_NAME = __name__.split(".")[-1]
 ALL_OPTS = (
     enforce_new_defaults,
@@ -221,6 +255,10 @@ ALL_OPTS = (
     service_mapping,
     extension_mapping,
     reclaim_instance_interval,
+    http_pool_connections,
+    http_pool_maxsize,
+    http_keepalive,
+    http_connect_retries,
 )
 
 __all__ = ("GROUP_NAME", "ALL_OPTS")
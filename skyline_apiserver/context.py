@@ -14,13 +14,16 @@
 
 from __future__ import annotations
 
-from typing import Any
+from typing import TYPE_CHECKING, Any, Callable, Dict, Optional
 
 from oslo_config import cfg
 from oslo_context import context
 from oslo_log import log
 from oslo_utils import timeutils
 
+if TYPE_CHECKING:
+    from skyline_apiserver.schemas import Profile
+
 CONF = cfg.CONF
 LOG = log.getLogger(__name__)
 
@@ -153,3 +156,52 @@ class RequestContext(context.RequestContext):
         if not self.is_admin:
             return self.is_system_reader
         return False
+
+
+# Fields of a LazyRequestContext read from the profile without building the
+# RequestContext.
+_PROFILE_FIELDS: Dict[str, Callable[[Profile], Any]] = {
+    "user_id": lambda profile: profile.user.id,
+    "project_id": lambda profile: profile.project.id,
+    "project_name": lambda profile: profile.project.name,
+    "user_domain_id": lambda profile: profile.user.domain.id,
+    "project_domain_id": lambda profile: profile.project.domain.id,
+    "roles": lambda profile: [role.name for role in profile.roles],
+    "auth_token": lambda profile: profile.keystone_token,
+}
+
+
+class LazyRequestContext:
+    """RequestContext of a request, built from its profile on first use.
+
+    The identity fields are read from the profile directly, any other
+    attribute builds the RequestContext once and is delegated to it.
+    """
+
+    __slots__ = ("_profile", "_context")
+
+    def __init__(self, profile: Profile) -> None:
+        object.__setattr__(self, "_profile", profile)
+        object.__setattr__(self, "_context", None)
+
+    @property
+    def materialized(self) -> bool:
+        return self._context is not None
+
+    def materialize(self) -> RequestContext:
+        context: Optional[RequestContext] = self._context
+        if context is None:
+            profile = self._profile
+            context = RequestContext(
+                **{name: getter(profile) for name, getter in _PROFILE_FIELDS.items()}
+            )
+            object.__setattr__(self, "_context", context)
+        return context
+
+    def __getattr__(self, name: str) -> Any:
+        if self._context is None and name in _PROFILE_FIELDS:
+            return _PROFILE_FIELDS[name](self._profile)
+        return getattr(self.materialize(), name)
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        setattr(self.materialize(), name, value)
@@ -0,0 +1,203 @@
+# Copyright 2021 99cloud
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from __future__ import annotations
+
+import threading
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from fastapi import status
+from fastapi.exceptions import HTTPException
+from keystoneauth1.exceptions.http import NotFound
+from starlette.concurrency import run_in_threadpool
+
+from skyline_apiserver.client import utils
+from skyline_apiserver.config import CONF
+from skyline_apiserver.log import LOG
+from skyline_apiserver.utils.fanout import FanOut
+
+
+class _RegionProjects:
+    def __init__(self) -> None:
+        # A project id mapped to None, or a name mapped to no ids, is known
+        # not to exist.
+        self.names: Dict[str, Optional[str]] = {}
+        # The ids of a name are only listed by name or by a full load.
+        self.ids: Dict[str, List[str]] = {}
+
+    def add(self, project_id: str, name: str) -> None:
+        self.names[project_id] = name
+        ids = self.ids.setdefault(name, [])
+        if project_id not in ids:
+            ids.append(project_id)
+
+
+class ProjectDirectory:
+    """In-process directory of the keystone projects of every region.
+
+    Lookups never list all the projects of a region. Project ids missing
+    from the directory are fetched one by one, concurrently, and unknown
+    names are listed from keystone by name. Projects not found are
+    remembered as deleted. The regions looked up so far are then loaded in
+    full by a periodic task, since keystone has no way to list the projects
+    changed since a given time, nor to list projects by ids. When the task
+    is disabled, nothing is remembered and every lookup goes to keystone.
+
+    Projects are read with the system session.
+    """
+
+    def __init__(self) -> None:
+        self._regions: Dict[str, _RegionProjects] = {}
+        self._lock = threading.Lock()
+
+    def _region(self, region: str) -> _RegionProjects:
+        with self._lock:
+            return self._regions.setdefault(region, _RegionProjects())
+
+    def _client(self, region: str) -> Any:
+        return utils.keystone_client(session=utils.get_system_session(), region=region)
+
+    def _enabled(self) -> bool:
+        return CONF.default.project_directory_refresh_interval > 0
+
+    def load(self, region: str) -> int:
+        """List all the projects of ``region``, return how many."""
+        directory = self._region(region)
+        client = self._client(region)
+        projects = client.projects.list()
+        loaded = _RegionProjects()
+        for project in projects:
+            loaded.add(project.id, project.name)
+        with self._lock:
+            # Project ids are never reused, deleted projects stay deleted.
+            for project_id, name in directory.names.items():
+                if name is None:
+                    loaded.names.setdefault(project_id, None)
+            directory.names, directory.ids = loaded.names, loaded.ids
+        return len(projects)
+
+    def get_cached_names(
+        self,
+        region: str,
+        project_ids: Iterable[str],
+    ) -> Tuple[Dict[str, str], List[str]]:
+        """Return the names of the known projects of ``project_ids``, and the
+        ids missing from the directory.
+        """
+        names: Dict[str, str] = {}
+        missing: List[str] = []
+        directory = self._region(region)
+        for project_id in set(project_ids):
+            if not self._enabled() or project_id not in directory.names:
+                missing.append(project_id)
+                continue
+            name = directory.names[project_id]
+            if name is not None:
+                names[project_id] = name
+        return names, missing
+
+    def lookup(
+        self,
+        region: str,
+        project_id: str,
+        global_request_id: Optional[str] = None,
+    ) -> Optional[str]:
+        """Fetch the name of one project from keystone, None if it is not found.
+
+        Errors other than a missing project are logged and not remembered.
+        """
+        client = self._client(region)
+        try:
+            with utils.client_request(None, global_request_id):
+                name = client.projects.get(project_id).name
+        except NotFound:
+            name = None
+        except Exception as e:
+            LOG.warning(f"Failed to look up project {project_id} of region {region}: {e}")
+            return None
+        if self._enabled():
+            directory = self._region(region)
+            with self._lock:
+                directory.names[project_id] = name
+        return name
+
+    def get_names(
+        self,
+        region: str,
+        project_ids: Iterable[str],
+        global_request_id: Optional[str] = None,
+    ) -> Dict[str, str]:
+        """Return the name of every known project of ``project_ids``."""
+        names, missing = self.get_cached_names(region, project_ids)
+        fanout = FanOut(max_concurrency=CONF.default.fanout_concurrency)
+        lookups = {
+            project_id: fanout.submit(
+                "projects", self.lookup, region, project_id, global_request_id
+            )
+            for project_id in missing
+        }
+        fanout.wait()
+        for project_id, lookup in lookups.items():
+            name = lookup.result()
+            if name is not None:
+                names[project_id] = name
+        return names
+
+    def find_ids(
+        self,
+        region: str,
+        name: str,
+        global_request_id: Optional[str] = None,
+    ) -> List[str]:
+        """Return the ids of the projects named ``name``."""
+        directory = self._region(region)
+        ids = directory.ids.get(name) if self._enabled() else None
+        if ids is None:
+            client = self._client(region)
+            try:
+                with utils.client_request(None, global_request_id):
+                    projects = client.projects.list(name=name)
+            except Exception as e:
+                raise HTTPException(
+                    status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                    detail=str(e),
+                )
+            ids = [project.id for project in projects]
+            if self._enabled():
+                with self._lock:
+                    directory.ids.setdefault(name, [])
+                    for project in projects:
+                        directory.add(project.id, project.name)
+        return list(ids)
+
+    async def refresh(self) -> None:
+        """Reload the directory of every region looked up so far."""
+        with self._lock:
+            regions = list(self._regions)
+        for region in regions:
+            try:
+                count = await run_in_threadpool(self.load, region)
+            except Exception as e:
+                LOG.warning(f"Failed to load the projects of region {region}: {e}")
+                continue
+            LOG.debug(f"Loaded {count} projects of region {region}")
+
+    def __len__(self) -> int:
+        return sum(len(directory.names) for directory in self._regions.values())
+
+
+PROJECTS = ProjectDirectory()
+
+
+__all__ = ("PROJECTS", "ProjectDirectory")
@@ -0,0 +1,105 @@
+# Copyright 2021 99cloud
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from __future__ import annotations
+
+import threading
+import time
+from typing import Any, Dict, Optional
+
+from skyline_apiserver.config import CONF
+from skyline_apiserver.db import async_api as db_api
+
+# Tolerance for the clocks of the workers that record ``revoked_at``.
+CLOCK_SKEW = 30
+
+
+class RevokedTokenIndex:
+    """In-process index of revoked token uuids.
+
+    A full reload lists all the revoked tokens that have not expired yet from
+    the database. In between, each refresh only lists the tokens revoked
+    since the previous one, tracked by a watermark on ``revoked_at``. Full
+    reloads happen at the purge cadence, and drop the tokens expired since.
+
+    Only a hit in the index is confirmed against the database. When the
+    index has not been refreshed within the staleness window, every lookup
+    falls back to the database.
+    """
+
+    def __init__(self) -> None:
+        self._tokens: Dict[str, int] = {}
+        self._watermark: Optional[int] = None
+        self._reloaded_at: Optional[float] = None
+        self._refreshed_at: Optional[float] = None
+        self._lock = threading.Lock()
+
+    def _merge(self, rows: Any, started_at: float) -> None:
+        now = int(started_at)
+        with self._lock:
+            # Tokens added locally while the rows were listed are kept.
+            for row in rows:
+                self._tokens[row.uuid] = row.expire
+            self._tokens = {k: v for k, v in self._tokens.items() if v >= now}
+            self._watermark = now - CLOCK_SKEW
+            self._refreshed_at = started_at
+
+    async def reload(self) -> int:
+        """Reload the unexpired revoked tokens from the database, return how many."""
+        started_at = time.time()
+        rows = await db_api.list_revoked_tokens(since=int(started_at))
+        self._merge(rows, started_at)
+        self._reloaded_at = started_at
+        return len(rows)
+
+    async def refresh(self) -> int:
+        """List the tokens revoked since the last refresh, return how many.
+
+        Falls back to a full reload before the first one, and once every
+        ``revoked_token_purge_interval`` seconds.
+        """
+        interval = CONF.default.revoked_token_purge_interval
+        if (
+            self._watermark is None
+            or self._reloaded_at is None
+            or (interval > 0 and time.time() - self._reloaded_at >= interval)
+        ):
+            return await self.reload()
+        started_at = time.time()
+        rows = await db_api.list_new_revoked_tokens(revoked_since=self._watermark)
+        self._merge(rows, started_at)
+        return len(rows)
+
+    def add(self, token_id: str, expire: int) -> None:
+        with self._lock:
+            self._tokens[token_id] = expire
+
+    def is_fresh(self) -> bool:
+        interval = CONF.default.revoked_token_refresh_interval
+        if self._refreshed_at is None or interval <= 0:
+            return False
+        # A single slow or failed refresh does not send every lookup to the
+        # database, a second one does.
+        return time.time() - self._refreshed_at < 2 * interval
+
+    async def is_revoked(self, token_id: str) -> bool:
+        if self.is_fresh() and token_id not in self._tokens:
+            return False
+        return await db_api.check_token(token_id)
+
+    def __len__(self) -> int:
+        return len(self._tokens)
+
+
+REVOKED_TOKENS = RevokedTokenIndex()
@@ -0,0 +1,81 @@
+# Copyright 2021 99cloud
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from __future__ import annotations
+
+import re
+from collections import Counter
+from typing import Dict, Iterable, Optional
+
+from skyline_apiserver.types import constants
+
+# URL prefixes served without authentication
+PUBLIC_URL_PREFIXES = (
+    f"{constants.API_PREFIX}/login",
+    f"{constants.API_PREFIX}/websso",
+    "/static",
+    "/docs",
+    f"{constants.API_PREFIX}/openapi.json",
+    "/favicon.ico",
+    f"{constants.API_PREFIX}/sso",
+    f"{constants.API_PREFIX}/config",
+    f"{constants.API_PREFIX}/contrib/keystone_endpoints",
+    # f"{constants.API_PREFIX}/contrib/domains",
+    f"{constants.API_PREFIX}/contrib/regions",
+)
+
+AUTHENTICATED = "authenticated"
+UNMATCHED = "unmatched"
+
+
+class RouteTable:
+    """Classify request paths as public, authenticated or unmatched.
+
+    The public prefixes are compiled into a single regular expression, so a
+    lookup is one ``match`` call whatever the number of prefixes. Every
+    lookup is counted per public prefix, or under ``authenticated`` for the
+    other API paths and ``unmatched`` for everything else.
+    """
+
+    def __init__(self, public_prefixes: Iterable[str] = PUBLIC_URL_PREFIXES) -> None:
+        self.load(public_prefixes)
+
+    def load(self, public_prefixes: Iterable[str]) -> None:
+        # Longest first, so a path is counted under its most specific prefix.
+        prefixes = sorted(set(public_prefixes), key=len, reverse=True)
+        self.prefixes = tuple(prefixes)
+        self._pattern = re.compile("|".join(map(re.escape, prefixes))) if prefixes else None
+        self.counters: Counter[str] = Counter()
+
+    def match_public(self, url_path: str) -> Optional[str]:
+        """Return the public prefix of ``url_path``, or None."""
+        match = self._pattern.match(url_path) if self._pattern is not None else None
+        if match is not None:
+            prefix = match.group(0)
+            self.counters[prefix] += 1
+            return prefix
+        if url_path.startswith(constants.API_PREFIX):
+            self.counters[AUTHENTICATED] += 1
+        else:
+            self.counters[UNMATCHED] += 1
+        return None
+
+    def stats(self) -> Dict[str, int]:
+        return dict(self.counters)
+
+
+PUBLIC_ROUTES = RouteTable()
+
+
+__all__ = ("PUBLIC_URL_PREFIXES", "PUBLIC_ROUTES", "RouteTable")
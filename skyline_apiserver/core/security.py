@@ -14,10 +14,12 @@
 
 from __future__ import annotations
 
+import hashlib
 import time
 import uuid
-from typing import Optional
+from typing import Dict, Optional, Tuple
 
+from dateutil import parser
 from fastapi import status
 from fastapi.exceptions import HTTPException
 from jose import jwt
@@ -26,29 +28,176 @@ from skyline_apiserver import schemas, version
 from skyline_apiserver.client import utils
 from skyline_apiserver.client.utils import get_system_session
 from skyline_apiserver.config import CONF
+from skyline_apiserver.log import LOG
+from skyline_apiserver.utils.cache import TTLCache
+from skyline_apiserver.utils.executor import BlockingExecutor
+
+PROFILE_CACHE: Optional[TTLCache] = None
+TOKEN_CACHE: Optional[TTLCache] = None
+TOKEN_RENEWALS: Optional[TokenRenewals] = None
+IDENTITY_EXECUTOR: Optional[BlockingExecutor] = None
+
+
+def get_profile_cache() -> TTLCache:
+    global PROFILE_CACHE
+    if PROFILE_CACHE is None:
+        PROFILE_CACHE = TTLCache(
+            maxsize=CONF.default.profile_cache_size,
+            ttl=CONF.default.profile_cache_ttl,
+        )
+    return PROFILE_CACHE
+
+
+def get_token_cache() -> TTLCache:
+    global TOKEN_CACHE
+    if TOKEN_CACHE is None:
+        TOKEN_CACHE = TTLCache(
+            maxsize=CONF.default.token_cache_size,
+            ttl=CONF.default.access_token_expire,
+        )
+    return TOKEN_CACHE
+
+
+class TokenRenewals:
+    """Coalesce the renewal of session cookies.
+
+    Every request presenting a cookie in its renewal window would otherwise
+    sign a new token. The token renewed for a session uuid and expiration
+    time is reused until the renewed cookie expires, so concurrent requests
+    share it.
+    """
+
+    def __init__(self, maxsize: int) -> None:
+        self._cache = TTLCache(maxsize=maxsize, ttl=CONF.default.access_token_renew)
+        self.renewed = 0
+        self.avoided = 0
+
+    def renew(self, profile: schemas.Profile) -> Tuple[str, int]:
+        """Return the renewed token of ``profile`` and its expiration time."""
+        key = (profile.uuid, profile.exp)
+        renewed = self._cache.get(key)
+        if renewed is not None:
+            self.avoided += 1
+            return renewed
+
+        exp = int(time.time()) + CONF.default.access_token_expire
+        renewed = (profile.model_copy(update={"exp": exp}).toJWTPayload(), exp)
+        self._cache.set(key, renewed, ttl=profile.exp - time.time())
+        self.renewed += 1
+        return renewed
+
+    def stats(self) -> Dict[str, int]:
+        return {"renewed": self.renewed, "avoided": self.avoided, "size": len(self._cache)}
+
+
+def get_token_renewals() -> TokenRenewals:
+    global TOKEN_RENEWALS
+    if TOKEN_RENEWALS is None:
+        TOKEN_RENEWALS = TokenRenewals(maxsize=CONF.default.token_cache_size)
+    return TOKEN_RENEWALS
+
+
+def _profile_cache_key(token: schemas.Payload) -> Tuple[str, str, str]:
+    token_hash = hashlib.sha256(token.keystone_token.encode("utf-8")).hexdigest()
+    return (token.uuid, token_hash, token.region)
 
 
 def parse_access_token(token: str) -> (schemas.Payload):
+    """Decode the session cookie ``token``.
+
+    Decoded payloads are cached per cookie value until their ``exp``, the
+    returned payload is shared and must not be modified.
+    """
+    cache = get_token_cache()
+    parsed = cache.get(token)
+    if parsed is not None:
+        return parsed
+
     payload = jwt.decode(token, CONF.default.secret_key, algorithms=["HS256"])
-    return schemas.Payload(
+    parsed = schemas.Payload(
         keystone_token=payload["keystone_token"],
         region=payload["region"],
         exp=payload["exp"],
         uuid=payload["uuid"],
     )
+    cache.set(token, parsed, ttl=parsed.exp - time.time())
+    return parsed
+
+
+def get_identity_executor() -> BlockingExecutor:
+    global IDENTITY_EXECUTOR
+    if IDENTITY_EXECUTOR is None:
+        IDENTITY_EXECUTOR = BlockingExecutor(
+            "identity",
+            max_workers=CONF.default.identity_executor_workers,
+            max_queue=CONF.default.identity_executor_queue_size,
+        )
+    return IDENTITY_EXECUTOR
+
+
+def shutdown_identity_executor() -> None:
+    global IDENTITY_EXECUTOR
+    if IDENTITY_EXECUTOR is not None:
+        IDENTITY_EXECUTOR.shutdown(wait=False)
+        IDENTITY_EXECUTOR = None
+
+
+def get_cached_profile(token: schemas.Payload) -> Optional[schemas.Profile]:
+    profile = get_profile_cache().get(_profile_cache_key(token))
+    if profile is None:
+        return None
+    # The JWT may have been renewed since the profile was cached, so the
+    # expiration time always comes from the presented token.
+    return profile.model_copy(update={"exp": token.exp})
+
+
+async def async_generate_profile_by_token(
+    token: schemas.Payload,
+    original_ip: Optional[str] = None,
+) -> schemas.Profile:
+    """Same as ``generate_profile_by_token`` without blocking the event loop.
+
+    A cached profile is returned directly, the keystone call otherwise runs
+    in the identity executor.
+    """
+    profile = get_cached_profile(token)
+    if profile is not None:
+        return profile
+    return await get_identity_executor().run(
+        generate_profile_by_token,
+        token,
+        original_ip=original_ip,
+    )
 
 
 def generate_profile_by_token(
     token: schemas.Payload,
     original_ip: Optional[str] = None,
 ) -> schemas.Profile:
-    return generate_profile(
+    profile = get_cached_profile(token)
+    if profile is not None:
+        return profile
+
+    cache = get_profile_cache()
+    key = _profile_cache_key(token)
+    profile = generate_profile(
         keystone_token=token.keystone_token,
         region=token.region,
         exp=token.exp,
         uuid_value=token.uuid,
         original_ip=original_ip,
     )
+    try:
+        keystone_token_ttl = parser.isoparse(profile.keystone_token_exp).timestamp() - time.time()
+    except ValueError:
+        LOG.debug(f"Invalid keystone token expiration time: {profile.keystone_token_exp}")
+    else:
+        cache.set(key, profile.model_copy(), ttl=keystone_token_ttl)
+    return profile
+
+
+def evict_profile(token: schemas.Payload) -> None:
+    get_profile_cache().pop(_profile_cache_key(token))
 
 
 def generate_profile(
@@ -63,7 +212,8 @@ def generate_profile(
             session=get_system_session(original_ip=original_ip),
             region=region,
         )
-        token_data = kc.tokens.get_token_data(token=keystone_token)
+        with utils.client_request(original_ip, None):
+            token_data = kc.tokens.get_token_data(token=keystone_token)
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -12,7 +12,7 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-from . import api
-from .base import setup
+from . import api, async_api
+from .base import dispose, pool_stats, setup
 
-__all__ = ("setup", "api")
+__all__ = ("setup", "dispose", "api", "async_api", "pool_stats")
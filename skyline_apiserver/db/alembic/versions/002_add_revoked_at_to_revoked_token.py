@@ -0,0 +1,42 @@
+# Copyright 2021 99cloud
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""add revoked_at to revoked_token
+
+Revision ID: 002
+Revises: 001
+Create Date: 2026-10-17 00:00:00.000000
+
+"""
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "002"
+down_revision = "001"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    with op.batch_alter_table("revoked_token") as batch_op:
+        batch_op.add_column(sa.Column("revoked_at", sa.Integer(), nullable=True))
+        batch_op.create_index(op.f("ix_revoked_token_revoked_at"), ["revoked_at"], unique=False)
+
+
+def downgrade() -> None:
+    with op.batch_alter_table("revoked_token") as batch_op:
+        batch_op.drop_index(op.f("ix_revoked_token_revoked_at"))
+        batch_op.drop_column("revoked_at")
@@ -57,17 +57,10 @@ def revoke_token(token_id: str, expire: int) -> Any:
     query = insert(RevokedToken)
     db = DB.get()
     with db.transaction():
-        result = db.execute(query, {"uuid": token_id, "expire": expire})
-    return result
-
-
-@check_db_connected
-def purge_revoked_token() -> Any:
-    now = int(time.time()) - 1
-    query = delete(RevokedToken).where(RevokedToken.c.expire < now)
-    db = DB.get()
-    with db.transaction():
-        result = db.execute(query)
+        result = db.execute(
+            query,
+            {"uuid": token_id, "expire": expire, "revoked_at": int(time.time())},
+        )
     return result
 
 
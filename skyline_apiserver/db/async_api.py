@@ -0,0 +1,128 @@
+# Copyright 2021 99cloud
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Asyncio counterpart of ``skyline_apiserver.db.api`` for the event loop."""
+
+from __future__ import annotations
+
+import time
+from typing import Any, Union
+
+from sqlalchemy import Insert, Update, delete, func, insert, select, update
+
+from .base import get_async_db
+from .models import RevokedToken, Settings
+
+
+async def check_token(token_id: str) -> bool:
+    count_label = "revoked_count"
+    query = (
+        select(func.count(RevokedToken.c.uuid).label(count_label))
+        .select_from(RevokedToken)
+        .where(RevokedToken.c.uuid == token_id)
+    )
+    db = get_async_db()
+    result = await db.fetch_one(query)
+    count = getattr(result, count_label, 0)
+    return count > 0
+
+
+async def list_revoked_tokens(since: int) -> Any:
+    """List all revoked tokens that have not expired at ``since``."""
+    query = select(RevokedToken.c.uuid, RevokedToken.c.expire).where(
+        RevokedToken.c.expire >= since
+    )
+    db = get_async_db()
+    return await db.fetch_all(query)
+
+
+async def list_new_revoked_tokens(revoked_since: int) -> Any:
+    """List the tokens revoked at or after ``revoked_since``."""
+    query = select(RevokedToken.c.uuid, RevokedToken.c.expire).where(
+        RevokedToken.c.revoked_at >= revoked_since
+    )
+    db = get_async_db()
+    return await db.fetch_all(query)
+
+
+async def revoke_token(token_id: str, expire: int) -> Any:
+    query = insert(RevokedToken)
+    db = get_async_db()
+    return await db.execute(
+        query,
+        {"uuid": token_id, "expire": expire, "revoked_at": int(time.time())},
+    )
+
+
+async def purge_revoked_token(batch_size: int = 0) -> int:
+    """Delete expired revoked tokens, ``batch_size`` rows per transaction.
+
+    Return the number of deleted rows. A ``batch_size`` lower than or equal
+    to zero deletes all expired rows in a single statement.
+    """
+    now = int(time.time()) - 1
+    db = get_async_db()
+    if batch_size <= 0:
+        result = await db.execute(delete(RevokedToken).where(RevokedToken.c.expire < now))
+        return result.rowcount
+
+    purged = 0
+    while True:
+        # MySQL does not support LIMIT in an IN subquery, so the batch is
+        # selected first and deleted by primary key.
+        select_query = (
+            select(RevokedToken.c.uuid).where(RevokedToken.c.expire < now).limit(batch_size)
+        )
+        async with db.transaction():
+            uuids = [row.uuid for row in await db.fetch_all(select_query)]
+            if uuids:
+                await db.execute(delete(RevokedToken).where(RevokedToken.c.uuid.in_(uuids)))
+        purged += len(uuids)
+        if len(uuids) < batch_size:
+            return purged
+
+
+async def list_settings() -> Any:
+    query = select(Settings)
+    db = get_async_db()
+    return await db.fetch_all(query)
+
+
+async def get_setting(key: str) -> Any:
+    query = select(Settings).where(Settings.c.key == key)
+    db = get_async_db()
+    return await db.fetch_one(query)
+
+
+async def update_setting(key: str, value: Any) -> Any:
+    get_query = (
+        select(Settings.c.key, Settings.c.value).where(Settings.c.key == key).with_for_update()
+    )
+    db = get_async_db()
+    async with db.transaction():
+        is_exist = await db.fetch_one(get_query)
+        stmt: Union[Insert, Update]
+        if is_exist is None:
+            stmt = insert(Settings).values(key=key, value=value)
+        else:
+            stmt = update(Settings).where(Settings.c.key == key).values(value=value)
+        await db.execute(stmt)
+        result = await db.fetch_one(get_query)
+    return result
+
+
+async def delete_setting(key: str) -> Any:
+    query = delete(Settings).where(Settings.c.key == key)
+    db = get_async_db()
+    return await db.execute(query)
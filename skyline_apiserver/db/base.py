@@ -14,63 +14,210 @@
 
 from __future__ import annotations
 
+import threading
+import time
 from contextvars import ContextVar
+from typing import Any, Awaitable, Callable, Dict, Optional
 
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
+from sqlalchemy.orm import Session, sessionmaker
 
 from skyline_apiserver.config import CONF
+from skyline_apiserver.log import LOG
 
 DATABASE = None
 DB: ContextVar = ContextVar("skyline_db")
+ASYNC_DATABASE = None
+
+ASYNC_DRIVERS = {
+    "sqlite": "sqlite+aiosqlite",
+    "mysql": "mysql+aiomysql",
+}
+
+
+class PoolStats:
+    """Connection pool checkout counters of an engine."""
+
+    def __init__(self, engine: Engine) -> None:
+        self.engine = engine
+        self.connects = 0
+        self.checkouts = 0
+        self.checkins = 0
+        self.in_use = 0
+        self.max_in_use = 0
+        self.wait_count = 0
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+        self._lock = threading.Lock()
+        event.listen(engine, "connect", self._on_connect)
+        event.listen(engine, "checkout", self._on_checkout)
+        event.listen(engine, "checkin", self._on_checkin)
+
+    def _on_connect(self, *args: Any) -> None:
+        with self._lock:
+            self.connects += 1
+
+    def _on_checkout(self, *args: Any) -> None:
+        with self._lock:
+            self.checkouts += 1
+            self.in_use += 1
+            self.max_in_use = max(self.max_in_use, self.in_use)
+
+    def _on_checkin(self, *args: Any) -> None:
+        with self._lock:
+            self.checkins += 1
+            self.in_use = max(self.in_use - 1, 0)
+
+    def record_wait(self, seconds: float) -> None:
+        with self._lock:
+            self.wait_count += 1
+            self.wait_total += seconds
+            self.wait_max = max(self.wait_max, seconds)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "pool": self.engine.pool.status(),
+            "connects": self.connects,
+            "checkouts": self.checkouts,
+            "checkins": self.checkins,
+            "in_use": self.in_use,
+            "max_in_use": self.max_in_use,
+            "wait_avg": self.wait_total / self.wait_count if self.wait_count else 0.0,
+            "wait_max": self.wait_max,
+        }
 
 
 class DBWrapper:
-    def __init__(self, engine):
+    def __init__(self, engine: Engine) -> None:
         self.engine = engine
+        self.session_factory = sessionmaker(bind=engine)
+        self.pool_stats = PoolStats(engine)
+        # The session of the transaction running in the current context.
+        self.current_session: ContextVar[Optional[Session]] = ContextVar(
+            "skyline_db_session", default=None
+        )
+
+    def get_session(self) -> Session:
+        return self.session_factory()
 
-    def get_session(self):
-        Session = sessionmaker(bind=self.engine)
-        return Session()
+    def transaction(self) -> Transaction:
+        return Transaction(self)
 
-    def transaction(self):
-        session = self.get_session()
-        return Transaction(session)
+    def _run(self, func: Callable[[Session], Any]) -> Any:
+        session = self.current_session.get()
+        if session is not None:
+            return func(session)
+        with self.transaction() as session:
+            return func(session)
 
     def execute(self, query, params=None):
-        session = self.get_session()
-        with session.begin():
-            if params:
-                result = session.execute(query, params)
-            else:
-                result = session.execute(query)
-        session.close()
-        return result
+        if params:
+            return self._run(lambda session: session.execute(query, params))
+        return self._run(lambda session: session.execute(query))
 
     def fetch_one(self, query):
-        session = self.get_session()
-        with session.begin():
-            result = session.execute(query).fetchone()
-        session.close()
-        return result
+        return self._run(lambda session: session.execute(query).fetchone())
 
     def fetch_all(self, query):
-        session = self.get_session()
-        with session.begin():
-            result = session.execute(query).fetchall()
-        session.close()
-        return result
+        return self._run(lambda session: session.execute(query).fetchall())
+
+
+class AsyncDBWrapper:
+    """Asyncio counterpart of ``DBWrapper``, used from the event loop."""
+
+    def __init__(self, engine: AsyncEngine) -> None:
+        self.engine = engine
+        self.session_factory = async_sessionmaker(bind=engine)
+        self.pool_stats = PoolStats(engine.sync_engine)
+        self.current_session: ContextVar[Optional[AsyncSession]] = ContextVar(
+            "skyline_async_db_session", default=None
+        )
+
+    def get_session(self) -> AsyncSession:
+        return self.session_factory()
+
+    def transaction(self) -> AsyncTransaction:
+        return AsyncTransaction(self)
+
+    async def _run(self, func: Callable[[AsyncSession], Awaitable[Any]]) -> Any:
+        session = self.current_session.get()
+        if session is not None:
+            return await func(session)
+        async with self.transaction() as session:
+            return await func(session)
+
+    async def execute(self, query, params=None):
+        if params:
+            return await self._run(lambda session: session.execute(query, params))
+        return await self._run(lambda session: session.execute(query))
+
+    async def fetch_one(self, query):
+        result = await self.execute(query)
+        return result.fetchone()
+
+    async def fetch_all(self, query):
+        result = await self.execute(query)
+        return result.fetchall()
+
+
+def get_async_url(db_url: str) -> str:
+    """Return ``db_url`` with the asyncio driver of its database backend.
+
+    The url of other backends is kept, its driver must then support asyncio
+    too, e.g. ``postgresql+psycopg``.
+    """
+    url = make_url(db_url)
+    backend = url.get_backend_name()
+    if backend not in ASYNC_DRIVERS:
+        LOG.warning(
+            f"No known asyncio driver for database backend {backend}, "
+            "the database url is used as is"
+        )
+        return db_url
+    return url.set(drivername=ASYNC_DRIVERS[backend]).render_as_string(hide_password=False)
+
+
+def _pool_kwargs() -> Dict[str, Any]:
+    return {
+        "pool_pre_ping": True,
+        "pool_size": CONF.default.database_pool_size,
+        "max_overflow": CONF.default.database_max_overflow,
+        "pool_recycle": CONF.default.database_pool_recycle,
+        "pool_timeout": CONF.default.database_pool_timeout,
+    }
 
 
 def setup():
     db_url = CONF.default.database_url
-    global DATABASE
+    global DATABASE, ASYNC_DATABASE
     if db_url.startswith("sqlite"):
         engine = create_engine(db_url, connect_args={"check_same_thread": False})
+        async_engine = create_async_engine(get_async_url(db_url))
     else:
-        engine = create_engine(db_url, pool_pre_ping=True)
+        engine = create_engine(db_url, **_pool_kwargs())
+        async_engine = create_async_engine(get_async_url(db_url), **_pool_kwargs())
     DATABASE = DBWrapper(engine)
     DB.set(DATABASE)
+    ASYNC_DATABASE = AsyncDBWrapper(async_engine)
+
+
+def get_async_db() -> AsyncDBWrapper:
+    assert ASYNC_DATABASE is not None, "Database is not connected."
+    return ASYNC_DATABASE
+
+
+async def dispose() -> None:
+    if ASYNC_DATABASE is not None:
+        await ASYNC_DATABASE.engine.dispose()
+    if DATABASE is not None:
+        DATABASE.engine.dispose()
 
 
 def inject_db():
@@ -79,58 +226,104 @@ def inject_db():
 
 
 def get_session():
-    engine = DB.get()
-    Session = sessionmaker(bind=engine)
-    return Session()
+    return DB.get().get_session()
+
+
+def pool_stats() -> Dict[str, Any]:
+    """Return the pool stats of the synchronous and the asyncio engines."""
+    stats = {"sync": DB.get().pool_stats.to_dict()}
+    if ASYNC_DATABASE is not None:
+        stats["async"] = ASYNC_DATABASE.pool_stats.to_dict()
+    return stats
 
 
 class Transaction:
-    def __init__(self, session):
-        self.session = session
+    """Run the statements of the wrapped block in one session.
 
-    def __enter__(self):
+    Statements executed through the ``DBWrapper`` inside the block join
+    this transaction. A nested transaction joins the outer one.
+    """
+
+    def __init__(self, db: DBWrapper) -> None:
+        self.db = db
+        self.session: Optional[Session] = None
+        self._token = None
+
+    def __enter__(self) -> Session:
+        outer_session = self.db.current_session.get()
+        if outer_session is not None:
+            return outer_session
+        self.session = self.db.get_session()
+        started_at = time.monotonic()
         self.session.begin()
+        # Check out the connection now to measure the time spent waiting
+        # for the pool.
+        self.session.connection()
+        self.db.pool_stats.record_wait(time.monotonic() - started_at)
+        self._token = self.db.current_session.set(self.session)
         return self.session
 
     def __exit__(self, exc_type, exc_val, exc_tb):
-        if exc_type:
-            self.session.rollback()
-        else:
-            self.session.commit()
-        self.session.close()
+        if self.session is None:
+            return
+        self.db.current_session.reset(self._token)
+        try:
+            if exc_type:
+                self.session.rollback()
+            else:
+                self.session.commit()
+        finally:
+            self.session.close()
+
+
+class AsyncTransaction:
+    """Asyncio counterpart of ``Transaction``."""
+
+    def __init__(self, db: AsyncDBWrapper) -> None:
+        self.db = db
+        self.session: Optional[AsyncSession] = None
+        self._token = None
+
+    async def __aenter__(self) -> AsyncSession:
+        outer_session = self.db.current_session.get()
+        if outer_session is not None:
+            return outer_session
+        self.session = self.db.get_session()
+        started_at = time.monotonic()
+        await self.session.begin()
+        await self.session.connection()
+        self.db.pool_stats.record_wait(time.monotonic() - started_at)
+        self._token = self.db.current_session.set(self.session)
+        return self.session
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        if self.session is None:
+            return
+        self.db.current_session.reset(self._token)
+        try:
+            if exc_type:
+                await self.session.rollback()
+            else:
+                await self.session.commit()
+        finally:
+            await self.session.close()
 
 
 # Usage compatible with async with db.transaction():
 def transaction():
-    session = get_session()
-    return Transaction(session)
+    return DB.get().transaction()
 
 
 # Usage compatible with await db.execute(query, ...)
 def execute(query, params=None):
-    session = get_session()
-    with session.begin():
-        if params:
-            result = session.execute(query, params)
-        else:
-            result = session.execute(query)
-    session.close()
-    return result
+    return DB.get().execute(query, params)
 
 
 # Usage compatible with await db.fetch_one(query)
 def fetch_one(query):
-    session = get_session()
-    with session.begin():
-        result = session.execute(query).fetchone()
-    session.close()
-    return result
+    return DB.get().fetch_one(query)
 
 
 # Usage compatible with await db.fetch_all(query)
 def fetch_all(query):
-    session = get_session()
-    with session.begin():
-        result = session.execute(query).fetchall()
-    session.close()
-    return result
+    return DB.get().fetch_all(query)
@@ -24,6 +24,9 @@ RevokedToken = Table(
     METADATA,
     Column("uuid", String(length=128), primary_key=True, nullable=False),
     Column("expire", Integer, nullable=False),
+    # Unix time of the revocation, NULL for the tokens revoked before it
+    # was recorded.
+    Column("revoked_at", Integer, nullable=True, index=True),
 )
 
 Settings = Table(
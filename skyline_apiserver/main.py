@@ -17,7 +17,7 @@ from __future__ import annotations
 import time
 from contextlib import asynccontextmanager
 from pathlib import Path
-from typing import AsyncGenerator
+from typing import Any, AsyncGenerator, Dict
 
 import jose
 from fastapi import FastAPI, Request, status
@@ -26,17 +26,57 @@ from starlette.middleware.cors import CORSMiddleware
 
 from skyline_apiserver.api import deps
 from skyline_apiserver.api.v1 import api_router
+from skyline_apiserver.client.aio import close_async_http_client
+from skyline_apiserver.client.utils import http_pool_stats
 from skyline_apiserver.config import CONF, configure
-from skyline_apiserver.context import RequestContext
-from skyline_apiserver.core.security import generate_profile_by_token, parse_access_token
-from skyline_apiserver.db import api as db_api, setup as db_setup
+from skyline_apiserver.context import LazyRequestContext
+from skyline_apiserver.core.projects import PROJECTS
+from skyline_apiserver.core.revocation import REVOKED_TOKENS
+from skyline_apiserver.core.routes import PUBLIC_ROUTES, PUBLIC_URL_PREFIXES
+from skyline_apiserver.core.security import (
+    async_generate_profile_by_token,
+    get_identity_executor,
+    get_token_renewals,
+    parse_access_token,
+    shutdown_identity_executor,
+)
+from skyline_apiserver.db import (
+    async_api as db_api,
+    dispose as db_dispose,
+    pool_stats as db_pool_stats,
+    setup as db_setup,
+)
 from skyline_apiserver.log import LOG, setup as log_setup
 from skyline_apiserver.policy import setup as policies_setup
 from skyline_apiserver.types import constants
+from skyline_apiserver.utils.executor import ExecutorBusy
+from skyline_apiserver.utils.fanout import shutdown_fanout_executor
+from skyline_apiserver.utils.periodic import PeriodicTasks
 
 PROJECT_NAME = "Skyline API"
 
 
+async def purge_revoked_token() -> None:
+    purged = await db_api.purge_revoked_token(
+        batch_size=CONF.default.revoked_token_purge_batch_size,
+    )
+    LOG.debug(f"Purged {purged} expired revoked tokens")
+
+
+def runtime_stats() -> Dict[str, Any]:
+    return {
+        "routes": PUBLIC_ROUTES.stats(),
+        "token_renewals": get_token_renewals().stats(),
+        "identity_executor": get_identity_executor().stats(),
+        "openstack_http_pools": http_pool_stats(),
+        "database_pool": db_pool_stats(),
+    }
+
+
+async def log_runtime_stats() -> None:
+    LOG.info(f"Runtime stats: {runtime_stats()}")
+
+
 @asynccontextmanager
 async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
     configure("skyline")
@@ -46,6 +86,7 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
     )
     policies_setup()
     db_setup()
+    PUBLIC_ROUTES.load(PUBLIC_URL_PREFIXES + tuple(CONF.default.public_url_prefixes))
 
     # Set all CORS enabled origins
     if CONF.default.cors_allow_origins:
@@ -56,8 +97,36 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
             allow_methods=["*"],
             allow_headers=["*"],
         )
+
+    periodic_tasks = PeriodicTasks()
+    periodic_tasks.start(
+        "purge_revoked_token",
+        CONF.default.revoked_token_purge_interval,
+        purge_revoked_token,
+    )
+    periodic_tasks.start(
+        "refresh_revoked_tokens",
+        CONF.default.revoked_token_refresh_interval,
+        REVOKED_TOKENS.refresh,
+    )
+    periodic_tasks.start(
+        "refresh_project_directory",
+        CONF.default.project_directory_refresh_interval,
+        PROJECTS.refresh,
+    )
+    periodic_tasks.start(
+        "log_runtime_stats",
+        CONF.default.stats_log_interval,
+        log_runtime_stats,
+    )
     LOG.debug("Skyline API server start")
     yield
+    await periodic_tasks.stop()
+    await log_runtime_stats()
+    shutdown_identity_executor()
+    shutdown_fanout_executor()
+    await close_async_http_client()
+    await db_dispose()
     LOG.debug("Skyline API server stop")
 
 
@@ -74,23 +143,8 @@ async def validate_token(request: Request, call_next):
     LOG.debug(f"Request path: {url_path}")
 
     # Skip authentication for login and static endpoints
-    ignore_urls = [
-        f"{constants.API_PREFIX}/login",
-        f"{constants.API_PREFIX}/websso",
-        "/static",
-        "/docs",
-        f"{constants.API_PREFIX}/openapi.json",
-        "/favicon.ico",
-        f"{constants.API_PREFIX}/sso",
-        f"{constants.API_PREFIX}/config",
-        f"{constants.API_PREFIX}/contrib/keystone_endpoints",
-        # f"{constants.API_PREFIX}/contrib/domains",
-        f"{constants.API_PREFIX}/contrib/regions",
-    ]
-
-    for ignore_url in ignore_urls:
-        if url_path.startswith(ignore_url):
-            return await call_next(request)
+    if PUBLIC_ROUTES.match_public(url_path) is not None:
+        return await call_next(request)
 
     if url_path.startswith(constants.API_PREFIX):
         # Get token from cookie
@@ -102,13 +156,9 @@ async def validate_token(request: Request, call_next):
             )
 
         try:
-            # Purge revoked tokens
-            db_api.purge_revoked_token()
-
             # Parse and validate token
             parsed_token = parse_access_token(token)
-            is_revoked = db_api.check_token(parsed_token.uuid)
-            if is_revoked:
+            if await REVOKED_TOKENS.is_revoked(parsed_token.uuid):
                 return JSONResponse(
                     content={"message": "Unauthorized: Token revoked"},
                     status_code=status.HTTP_401_UNAUTHORIZED,
@@ -116,33 +166,32 @@ async def validate_token(request: Request, call_next):
 
             # Generate profile from token
             original_ip = deps.get_original_ip(request)
-            profile = generate_profile_by_token(
+            profile = await async_generate_profile_by_token(
                 parsed_token,
                 original_ip=original_ip,
             )
 
-            # Create RequestContext from profile
-            request.state.context = RequestContext(
-                user_id=profile.user.id,
-                project_id=profile.project.id,
-                project_name=profile.project.name,
-                user_domain_id=profile.user.domain.id,
-                project_domain_id=profile.project.domain.id,
-                roles=[role.name for role in profile.roles],
-                auth_token=profile.keystone_token,
-            )
+            # The RequestContext is only built if a handler reads it
+            request.state.context = LazyRequestContext(profile)
 
             # Store profile in request state for backward compatibility
             request.state.profile = profile
 
             # Check if token needs renewal
             if 0 < profile.exp - time.time() < CONF.default.access_token_renew:
-                profile.exp = int(time.time()) + CONF.default.access_token_expire
+                # Concurrent requests of the session share the same renewed token
+                new_token, profile.exp = get_token_renewals().renew(profile)
                 # Note: We can't set cookies in middleware, so we'll handle this in the response
                 request.state.token_needs_renewal = True
-                request.state.new_token = profile.toJWTPayload()
+                request.state.new_token = new_token
                 request.state.new_exp = str(profile.exp)
 
+        except ExecutorBusy as e:
+            LOG.warning(f"Rejecting request to {url_path}: {e}")
+            return JSONResponse(
+                content={"message": "Service Unavailable: Too many pending requests"},
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            )
         except jose.exceptions.ExpiredSignatureError as e:
             return JSONResponse(
                 content={"message": f"Unauthorized: Token expired - {str(e)}"},
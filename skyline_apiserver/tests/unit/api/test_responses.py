@@ -0,0 +1,123 @@
+# Copyright 2021 99cloud
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import json
+import uuid
+from datetime import datetime, timezone
+from unittest.mock import patch
+
+import pytest
+from fastapi.datastructures import DefaultPlaceholder
+from fastapi.responses import PlainTextResponse
+from pydantic import ValidationError
+
+from skyline_apiserver import schemas
+from skyline_apiserver.api import responses
+from skyline_apiserver.api.wrapper.skyline import Server
+from skyline_apiserver.schemas.extension import ServerStatus, SortDir
+
+
+def _servers():
+    server, origin_data = Server(
+        {
+            "id": "6f2c1d0e-3b4a-4c5d-8e9f-0a1b2c3d4e5f",
+            "name": "server",
+            "tenant_id": "project-1",
+            "image": {"id": "0d9f8e7c-6b5a-4c3d-9e2f-1a0b9c8d7e6f"},
+            "flavor": {"original_name": "m1.small", "vcpus": 1, "unknown": "dropped"},
+            "addresses": {"private": [{"addr": "10.0.0.3", "OS-EXT-IPS:type": "fixed"}]},
+            "status": "ACTIVE",
+            "os-extended-volumes:volumes_attached": [],
+        },
+    ).to_dicts()
+    server["origin_data"] = origin_data
+    server["image_name"] = "cirros"
+    return {"servers": [server]}
+
+
+@patch("skyline_apiserver.api.responses.CONF")
+class TestAPIJSONResponse:
+    def test_render(self, mock_conf):
+        content = {
+            "id": uuid.UUID("6f2c1d0e-3b4a-4c5d-8e9f-0a1b2c3d4e5f"),
+            "created_at": datetime(2021, 1, 2, 3, 4, 5, tzinfo=timezone.utc),
+            "status": ServerStatus.ACTIVE,
+            "sort_dir": SortDir.desc,
+            "name": "云主机",
+            "profile": schemas.Message(message="ok"),
+            1: None,
+        }
+        bodies = []
+        for library in ("orjson", "json"):
+            mock_conf.default.json_library = library
+            bodies.append(responses.APIJSONResponse(content).body)
+
+        assert json.loads(bodies[0]) == json.loads(bodies[1])
+        assert json.loads(bodies[0]) == {
+            "id": "6f2c1d0e-3b4a-4c5d-8e9f-0a1b2c3d4e5f",
+            "created_at": "2021-01-02T03:04:05+00:00",
+            "status": "ACTIVE",
+            "sort_dir": "desc",
+            "name": "云主机",
+            "profile": {"message": "ok", "code": 200, "title": "OK"},
+            "1": None,
+        }
+
+    def test_render_unknown_type(self, mock_conf):
+        for library in ("orjson", "json"):
+            mock_conf.default.json_library = library
+            with pytest.raises(TypeError):
+                responses.APIJSONResponse({"value": object()})
+
+
+class TestAPIRoute:
+    def test_response_class(self):
+        route = responses.APIRoute("/servers", lambda: None)
+        # Left as a default, FastAPI still writes response models itself.
+        assert isinstance(route.response_class, DefaultPlaceholder)
+        assert route.response_class.value is responses.APIJSONResponse
+
+        route = responses.APIRoute("/metrics", lambda: "", response_class=PlainTextResponse)
+        assert route.response_class is PlainTextResponse
+
+
+@patch("skyline_apiserver.api.responses.CONF")
+class TestModelResponse:
+    def test_trusted_matches_validated(self, mock_conf):
+        mock_conf.default.json_library = "orjson"
+        mock_conf.default.validate_responses = True
+        validated = responses.model_response(schemas.ServersResponse, _servers())
+        mock_conf.default.validate_responses = False
+        trusted = responses.model_response(schemas.ServersResponse, _servers())
+
+        assert trusted.media_type == "application/json"
+        assert json.loads(trusted.body) == json.loads(validated.body)
+        (server,) = json.loads(trusted.body)["servers"]
+        # Keys outside of the response model are not written.
+        assert "volumes_attached" not in server
+        assert "unknown" not in server["flavor_info"]
+        assert server["flavor_info"]["ram"] is None
+
+    def test_trusted_skips_validation(self, mock_conf):
+        mock_conf.default.json_library = "json"
+        content = _servers()
+        content["servers"][0]["id"] = "not-a-uuid"
+
+        mock_conf.default.validate_responses = True
+        with pytest.raises(ValidationError):
+            responses.dump_json(schemas.ServersResponse, content)
+
+        mock_conf.default.validate_responses = False
+        body = json.loads(responses.dump_json(schemas.ServersResponse, content))
+        assert body["servers"][0]["id"] == "not-a-uuid"
@@ -0,0 +1,110 @@
+# Copyright 2021 99cloud
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from types import SimpleNamespace
+
+from cinderclient.v3.volumes import Volume as CinderVolume
+from novaclient.v2.servers import Server as NovaServer
+
+from skyline_apiserver.api.wrapper.openstack import OSServer, OSVolume
+from skyline_apiserver.api.wrapper.skyline import Port, Server, Volume
+
+
+def _server_info():
+    return {
+        "id": "server-1",
+        "name": "server",
+        "tenant_id": "project-1",
+        "image": {"id": "image-1"},
+        "flavor": {"original_name": "m1.small"},
+        "addresses": {
+            "private": [
+                {"addr": "10.0.0.3", "OS-EXT-IPS:type": "fixed"},
+                {"addr": "172.24.4.3", "OS-EXT-IPS:type": "floating"},
+            ],
+            "public": [{"addr": "172.24.4.4", "OS-EXT-IPS:type": "fixed"}],
+        },
+        "status": "ACTIVE",
+        "os-extended-volumes:volumes_attached": [{"id": "volume-1"}],
+    }
+
+
+class TestServer:
+    def test_to_dict(self):
+        server = Server(_server_info()).to_dict()
+
+        assert list(server) == list(Server._attrs_mapping)
+        assert server["project_id"] == "project-1"
+        assert server["image"] == "image-1"
+        assert server["flavor"] == "m1.small"
+        assert server["flavor_info"] == {"original_name": "m1.small"}
+        assert server["fixed_addresses"] == ["10.0.0.3", "172.24.4.4"]
+        assert server["floating_addresses"] == ["172.24.4.3"]
+        assert server["volumes_attached"] == [{"id": "volume-1"}]
+        assert server["image_name"] is None
+
+    def test_to_dicts_of_resource(self):
+        resource = NovaServer(None, _server_info(), loaded=True)
+
+        server, origin_data = Server(resource).to_dicts()
+
+        assert server == Server(_server_info()).to_dict()
+        assert origin_data == OSServer(resource).to_dict()
+        assert origin_data["addresses"] == _server_info()["addresses"]
+        assert origin_data["locked"] is None
+
+    def test_to_dict_of_object(self):
+        info = _server_info()
+        info["image"] = ""
+        resource = SimpleNamespace(**{key: v for key, v in info.items() if ":" not in key})
+
+        server = Server(resource).to_dict()
+
+        assert server["id"] == "server-1"
+        assert server["image"] is None
+        assert server["fixed_addresses"] == ["10.0.0.3", "172.24.4.4"]
+
+
+class TestVolume:
+    def test_to_dicts(self):
+        info = {
+            "id": "volume-1",
+            "os-vol-tenant-attr:tenant_id": "project-1",
+            "attachments": [],
+            "size": 1,
+        }
+        resource = CinderVolume(None, info, loaded=True)
+
+        volume, origin_data = Volume(resource).to_dicts()
+
+        assert volume["project_id"] == "project-1"
+        assert volume["size"] == 1
+        assert volume["name"] is None
+        assert origin_data == OSVolume(resource).to_dict()
+
+
+class TestPort:
+    def test_to_dict(self):
+        port = Port(
+            {
+                "id": "port-1",
+                "fixed_ips": [{"ip_address": "10.0.0.3"}, {"ip_address": "fd00::3"}],
+                "binding:vnic_type": "normal",
+            },
+        ).to_dict()
+
+        assert port["ipv4"] == ["10.0.0.3"]
+        assert port["ipv6"] == ["fd00::3"]
+        assert port["binding_vnic_type"] == "normal"
+        assert Port({}).to_dict()["ipv4"] == []
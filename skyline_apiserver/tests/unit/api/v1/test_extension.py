@@ -12,11 +12,39 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-from unittest.mock import Mock, patch
+import asyncio
+import json
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import AsyncMock, Mock, patch
 
 import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from neutronclient.common.exceptions import NotFound as NeutronNotFound
 
-from skyline_apiserver.api.v1.extension import list_recycle_servers
+from skyline_apiserver import schemas
+from skyline_apiserver.api import deps
+from skyline_apiserver.api.v1 import extension
+from skyline_apiserver.api.v1.extension import compute_services, list_recycle_servers
+from skyline_apiserver.client.openstack import neutron
+from skyline_apiserver.utils import fanout
+
+
+def _model_response(model, content, headers=None):
+    return model(**content)
+
+
+@pytest.fixture(autouse=True)
+def extension_caches():
+    extension.SERVER_NAMES = None
+    extension.NETWORK_NAMES = None
+    extension.IMAGES = None
+    fanout.FANOUT_EXECUTOR = ThreadPoolExecutor(max_workers=4)
+    yield
+    extension.SERVER_NAMES = None
+    extension.NETWORK_NAMES = None
+    extension.IMAGES = None
+    fanout.shutdown_fanout_executor()
 
 
 class TestListRecycleServersReal:
@@ -41,29 +69,28 @@ class TestListRecycleServersReal:
             "volumes_attached": [{"id": "test-volume-id", "device": "/dev/vda"}],
             "updated_at": "2024-01-01T00:00:00Z",
             "project_id": "test-project-id",
+            "host": "test-host",
         }
 
     @patch("skyline_apiserver.api.v1.extension.nova")
     @patch("skyline_apiserver.api.v1.extension.glance")
     @patch("skyline_apiserver.api.v1.extension.cinder")
-    @patch("skyline_apiserver.api.v1.extension.keystone")
+    @patch("skyline_apiserver.api.v1.extension.PROJECTS")
     @patch("skyline_apiserver.api.v1.extension.generate_session")
     @patch("skyline_apiserver.api.v1.extension.get_system_session")
-    @patch("skyline_apiserver.api.v1.extension.OSServer")
     @patch("skyline_apiserver.api.v1.extension.Server")
-    @patch("skyline_apiserver.api.v1.extension.RecycleServersResponseBase")
+    @patch("skyline_apiserver.api.v1.extension.model_response")
     @patch("skyline_apiserver.api.v1.extension.schemas")
     @patch("skyline_apiserver.api.v1.extension.CONF")
     def test_list_recycle_servers_basic(
         self,
         mock_conf,
         mock_schemas,
-        mock_recycle_response_base,
+        mock_model_response,
         mock_server,
-        mock_os_server,
         mock_get_system_session,
         mock_generate_session,
-        mock_keystone,
+        mock_projects,
         mock_cinder,
         mock_glance,
         mock_nova,
@@ -73,6 +100,8 @@ class TestListRecycleServersReal:
         """Test basic functionality of list_recycle_servers function"""
         # Setup configuration mock
         mock_conf.openstack.reclaim_instance_interval = 86400
+        mock_conf.default.image_cache_size = 0
+        mock_conf.default.image_cache_ttl = 0
 
         # Setup mocks
         mock_system_session = Mock()
@@ -83,13 +112,9 @@ class TestListRecycleServersReal:
 
         # Mock server list response
         mock_server_obj = Mock()
-        mock_server_obj.to_dict.return_value = mock_server_data
+        mock_server_obj.to_dicts.return_value = (mock_server_data, mock_server_data)
         mock_server.return_value = mock_server_obj
 
-        mock_os_server_obj = Mock()
-        mock_os_server_obj.to_dict.return_value = mock_server_data
-        mock_os_server.return_value = mock_os_server_obj
-
         # Mock nova.list_servers response
         mock_nova.list_servers.return_value = [mock_server_obj]
 
@@ -99,20 +124,6 @@ class TestListRecycleServersReal:
         # Mock cinder.list_volumes response (empty)
         mock_cinder.list_volumes.return_value = []
 
-        # Mock RecycleServersResponseBase
-        mock_recycle_obj = Mock()
-        mock_recycle_obj.id = "test-server-id"
-        mock_recycle_obj.image = "test-image-id"
-        mock_recycle_obj.updated_at = "2024-01-01T00:00:00Z"
-        mock_recycle_obj.project_id = "test-project-id"
-        mock_recycle_obj.host = "test-host"
-        mock_recycle_response_base.parse_obj.return_value = mock_recycle_obj
-
-        # Mock schemas.RecycleServersResponse
-        mock_response = Mock()
-        mock_response.recycle_servers = [mock_recycle_obj]
-        mock_schemas.RecycleServersResponse.return_value = mock_response
-
         # Call the actual function
         with patch(
             "skyline_apiserver.api.v1.extension.deps.get_original_ip",
@@ -135,12 +146,14 @@ class TestListRecycleServersReal:
             )
 
         # Assertions
-        assert result is not None
-        assert hasattr(result, "recycle_servers")
-        mock_generate_session.assert_called_once_with(
-            mock_profile,
-            original_ip="198.51.100.20",
-        )
+        assert result is mock_model_response.return_value
+        model, content = mock_model_response.call_args[0]
+        assert model is mock_schemas.RecycleServersResponse
+        (recycle_server,) = content["recycle_servers"]
+        assert recycle_server["host"] is None
+        assert recycle_server["deleted_at"] == "2024-01-01T00:00:00Z"
+        assert recycle_server["reclaim_timestamp"] == 1704067200 + 86400
+        mock_generate_session.assert_not_called()
         mock_get_system_session.assert_called_once_with(original_ip="198.51.100.20")
 
         # Verify nova.list_servers was called with correct parameters
@@ -157,8 +170,8 @@ class TestListRecycleServersReal:
         mock_glance.list_images.assert_called()
         mock_cinder.list_volumes.assert_called()
 
-        # Verify keystone was not called (since all_projects=False)
-        mock_keystone.list_projects.assert_not_called()
+        # Verify projects were not named (since all_projects=False)
+        mock_projects.get_names.assert_not_called()
 
 
 class TestListVolumesReal:
@@ -185,8 +198,8 @@ class TestListVolumesReal:
     @patch("skyline_apiserver.api.v1.extension.cinder")
     @patch("skyline_apiserver.api.v1.extension.generate_session")
     @patch("skyline_apiserver.api.v1.extension.get_system_session")
-    @patch("skyline_apiserver.api.v1.extension.OSVolume")
     @patch("skyline_apiserver.api.v1.extension.Volume")
+    @patch("skyline_apiserver.api.v1.extension.model_response", _model_response)
     @patch("skyline_apiserver.api.v1.extension.schemas")
     @patch("skyline_apiserver.api.v1.extension.CONF")
     def test_list_volumes_basic(
@@ -194,7 +207,6 @@ class TestListVolumesReal:
         mock_conf,
         mock_schemas,
         mock_volume,
-        mock_os_volume,
         mock_get_system_session,
         mock_generate_session,
         mock_cinder,
@@ -204,6 +216,9 @@ class TestListVolumesReal:
     ):
         # 配置 mock
         mock_conf.openstack.reclaim_instance_interval = 86400
+        mock_conf.default.server_name_cache_size = 0
+        mock_conf.default.server_name_cache_ttl = 0
+        mock_conf.default.fanout_concurrency = 4
 
         mock_system_session = Mock()
         mock_get_system_session.return_value = mock_system_session
@@ -213,13 +228,9 @@ class TestListVolumesReal:
 
         # mock volume对象
         mock_volume_obj = Mock()
-        mock_volume_obj.to_dict.return_value = mock_volume_data
+        mock_volume_obj.to_dicts.return_value = (mock_volume_data, mock_volume_data)
         mock_volume.return_value = mock_volume_obj
 
-        mock_os_volume_obj = Mock()
-        mock_os_volume_obj.to_dict.return_value = mock_volume_data
-        mock_os_volume.return_value = mock_os_volume_obj
-
         # cinder.list_volumes 返回 (volumes, count)
         mock_cinder.list_volumes.return_value = ([mock_volume_obj], 1)
 
@@ -268,6 +279,434 @@ class TestListVolumesReal:
         mock_cinder.list_volumes.assert_called_once()
         mock_nova.list_servers.assert_called()
 
+    @patch("skyline_apiserver.api.v1.extension.nova")
+    @patch("skyline_apiserver.api.v1.extension.cinder")
+    @patch("skyline_apiserver.api.v1.extension.generate_session")
+    @patch("skyline_apiserver.api.v1.extension.get_system_session")
+    @patch("skyline_apiserver.api.v1.extension.Volume")
+    @patch("skyline_apiserver.api.v1.extension.model_response", _model_response)
+    @patch("skyline_apiserver.api.v1.extension.schemas")
+    @patch("skyline_apiserver.api.v1.extension.CONF")
+    def test_list_volumes_batches_server_names(
+        self,
+        mock_conf,
+        mock_schemas,
+        mock_volume,
+        mock_get_system_session,
+        mock_generate_session,
+        mock_cinder,
+        mock_nova,
+        mock_profile,
+    ):
+        mock_conf.default.server_name_cache_size = 100
+        mock_conf.default.server_name_cache_ttl = 30
+        mock_conf.default.fanout_concurrency = 4
+        volumes = [
+            {"id": f"volume-{i}", "attachments": [{"server_id": f"server-{i}"}]} for i in range(3)
+        ]
+        mock_volume.side_effect = [Mock(to_dicts=Mock(return_value=(v, {}))) for v in volumes]
+        mock_cinder.list_volumes.return_value = (volumes, 3)
+
+        def server(server_id):
+            obj = Mock(id=server_id)
+            obj.name = f"{server_id}-name"
+            return obj
+
+        # Two servers are active, the third one is in the recycle bin.
+        def list_servers(search_opts, **kwargs):
+            if search_opts.get("status") == "soft_deleted":
+                return [server(search_opts["uuid"])]
+            if search_opts["uuid"] == "server-2":
+                return []
+            return [server(search_opts["uuid"])]
+
+        mock_nova.list_servers.side_effect = list_servers
+
+        def call():
+            with patch(
+                "skyline_apiserver.api.v1.extension.deps.get_original_ip",
+                return_value="198.51.100.20",
+            ):
+                extension.list_volumes(
+                    request=Mock(),
+                    profile=mock_profile,
+                    x_openstack_request_id="test-request-id",
+                    all_projects=False,
+                    limit=None,
+                    marker=None,
+                    sort_dirs=None,
+                    sort_keys=None,
+                    project_id=None,
+                    name=None,
+                    multiattach=None,
+                    status=None,
+                    bootable=None,
+                    uuid=None,
+                )
+
+        call()
+
+        # One call per server, the recycle bin only for the server not found.
+        search_opts = sorted(
+            (c.kwargs["search_opts"]["uuid"], c.kwargs["search_opts"].get("status", ""))
+            for c in mock_nova.list_servers.call_args_list
+        )
+        assert search_opts == [
+            ("server-0", ""),
+            ("server-1", ""),
+            ("server-2", ""),
+            ("server-2", "soft_deleted"),
+        ]
+        assert all(c.kwargs["detailed"] is False for c in mock_nova.list_servers.call_args_list)
+        names = [
+            v["attachments"][0]["server_name"]
+            for v in mock_schemas.VolumesResponse.call_args[1]["volumes"]
+        ]
+        assert names == ["server-0-name", "server-1-name", "server-2-name"]
+
+        # The next page is named from the cache.
+        mock_volume.side_effect = [Mock(to_dicts=Mock(return_value=(v, {}))) for v in volumes]
+        call()
+        assert mock_nova.list_servers.call_count == 4
+
+
+class TestGetServerNames:
+    """Test cases for the batched server name resolver"""
+
+    @patch("skyline_apiserver.api.v1.extension.nova")
+    @patch("skyline_apiserver.api.v1.extension.CONF")
+    def test_calls_follow_the_requested_ids(self, mock_conf, mock_nova):
+        mock_conf.default.server_name_cache_size = 1000
+        mock_conf.default.server_name_cache_ttl = 30
+        mock_conf.default.fanout_concurrency = 4
+        profile = Mock(region="RegionOne")
+
+        def list_servers(search_opts, **kwargs):
+            assert search_opts["all_tenants"] is True
+            if search_opts["uuid"] == "gone":
+                return []
+            server = Mock(id=search_opts["uuid"])
+            server.name = f"{server.id}-name"
+            return [server]
+
+        mock_nova.list_servers.side_effect = list_servers
+        server_ids = [f"server-{i}" for i in range(10)] + ["gone", "server-0"]
+
+        names = extension.get_server_names(
+            profile=profile,
+            session=Mock(),
+            global_request_id="req-1",
+            server_ids=server_ids,
+            all_projects=True,
+        )
+
+        assert names["server-0"] == "server-0-name"
+        assert names["server-9"] == "server-9-name"
+        assert names["gone"] is None
+        # Nova keeps a single uuid filter, so one call per distinct server.
+        assert mock_nova.list_servers.call_count == 11
+
+        mock_nova.list_servers.reset_mock()
+        cached = extension.get_server_names(
+            profile=profile,
+            session=Mock(),
+            global_request_id="req-2",
+            server_ids=server_ids,
+            all_projects=True,
+        )
+        assert cached == names
+        mock_nova.list_servers.assert_not_called()
+
+
+class TestGetNetworkNames:
+    """Test cases for the network name cache"""
+
+    @patch("skyline_apiserver.api.v1.extension.neutron")
+    @patch("skyline_apiserver.api.v1.extension.CONF")
+    def test_warm_cache_skips_neutron(self, mock_conf, mock_neutron):
+        mock_conf.default.network_name_cache_size = 100
+        mock_conf.default.network_name_cache_ttl = 300
+        mock_conf.default.fanout_concurrency = 4
+
+        def list_networks(**kwargs):
+            if kwargs.get("shared"):
+                return {"networks": [{"id": "public", "name": "public-net"}]}
+            assert kwargs["project_id"] == "project-1"
+            return {
+                "networks": [{"id": net_id, "name": f"{net_id}-net"} for net_id in kwargs["id"]]
+            }
+
+        mock_neutron.list_networks.side_effect = list_networks
+        admin = Mock(region="RegionOne")
+        admin.project.id = "project-1"
+
+        names = extension.get_network_names(
+            profile=admin,
+            session=Mock(),
+            global_request_id="req-1",
+            network_ids={"private", "public"},
+            all_projects=False,
+        )
+        assert names == {"private": "private-net", "public": "public-net"}
+        assert mock_neutron.list_networks.call_count == 2
+
+        # Another user of the same region is served from the cache.
+        user = Mock(region="RegionOne")
+        user.project.id = "project-2"
+        mock_neutron.list_networks.reset_mock()
+        names = extension.get_network_names(
+            profile=user,
+            session=Mock(),
+            global_request_id="req-2",
+            network_ids={"public"},
+            all_projects=False,
+        )
+        assert names == {"public": "public-net"}
+        mock_neutron.list_networks.assert_not_called()
+
+
+class TestListPortsStream:
+    """Test cases for the streaming mode of list_ports"""
+
+    @staticmethod
+    def _port(i):
+        return {
+            "id": f"port-{i}",
+            "name": f"port-{i}",
+            "fixed_ips": [{"ip_address": f"10.0.0.{i}"}],
+            "mac_address": "fa:16:3e:00:00:00",
+            "device_owner": "compute:nova",
+            "device_id": "server-1",
+            "status": "ACTIVE",
+            "created_at": "2021-01-01T00:00:00Z",
+            "project_id": "project-1",
+            "network_id": "network-1",
+        }
+
+    @staticmethod
+    def _list_ports(stream, limit=None):
+        with patch(
+            "skyline_apiserver.api.v1.extension.deps.get_original_ip",
+            return_value="198.51.100.20",
+        ):
+            profile = Mock(region="RegionOne")
+            profile.project.id = "project-1"
+            return extension.list_ports(
+                request=Mock(),
+                profile=profile,
+                x_openstack_request_id="req-1",
+                limit=limit,
+                marker=None,
+                sort_dirs=None,
+                sort_keys=None,
+                all_projects=False,
+                project_id=None,
+                name=None,
+                status=None,
+                network_name=None,
+                network_id=None,
+                device_id=None,
+                device_owner=None,
+                uuid=None,
+                stream=stream,
+            )
+
+    @staticmethod
+    def _read(response):
+        async def read():
+            return b"".join([chunk async for chunk in response.body_iterator])
+
+        return asyncio.run(read())
+
+    @staticmethod
+    def _set_conf(mock_conf):
+        mock_conf.default.server_name_cache_size = 100
+        mock_conf.default.server_name_cache_ttl = 30
+        mock_conf.default.network_name_cache_size = 100
+        mock_conf.default.network_name_cache_ttl = 300
+        mock_conf.default.fanout_concurrency = 4
+
+    @patch("skyline_apiserver.api.responses.CONF")
+    @patch("skyline_apiserver.api.v1.extension.generate_session")
+    @patch("skyline_apiserver.api.v1.extension.nova")
+    @patch("skyline_apiserver.api.v1.extension.neutron")
+    @patch("skyline_apiserver.api.v1.extension.CONF")
+    def test_stream_all_pages(
+        self,
+        mock_conf,
+        mock_neutron,
+        mock_nova,
+        mock_generate_session,
+        mock_responses_conf,
+    ):
+        mock_responses_conf.default.validate_responses = True
+        self._set_conf(mock_conf)
+        pages = [
+            {"ports": [self._port(1), self._port(2)]},
+            {"ports": []},
+            {"ports": [self._port(3)]},
+        ]
+        mock_neutron.list_ports.side_effect = lambda *args, **kwargs: iter(pages)
+        mock_neutron.next_page.side_effect = neutron.next_page
+        mock_neutron.list_networks.return_value = {
+            "networks": [{"id": "network-1", "name": "private"}],
+        }
+        server = Mock(id="server-1")
+        server.name = "vm-1"
+        mock_nova.list_servers.return_value = [server]
+
+        response = self._list_ports(stream=True, limit=2)
+
+        body = json.loads(self._read(response))
+        assert mock_neutron.list_ports.call_args[1]["limit"] == 2
+        assert [port["id"] for port in body["ports"]] == ["port-1", "port-2", "port-3"]
+        assert {port["server_name"] for port in body["ports"]} == {"vm-1"}
+        assert {port["network_name"] for port in body["ports"]} == {"private"}
+        # Only the attached server is looked up, the names of later pages
+        # come from the caches.
+        mock_nova.list_servers.assert_called_once()
+        assert mock_nova.list_servers.call_args.kwargs["search_opts"] == {
+            "uuid": "server-1",
+            "all_tenants": False,
+        }
+
+        # The streamed ports are the ones of the buffered response.
+        mock_neutron.list_ports.side_effect = lambda *args, **kwargs: iter(pages[:1])
+        buffered = self._list_ports(stream=False)
+        assert json.loads(buffered.body)["ports"] == body["ports"][:2]
+
+        # The trusted ports have the same keys as the validated ones.
+        mock_responses_conf.default.validate_responses = False
+        trusted = self._list_ports(stream=False)
+        assert json.loads(trusted.body) == json.loads(buffered.body)
+
+    @patch("skyline_apiserver.api.v1.extension.generate_session")
+    @patch("skyline_apiserver.api.v1.extension.neutron")
+    @patch("skyline_apiserver.api.v1.extension.deps.get_original_ip")
+    @patch("skyline_apiserver.api.v1.extension.CONF")
+    def test_stream_first_page_error(
+        self,
+        mock_conf,
+        mock_get_original_ip,
+        mock_neutron,
+        mock_generate_session,
+    ):
+        self._set_conf(mock_conf)
+        mock_get_original_ip.return_value = "198.51.100.20"
+
+        def pages():
+            raise NeutronNotFound(message="Marker port-0 could not be found.")
+            yield
+
+        mock_neutron.list_ports.side_effect = lambda *args, **kwargs: pages()
+        mock_neutron.next_page.side_effect = neutron.next_page
+        profile = Mock(region="RegionOne")
+        profile.project.id = "project-1"
+        app = FastAPI()
+        app.include_router(extension.router)
+        app.dependency_overrides[deps.get_profile_update_jwt] = lambda: profile
+
+        response = TestClient(app).get(
+            "/extension/ports",
+            params={"stream": True, "marker": "port-0"},
+        )
+
+        # The error is returned before the response starts.
+        assert response.status_code == 404
+        assert response.json() == {"detail": "Marker port-0 could not be found."}
+
+    @patch("skyline_apiserver.api.responses.CONF")
+    @patch("skyline_apiserver.api.v1.extension.generate_session")
+    @patch("skyline_apiserver.api.v1.extension.nova")
+    @patch("skyline_apiserver.api.v1.extension.neutron")
+    @patch("skyline_apiserver.api.v1.extension.CONF")
+    def test_stream_aborts_on_later_page_error(
+        self,
+        mock_conf,
+        mock_neutron,
+        mock_nova,
+        mock_generate_session,
+        mock_responses_conf,
+    ):
+        mock_responses_conf.default.validate_responses = False
+        mock_responses_conf.default.json_library = "orjson"
+        self._set_conf(mock_conf)
+
+        def pages():
+            yield {"ports": [self._port(1)]}
+            raise NeutronNotFound(message="Token expired.")
+
+        mock_neutron.list_ports.side_effect = lambda *args, **kwargs: pages()
+        mock_neutron.next_page.side_effect = neutron.next_page
+        mock_neutron.list_networks.return_value = {"networks": []}
+        mock_nova.list_servers.return_value = []
+
+        response = self._list_ports(stream=True)
+        chunks = []
+
+        async def read():
+            async for chunk in response.body_iterator:
+                chunks.append(chunk)
+
+        # The response is not ended as if it was complete.
+        with pytest.raises(NeutronNotFound):
+            asyncio.run(read())
+        (chunk,) = chunks
+        assert chunk.startswith(b'{"ports":[{"id":"port-1"')
+        with pytest.raises(ValueError):
+            json.loads(chunk)
+
+
+class TestGetImageMetadata:
+    """Test cases for the image metadata cache"""
+
+    @patch("skyline_apiserver.api.v1.extension.glance")
+    @patch("skyline_apiserver.api.v1.extension.CONF")
+    def test_only_misses_go_to_glance(self, mock_conf, mock_glance):
+        mock_conf.default.image_cache_size = 100
+        mock_conf.default.image_cache_ttl = 300
+        profile = Mock(region="RegionOne")
+
+        def image(image_id):
+            obj = Mock(id=image_id, os_distro="ubuntu")
+            obj.name = f"{image_id}-name"
+            return obj
+
+        mock_glance.list_images.return_value = [image("image-1"), image("image-2")]
+        mappings = extension.get_image_metadata(
+            profile=profile,
+            session=Mock(),
+            global_request_id="req-1",
+            image_ids=["image-1", "image-2", "deleted"],
+        )
+        assert mappings == {
+            "image-1": {"name": "image-1-name", "image_os_distro": "ubuntu"},
+            "image-2": {"name": "image-2-name", "image_os_distro": "ubuntu"},
+        }
+        filters = mock_glance.list_images.call_args[1]["filters"]
+        assert filters == {"id": "in:image-1,image-2,deleted"}
+
+        mock_glance.list_images.reset_mock()
+        mock_glance.list_images.return_value = [image("image-3")]
+        mappings = extension.get_image_metadata(
+            profile=profile,
+            session=Mock(),
+            global_request_id="req-2",
+            image_ids=["image-1", "deleted", "image-3"],
+        )
+        assert set(mappings) == {"image-1", "image-3"}
+        mock_glance.list_images.assert_called_once()
+        assert mock_glance.list_images.call_args[1]["filters"] == {"id": "in:image-3"}
+
+        mock_glance.list_images.reset_mock()
+        extension.get_image_metadata(
+            profile=profile,
+            session=Mock(),
+            global_request_id="req-3",
+            image_ids=["image-1", "image-2", "image-3", "deleted"],
+        )
+        mock_glance.list_images.assert_not_called()
+
 
 class TestListServersReal:
     """Real test cases for list_servers function"""
@@ -290,29 +729,34 @@ class TestListServersReal:
             "project_id": "test-project-id",
         }
 
+    @patch("skyline_apiserver.api.v1.extension.CONF")
     @patch("skyline_apiserver.api.v1.extension.nova")
     @patch("skyline_apiserver.api.v1.extension.glance")
     @patch("skyline_apiserver.api.v1.extension.cinder")
-    @patch("skyline_apiserver.api.v1.extension.keystone")
+    @patch("skyline_apiserver.api.v1.extension.PROJECTS")
     @patch("skyline_apiserver.api.v1.extension.generate_session")
     @patch("skyline_apiserver.api.v1.extension.get_system_session")
-    @patch("skyline_apiserver.api.v1.extension.OSServer")
     @patch("skyline_apiserver.api.v1.extension.Server")
+    @patch("skyline_apiserver.api.v1.extension.model_response", _model_response)
     @patch("skyline_apiserver.api.v1.extension.schemas")
     def test_list_servers_search_opts(
         self,
         mock_schemas,
         mock_server_wrapper,
-        mock_osserver_wrapper,
         mock_get_system_session,
         mock_generate_session,
-        mock_keystone,
+        mock_projects,
         mock_cinder,
         mock_glance,
         mock_nova,
+        mock_conf,
         mock_profile,
         mock_server_data,
     ):
+        mock_conf.default.fanout_concurrency = 4
+        mock_conf.default.image_cache_size = 0
+        mock_conf.default.image_cache_ttl = 0
+
         # Setup sessions
         mock_system_session = Mock()
         mock_current_session = Mock()
@@ -325,13 +769,9 @@ class TestListServersReal:
 
         # Mock wrappers
         server_wrapper_obj = Mock()
-        server_wrapper_obj.to_dict.return_value = mock_server_data
+        server_wrapper_obj.to_dicts.return_value = (mock_server_data, mock_server_data)
         mock_server_wrapper.return_value = server_wrapper_obj
 
-        osserver_wrapper_obj = Mock()
-        osserver_wrapper_obj.to_dict.return_value = mock_server_data
-        mock_osserver_wrapper.return_value = osserver_wrapper_obj
-
         # Mock schemas.ServersResponse
         response_obj = Mock()
         response_obj.servers = [mock_server_data]
@@ -382,3 +822,241 @@ class TestListServersReal:
         assert search_opts["flavor"] == "flavor-1"
         assert search_opts["uuid"] == "uuid-1"
         assert search_opts["ip"] == "10.0.0.5"
+
+    @patch("skyline_apiserver.api.v1.extension.CONF")
+    @patch("skyline_apiserver.api.v1.extension.assert_system_admin_or_reader")
+    @patch("skyline_apiserver.api.v1.extension.nova")
+    @patch("skyline_apiserver.api.v1.extension.glance")
+    @patch("skyline_apiserver.api.v1.extension.cinder")
+    @patch("skyline_apiserver.api.v1.extension.PROJECTS")
+    @patch("skyline_apiserver.api.v1.extension.generate_session")
+    @patch("skyline_apiserver.api.v1.extension.get_system_session")
+    @patch("skyline_apiserver.api.v1.extension.Server")
+    @patch("skyline_apiserver.api.v1.extension.model_response")
+    @patch("skyline_apiserver.api.v1.extension.STEP", 1)
+    def test_list_servers_enrichment_fanout(
+        self,
+        mock_model_response,
+        mock_server_wrapper,
+        mock_get_system_session,
+        mock_generate_session,
+        mock_projects,
+        mock_cinder,
+        mock_glance,
+        mock_nova,
+        mock_assert_system_admin_or_reader,
+        mock_conf,
+        mock_profile,
+    ):
+        mock_conf.default.fanout_concurrency = 2
+        mock_conf.default.image_cache_size = 100
+        mock_conf.default.image_cache_ttl = 300
+        servers = [
+            {
+                "id": "server-1",
+                "host": "compute-1",
+                "image": "image-1",
+                "volumes_attached": [],
+                "project_id": "project-1",
+            },
+            {
+                "id": "server-2",
+                "host": "compute-2",
+                "image": "",
+                "volumes_attached": [{"id": "volume-1"}],
+                "project_id": "project-2",
+            },
+            {
+                "id": "server-3",
+                "host": "compute-1",
+                "image": "image-3",
+                "volumes_attached": [],
+                "project_id": "project-1",
+            },
+        ]
+        mock_nova.list_servers.return_value = servers
+        mock_server_wrapper.side_effect = lambda server: Mock(
+            to_dicts=Mock(return_value=(dict(server), {}))
+        )
+        image = Mock(id="image-1", os_distro="cirros")
+        image.name = "cirros-image"
+        mock_glance.list_images.side_effect = lambda filters, **kwargs: (
+            [image] if filters == {"id": "in:image-1"} else []
+        )
+        volume = Mock(
+            attachments=[{"server_id": "server-2"}],
+            volume_image_metadata={
+                "image_id": "image-2",
+                "image_name": "ubuntu-image",
+                "os_distro": "ubuntu",
+            },
+        )
+        mock_cinder.list_volumes.return_value = [volume]
+        mock_projects.get_cached_names.return_value = (
+            {"project-1": "project-one"},
+            ["project-2"],
+        )
+        mock_projects.lookup.return_value = None
+
+        from skyline_apiserver.api.v1.extension import list_servers
+
+        with patch(
+            "skyline_apiserver.api.v1.extension.deps.get_original_ip",
+            return_value="198.51.100.20",
+        ):
+            list_servers(
+                request=Mock(),
+                profile=mock_profile,
+                x_openstack_request_id="req-1",
+                all_projects=True,
+                limit=None,
+                marker=None,
+                sort_dirs=None,
+                sort_keys=[],
+                project_id=None,
+                project_name=None,
+                name=None,
+                status=None,
+                host=None,
+                flavor_id=None,
+                uuid=None,
+                ip=None,
+            )
+
+        model, content = mock_model_response.call_args.args
+        assert model is schemas.ServersResponse
+        server_1, server_2, server_3 = content["servers"]
+        assert server_1["image_name"] == "cirros-image"
+        assert server_1["image_os_distro"] == "cirros"
+        assert server_1["project_name"] == "project-one"
+        assert server_1["host"] == "compute-1"
+        assert server_2["image"] == "image-2"
+        assert server_2["image_name"] == "ubuntu-image"
+        # Unknown projects fall back to their id.
+        assert server_2["project_name"] == "project-2"
+        assert server_3["image_name"] == ""
+        # Each chunk of image misses is a lookup of its own, merged into the cache.
+        assert sorted(
+            call.kwargs["filters"]["id"] for call in mock_glance.list_images.call_args_list
+        ) == ["in:image-1", "in:image-3"]
+        cache = extension.get_image_cache()
+        assert cache.get(("test-region", "image-1"))["name"] == "cirros-image"
+        assert ("test-region", "image-3") in cache
+        mock_projects.get_cached_names.assert_called_once_with(
+            "test-region",
+            {"project-1", "project-2"},
+        )
+        # Only the project missing from the directory is looked up.
+        mock_projects.lookup.assert_called_once_with(
+            "test-region",
+            "project-2",
+            global_request_id="req-1",
+        )
+        server_timing = mock_model_response.call_args.kwargs["headers"]["Server-Timing"]
+        phases = [timing.split(";")[0] for timing in server_timing.split(", ")]
+        assert sorted(phases) == ["images", "projects", "servers", "volumes"]
+
+
+class TestListServersHTTP:
+    """Test cases for list_servers through the HTTP stack"""
+
+    @patch("skyline_apiserver.api.responses.CONF")
+    @patch("skyline_apiserver.api.v1.extension.get_system_session")
+    @patch("skyline_apiserver.api.v1.extension.generate_session")
+    @patch("skyline_apiserver.api.v1.extension.nova")
+    @patch("skyline_apiserver.api.v1.extension.deps.get_original_ip")
+    @patch("skyline_apiserver.api.v1.extension.CONF")
+    def test_server_timing_header(
+        self,
+        mock_conf,
+        mock_get_original_ip,
+        mock_nova,
+        mock_generate_session,
+        mock_get_system_session,
+        mock_responses_conf,
+    ):
+        mock_conf.default.fanout_concurrency = 4
+        mock_conf.default.image_cache_size = 100
+        mock_conf.default.image_cache_ttl = 300
+        mock_responses_conf.default.validate_responses = False
+        mock_responses_conf.default.json_library = "orjson"
+        mock_get_original_ip.return_value = "198.51.100.20"
+        mock_nova.list_servers.return_value = [
+            {
+                "id": "server-1",
+                "name": "vm-1",
+                "tenant_id": "project-1",
+                "image": "",
+                "addresses": {},
+                "os-extended-volumes:volumes_attached": [],
+            },
+        ]
+        profile = Mock(region="RegionOne")
+        profile.project.id = "project-1"
+        app = FastAPI()
+        app.include_router(extension.router)
+        app.dependency_overrides[deps.get_profile_update_jwt] = lambda: profile
+
+        response = TestClient(app).get("/extension/servers")
+
+        assert response.status_code == 200
+        assert [server["id"] for server in response.json()["servers"]] == ["server-1"]
+        phases = [
+            timing.split(";")[0] for timing in response.headers["Server-Timing"].split(", ")
+        ]
+        # No image is looked up, so there is no images phase.
+        assert sorted(phases) == ["servers"]
+
+
+class TestComputeServicesReal:
+    """Real test cases for the async compute_services function"""
+
+    @patch("skyline_apiserver.api.v1.extension.assert_system_admin_or_reader")
+    @patch("skyline_apiserver.api.v1.extension.AsyncOpenStackClient")
+    @patch("skyline_apiserver.api.v1.extension.utils.get_system_session")
+    def test_compute_services_filters(
+        self,
+        mock_get_system_session,
+        mock_async_client,
+        mock_assert_system_admin_or_reader,
+    ):
+        mock_system_session = Mock()
+        mock_get_system_session.return_value = mock_system_session
+        mock_async_client.return_value.list_services = AsyncMock(
+            return_value=[
+                {
+                    "id": "5d2ab1c6-1c0e-4a0e-9d0b-6d0e6f3b0c11",
+                    "binary": "nova-compute",
+                    "host": "compute-1",
+                    "state": "up",
+                    "status": "enabled",
+                    "zone": "nova",
+                },
+            ],
+        )
+        profile = Mock(region="RegionOne")
+
+        with patch(
+            "skyline_apiserver.api.v1.extension.deps.get_original_ip",
+            return_value="198.51.100.20",
+        ):
+            result = asyncio.run(
+                compute_services(
+                    request=Mock(),
+                    profile=profile,
+                    x_openstack_request_id="req-1",
+                    binary="nova-compute",
+                    host=None,
+                )
+            )
+
+        mock_get_system_session.assert_called_once_with(original_ip="198.51.100.20")
+        mock_async_client.assert_called_once_with(
+            session=mock_system_session,
+            region="RegionOne",
+            global_request_id="req-1",
+        )
+        mock_async_client.return_value.list_services.assert_awaited_once_with(
+            binary="nova-compute",
+        )
+        assert result.services[0].host == "compute-1"
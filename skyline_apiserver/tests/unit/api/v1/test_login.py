@@ -649,6 +649,7 @@ class TestGetProjectsAndUnscopeTokenTotp:
     @patch("skyline_apiserver.api.v1.login.KeystoneClient")
     @patch("skyline_apiserver.api.v1.login.Session")
     @patch("skyline_apiserver.api.v1.login.Password")
+    @patch("skyline_apiserver.api.v1.login.utils.get_http_session")
     @patch("skyline_apiserver.api.v1.login.utils.get_endpoint")
     @patch("skyline_apiserver.api.v1.login.get_system_session")
     @patch("skyline_apiserver.api.v1.login.CONF")
@@ -657,6 +658,7 @@ class TestGetProjectsAndUnscopeTokenTotp:
         mock_conf,
         mock_get_system_session,
         mock_get_endpoint,
+        mock_get_http_session,
         mock_password,
         mock_session_cls,
         mock_keystone_client,
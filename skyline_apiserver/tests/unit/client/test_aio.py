@@ -0,0 +1,81 @@
+# Copyright 2021 99cloud
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import asyncio
+from unittest.mock import MagicMock, patch
+
+import httpx
+import pytest
+from fastapi.exceptions import HTTPException
+
+from skyline_apiserver.client import aio
+
+
+def _session(original_ip="198.51.100.20"):
+    session = MagicMock(original_ip=original_ip)
+    session.auth._needs_reauthenticate.return_value = False
+    session.get_auth_headers.return_value = {"X-Auth-Token": "token"}
+    return session
+
+
+def _run(handler, coro_func):
+    async def run():
+        client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        with patch.object(aio, "ASYNC_HTTP_CLIENT", client):
+            try:
+                return await coro_func()
+            finally:
+                await client.aclose()
+
+    return asyncio.run(run())
+
+
+@patch("skyline_apiserver.client.aio.utils.get_endpoint")
+class TestAsyncOpenStackClient:
+    def test_list_services(self, mock_get_endpoint):
+        mock_get_endpoint.return_value = "http://nova/v2.1"
+        requests = []
+
+        def handler(request):
+            requests.append(request)
+            return httpx.Response(200, json={"services": [{"id": "1"}, {"id": "2"}]})
+
+        client = aio.AsyncOpenStackClient(_session(), "RegionOne", global_request_id="req-1")
+        services = _run(
+            handler,
+            lambda: client.list_services(binary="nova-compute", host=None),
+        )
+
+        assert [service["id"] for service in services] == ["1", "2"]
+        (request,) = requests
+        assert request.url.path == "/v2.1/os-services"
+        assert dict(request.url.params) == {"binary": "nova-compute"}
+        assert request.headers["X-Auth-Token"] == "token"
+        assert request.headers["X-OpenStack-Request-ID"] == "req-1"
+        assert request.headers["X-OpenStack-Nova-API-Version"] == "2.79"
+        assert request.headers["OpenStack-API-Version"] == "compute 2.79"
+        assert request.headers["Forwarded"] == "for=198.51.100.20;by=skyline-apiserver"
+
+    @pytest.mark.parametrize("status_code,expected", [(401, 401), (404, 500), (503, 500)])
+    def test_errors_are_mapped(self, mock_get_endpoint, status_code, expected):
+        mock_get_endpoint.return_value = "http://nova/v2.1"
+
+        def handler(request):
+            assert request.url.path == "/v2.1/os-services"
+            return httpx.Response(status_code, text="error")
+
+        client = aio.AsyncOpenStackClient(_session(), "RegionOne")
+        with pytest.raises(HTTPException) as exc_info:
+            _run(handler, lambda: client.list_services())
+        assert exc_info.value.status_code == expected
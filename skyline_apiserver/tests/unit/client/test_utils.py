@@ -10,13 +10,42 @@
 # License for the specific language governing permissions and limitations
 # under the License.
 
+from datetime import datetime, timedelta, timezone
 from types import SimpleNamespace
 from unittest.mock import MagicMock, call, patch
 
+import pytest
+import requests
+from keystoneauth1.session import TCPKeepAliveAdapter
+
 from skyline_apiserver.client import utils
+from skyline_apiserver.client.openstack import nova
+from skyline_apiserver.utils.cache import TTLCache
+
+
+def _profile(expires_in=3600):
+    expires_at = datetime.now(timezone.utc) + timedelta(seconds=expires_in)
+    return SimpleNamespace(
+        region="RegionOne",
+        keystone_token="token",
+        keystone_token_exp=expires_at.isoformat(),
+        project=SimpleNamespace(id="project-id"),
+    )
 
 
 class TestGenerateSessionOriginalIP:
+    @pytest.fixture(autouse=True)
+    def session_pool(self):
+        pool = TTLCache(maxsize=16, ttl=300)
+        with patch.object(utils, "USER_SESSIONS", pool):
+            yield pool
+
+    @pytest.fixture(autouse=True)
+    def http_session(self):
+        http_session = MagicMock()
+        with patch.object(utils, "HTTP_SESSION", http_session):
+            yield http_session
+
     @patch("skyline_apiserver.client.utils.CONF")
     @patch("skyline_apiserver.client.utils.Session")
     @patch("skyline_apiserver.client.utils.Token")
@@ -29,12 +58,9 @@ class TestGenerateSessionOriginalIP:
         mock_token,
         mock_session_cls,
         mock_conf,
+        http_session,
     ):
-        profile = SimpleNamespace(
-            region="RegionOne",
-            keystone_token="token",
-            project=SimpleNamespace(id="project-id"),
-        )
+        profile = _profile()
         system_session = MagicMock()
         user_session = MagicMock()
         auth = MagicMock()
@@ -61,12 +87,68 @@ class TestGenerateSessionOriginalIP:
         )
         mock_session_cls.assert_called_once_with(
             auth=auth,
+            session=http_session,
             original_ip="198.51.100.20",
             verify="/ca.pem",
             timeout=30,
         )
         auth.get_auth_ref.assert_called_once_with(user_session)
 
+    @patch("skyline_apiserver.client.utils.CONF")
+    @patch("skyline_apiserver.client.utils.Session")
+    @patch("skyline_apiserver.client.utils.Token")
+    @patch("skyline_apiserver.client.utils.get_endpoint")
+    @patch("skyline_apiserver.client.utils.get_system_session")
+    def test_pooled_session_is_reused_without_authenticating(
+        self,
+        mock_get_system_session,
+        mock_get_endpoint,
+        mock_token,
+        mock_session_cls,
+        mock_conf,
+        session_pool,
+    ):
+        profile = _profile()
+        user_session = MagicMock()
+        wrapper = MagicMock()
+        mock_session_cls.side_effect = [user_session, wrapper]
+        mock_conf.default.cafile = ""
+
+        utils.generate_session(profile, original_ip="198.51.100.20")
+        result = utils.generate_session(profile, original_ip="203.0.113.30")
+
+        assert result is wrapper
+        mock_token.assert_called_once()
+        user_session.auth.get_auth_ref.assert_called_once_with(user_session)
+        mock_session_cls.assert_called_with(
+            auth=user_session.auth,
+            session=user_session.session,
+            original_ip="203.0.113.30",
+            verify="",
+            timeout=30,
+        )
+
+        utils.evict_session(profile)
+        assert len(session_pool) == 0
+
+    @patch("skyline_apiserver.client.utils.CONF")
+    @patch("skyline_apiserver.client.utils.Session")
+    @patch("skyline_apiserver.client.utils.Token")
+    @patch("skyline_apiserver.client.utils.get_endpoint")
+    @patch("skyline_apiserver.client.utils.get_system_session")
+    def test_expired_keystone_token_is_not_pooled(
+        self,
+        mock_get_system_session,
+        mock_get_endpoint,
+        mock_token,
+        mock_session_cls,
+        mock_conf,
+        session_pool,
+    ):
+        utils.generate_session(_profile(expires_in=-10))
+
+        assert len(session_pool) == 0
+
 
 class TestSystemSessionOriginalIP:
     @patch("skyline_apiserver.client.utils.CONF")
@@ -125,3 +207,192 @@ class TestSystemSessionOriginalIP:
                 timeout=30,
             ),
         ]
+
+
+class TestHTTPSession:
+    @pytest.fixture(autouse=True)
+    def http_session(self):
+        with patch.object(utils, "HTTP_SESSION", None):
+            yield
+
+    @patch("skyline_apiserver.client.utils.CONF")
+    def test_shared_pool_settings(self, mock_conf):
+        mock_conf.openstack.http_keepalive = True
+        mock_conf.openstack.http_pool_connections = 4
+        mock_conf.openstack.http_pool_maxsize = 8
+        mock_conf.openstack.http_connect_retries = 2
+
+        http_session = utils.get_http_session()
+        adapter = http_session.get_adapter("https://nova.example/v2.1")
+
+        assert utils.get_http_session() is http_session
+        assert http_session.get_adapter("http://nova.example") is adapter
+        assert isinstance(adapter, TCPKeepAliveAdapter)
+        assert adapter._pool_maxsize == 8
+        assert adapter.max_retries.connect == 2
+        assert adapter.max_retries.read == 0
+
+    @patch("skyline_apiserver.client.utils.CONF")
+    def test_http_pool_stats(self, mock_conf):
+        mock_conf.openstack.http_keepalive = False
+        mock_conf.openstack.http_pool_connections = 4
+        mock_conf.openstack.http_pool_maxsize = 8
+        mock_conf.openstack.http_connect_retries = 0
+
+        assert utils.http_pool_stats() == {}
+        adapter = utils.get_http_session().get_adapter("https://nova.example")
+        adapter.poolmanager.connection_from_url("https://nova.example:8774")
+
+        assert utils.http_pool_stats() == {
+            "https://nova.example:8774": {
+                "connections": 0,
+                "requests": 0,
+                "idle": 0,
+                "maxsize": 8,
+            },
+        }
+
+
+@patch("skyline_apiserver.client.utils.CONF")
+@patch("skyline_apiserver.client.utils.get_access")
+class TestGetEndpoint:
+    @pytest.fixture(autouse=True)
+    def endpoint_indexes(self):
+        indexes = TTLCache(maxsize=16, ttl=300)
+        with patch.object(utils, "ENDPOINT_INDEXES", indexes):
+            yield indexes
+
+    def _access(self, token):
+        access = MagicMock(auth_token=token)
+        access.service_catalog.get_urls.side_effect = lambda region_name, service_type, **kw: (
+            (f"https://{service_type}.{region_name}.{token}",) if service_type != "none" else ()
+        )
+        return access
+
+    def test_endpoint_is_resolved_once_per_token(self, mock_get_access, mock_conf):
+        mock_conf.openstack.interface_type = "public"
+        access = self._access("token-1")
+        mock_get_access.return_value = access
+        session = object()
+
+        first = utils.get_endpoint("RegionOne", "compute", session)
+        second = utils.get_endpoint("RegionOne", "compute", session)
+        other = utils.get_endpoint("RegionTwo", "compute", session)
+
+        assert first == second == "https://compute.RegionOne.token-1"
+        assert other == "https://compute.RegionTwo.token-1"
+        assert access.service_catalog.get_urls.call_count == 2
+
+    def test_reissued_token_rebuilds_the_index(self, mock_get_access, mock_conf):
+        mock_conf.openstack.interface_type = "public"
+        mock_get_access.side_effect = [self._access("token-1"), self._access("token-2")]
+
+        first = utils.get_endpoint("RegionOne", "compute", object())
+        second = utils.get_endpoint("RegionOne", "compute", object())
+
+        assert first == "https://compute.RegionOne.token-1"
+        assert second == "https://compute.RegionOne.token-2"
+
+    def test_missing_endpoint_raises(self, mock_get_access, mock_conf):
+        mock_conf.openstack.interface_type = "public"
+        mock_get_access.return_value = self._access("token-1")
+
+        with pytest.raises(ValueError):
+            utils.get_endpoint("RegionOne", "none", object())
+
+
+@patch("skyline_apiserver.client.utils.get_endpoint")
+@patch("skyline_apiserver.client.utils.NovaClient")
+class TestClientCache:
+    @pytest.fixture(autouse=True)
+    def clients(self):
+        clients = TTLCache(maxsize=16, ttl=300)
+        with patch.object(utils, "CLIENTS", clients):
+            yield clients
+
+    @staticmethod
+    def _session(auth, original_ip):
+        return SimpleNamespace(
+            auth=auth,
+            session=None,
+            original_ip=original_ip,
+            verify=True,
+            timeout=None,
+        )
+
+    def test_client_is_reused_across_requests(self, mock_nova_client, mock_get_endpoint):
+        auth = object()
+        first = self._session(auth, "198.51.100.20")
+        second = self._session(auth, "203.0.113.30")
+
+        client = utils.nova_client(first, "RegionOne")
+
+        assert utils.nova_client(second, "RegionOne") is client
+        # Building a client does not set the values of the calls of the caller.
+        assert utils.CLIENT_REQUEST.get() == (None, None)
+        mock_nova_client.assert_called_once()
+        session = mock_nova_client.call_args.kwargs["session"]
+        assert isinstance(session, utils.ClientSession)
+        assert session.auth is auth
+        assert "global_request_id" not in mock_nova_client.call_args.kwargs
+
+    @pytest.mark.parametrize(
+        "same_auth,region,version",
+        [
+            (False, "RegionOne", "2.79"),
+            (True, "RegionTwo", "2.79"),
+            (True, "RegionOne", "2.1"),
+        ],
+    )
+    def test_client_is_not_shared(
+        self,
+        mock_nova_client,
+        mock_get_endpoint,
+        same_auth,
+        region,
+        version,
+    ):
+        auth = object()
+        first = self._session(auth, "198.51.100.20")
+        second = self._session(auth if same_auth else object(), "198.51.100.20")
+
+        utils.nova_client(first, "RegionOne", version="2.79")
+        utils.nova_client(second, region, version=version)
+
+        assert mock_nova_client.call_count == 2
+
+
+class TestClientSession:
+    def test_request_values_are_sent_per_call(self):
+        http_session = MagicMock()
+        response = requests.Response()
+        response.status_code = 200
+        http_session.request.return_value = response
+        session = utils.ClientSession(session=http_session)
+
+        with utils.client_request("198.51.100.20", "req-1"):
+            session.get("http://nova/servers", authenticated=False)
+        headers = http_session.request.call_args.kwargs["headers"]
+        assert headers["Forwarded"].startswith("for=198.51.100.20;")
+        assert headers["X-Openstack-Request-Id"] == "req-1"
+
+        session.get("http://nova/servers", authenticated=False)
+        headers = http_session.request.call_args.kwargs["headers"]
+        assert "Forwarded" not in headers
+        assert "X-Openstack-Request-Id" not in headers
+
+    @patch("skyline_apiserver.client.utils.nova_client")
+    def test_request_values_are_reset_after_the_call(self, mock_nova_client):
+        sent = []
+        mock_nova_client.return_value.servers.list.side_effect = lambda **kwargs: sent.append(
+            utils.CLIENT_REQUEST.get()
+        )
+
+        nova.list_servers(
+            profile=_profile(),
+            session=SimpleNamespace(original_ip="198.51.100.20"),
+            global_request_id="req-1",
+        )
+
+        assert sent == [("198.51.100.20", "req-1")]
+        assert utils.CLIENT_REQUEST.get() == (None, None)
@@ -0,0 +1,150 @@
+# Copyright 2021 99cloud
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from types import SimpleNamespace
+from unittest.mock import Mock, call, patch
+
+import pytest
+from keystoneauth1.exceptions.http import NotFound
+
+from skyline_apiserver.core.projects import ProjectDirectory
+from skyline_apiserver.utils import fanout
+
+
+@pytest.fixture(autouse=True)
+def fanout_executor():
+    fanout.FANOUT_EXECUTOR = ThreadPoolExecutor(max_workers=4)
+    yield
+    fanout.shutdown_fanout_executor()
+
+
+def _project(project_id, name):
+    return SimpleNamespace(id=project_id, name=name)
+
+
+@patch("skyline_apiserver.core.projects.CONF")
+@patch("skyline_apiserver.core.projects.utils")
+class TestProjectDirectory:
+    def setup_method(self):
+        self.client = Mock()
+        self.projects = {"p1": "demo", "p2": "admin", "p3": "demo"}
+        self.client.projects.list.return_value = [
+            _project(project_id, name) for project_id, name in self.projects.items()
+        ]
+
+        def get(project_id):
+            if project_id not in self.projects:
+                raise NotFound()
+            return _project(project_id, self.projects[project_id])
+
+        self.client.projects.get.side_effect = get
+
+    @staticmethod
+    def _set_conf(mock_conf, interval=300):
+        mock_conf.default.project_directory_refresh_interval = interval
+        mock_conf.default.fanout_concurrency = 4
+
+    def test_misses_are_fetched_by_id(self, mock_utils, mock_conf):
+        self._set_conf(mock_conf)
+        mock_utils.keystone_client.return_value = self.client
+        directory = ProjectDirectory()
+
+        assert directory.get_names("RegionOne", ["p1", "p2", "gone"], "req-1") == {
+            "p1": "demo",
+            "p2": "admin",
+        }
+        self.client.projects.list.assert_not_called()
+        assert sorted(c.args[0] for c in self.client.projects.get.call_args_list) == [
+            "gone",
+            "p1",
+            "p2",
+        ]
+        mock_utils.client_request.assert_called_with(None, "req-1")
+
+        # Known projects, and projects not found, are not fetched again.
+        self.client.projects.get.reset_mock()
+        assert directory.get_names("RegionOne", ["p1", "gone"]) == {"p1": "demo"}
+        self.client.projects.get.assert_not_called()
+
+    def test_failed_lookups_are_not_remembered(self, mock_utils, mock_conf):
+        self._set_conf(mock_conf)
+        mock_utils.keystone_client.return_value = self.client
+        self.client.projects.get.side_effect = Exception("Keystone is unavailable")
+        directory = ProjectDirectory()
+
+        assert directory.get_names("RegionOne", ["p1"]) == {}
+        assert directory.get_cached_names("RegionOne", ["p1"]) == ({}, ["p1"])
+
+    def test_names_are_listed_by_name(self, mock_utils, mock_conf):
+        self._set_conf(mock_conf)
+        mock_utils.keystone_client.return_value = self.client
+        directory = ProjectDirectory()
+        directory.get_names("RegionOne", ["p1"])
+        self.client.projects.list.side_effect = lambda name: [
+            _project(project_id, project_name)
+            for project_id, project_name in self.projects.items()
+            if project_name == name
+        ]
+
+        # A project fetched by id does not make its name known.
+        assert directory.find_ids("RegionOne", "demo") == ["p1", "p3"]
+        assert directory.find_ids("RegionOne", "unknown") == []
+        assert directory.find_ids("RegionOne", "unknown") == []
+        assert directory.get_names("RegionOne", ["p3"]) == {"p3": "demo"}
+        assert self.client.projects.list.call_args_list == [
+            call(name="demo"),
+            call(name="unknown"),
+        ]
+
+    def test_refresh_loads_known_regions(self, mock_utils, mock_conf):
+        self._set_conf(mock_conf)
+        failing = Mock()
+        failing.projects.list.side_effect = Exception("Keystone is unavailable")
+        failing.projects.get.side_effect = NotFound()
+        mock_utils.keystone_client.side_effect = lambda region, **kwargs: (
+            self.client if region == "RegionTwo" else failing
+        )
+        directory = ProjectDirectory()
+        directory.get_names("RegionOne", ["p1"])
+        directory.get_names("RegionTwo", ["gone"])
+        self.projects = {"p1": "renamed", "p4": "new"}
+        self.client.projects.list.return_value = [
+            _project(project_id, name) for project_id, name in self.projects.items()
+        ]
+
+        # A failing region does not stop the load of the others.
+        asyncio.run(directory.refresh())
+        self.client.projects.get.reset_mock()
+
+        assert directory.get_names("RegionTwo", ["p1", "p4", "gone"]) == {
+            "p1": "renamed",
+            "p4": "new",
+        }
+        assert directory.find_ids("RegionTwo", "new") == ["p4"]
+        # Deleted projects stay deleted across loads.
+        self.client.projects.get.assert_not_called()
+        self.client.projects.list.assert_called_once_with()
+
+    def test_disabled_refresh_looks_up_every_time(self, mock_utils, mock_conf):
+        self._set_conf(mock_conf, interval=0)
+        mock_utils.keystone_client.return_value = self.client
+        directory = ProjectDirectory()
+
+        directory.get_names("RegionOne", ["p1"])
+        directory.get_names("RegionOne", ["p1"])
+
+        assert self.client.projects.get.call_count == 2
+        self.client.projects.list.assert_not_called()
@@ -0,0 +1,113 @@
+# Copyright 2021 99cloud
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import asyncio
+import time
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, patch
+
+from skyline_apiserver.core.revocation import CLOCK_SKEW, RevokedTokenIndex
+
+
+def _row(uuid, expire):
+    return SimpleNamespace(uuid=uuid, expire=expire)
+
+
+@patch("skyline_apiserver.core.revocation.CONF")
+@patch("skyline_apiserver.core.revocation.db_api", new_callable=AsyncMock)
+class TestRevokedTokenIndex:
+    def setup_method(self):
+        self.now = int(time.time())
+
+    def test_falls_back_to_database_before_first_reload(self, mock_db_api, mock_conf):
+        mock_conf.default.revoked_token_refresh_interval = 5
+        mock_db_api.check_token.return_value = False
+        index = RevokedTokenIndex()
+
+        assert asyncio.run(index.is_revoked("token")) is False
+        mock_db_api.check_token.assert_called_once_with("token")
+
+    def test_miss_skips_database(self, mock_db_api, mock_conf):
+        mock_conf.default.revoked_token_refresh_interval = 5
+        mock_db_api.list_revoked_tokens.return_value = [_row("revoked", self.now + 60)]
+        mock_db_api.check_token.return_value = True
+        index = RevokedTokenIndex()
+        asyncio.run(index.reload())
+
+        assert asyncio.run(index.is_revoked("valid")) is False
+        mock_db_api.check_token.assert_not_called()
+        assert asyncio.run(index.is_revoked("revoked")) is True
+        mock_db_api.check_token.assert_called_once_with("revoked")
+
+    def test_reload_lists_unexpired_tokens_and_drops_expired(self, mock_db_api, mock_conf):
+        mock_conf.default.revoked_token_refresh_interval = 5
+        mock_db_api.list_revoked_tokens.return_value = [
+            _row("expired", self.now - 10),
+            _row("revoked", self.now + 60),
+        ]
+        index = RevokedTokenIndex()
+        asyncio.run(index.reload())
+        mock_db_api.list_revoked_tokens.return_value = [_row("new", self.now + 60)]
+        asyncio.run(index.reload())
+
+        first, second = mock_db_api.list_revoked_tokens.call_args_list
+        assert first.kwargs["since"] >= self.now
+        assert second.kwargs["since"] >= first.kwargs["since"]
+        assert len(index) == 2
+
+    def test_local_revocation_is_visible_immediately(self, mock_db_api, mock_conf):
+        mock_conf.default.revoked_token_refresh_interval = 5
+        mock_db_api.list_revoked_tokens.return_value = []
+        mock_db_api.check_token.return_value = True
+        index = RevokedTokenIndex()
+        asyncio.run(index.reload())
+        index.add("token", self.now + 60)
+
+        assert asyncio.run(index.is_revoked("token")) is True
+
+    def test_disabled_index_always_uses_database(self, mock_db_api, mock_conf):
+        mock_conf.default.revoked_token_refresh_interval = 0
+        mock_db_api.list_revoked_tokens.return_value = []
+        mock_db_api.check_token.return_value = False
+        index = RevokedTokenIndex()
+        asyncio.run(index.refresh())
+
+        asyncio.run(index.is_revoked("token"))
+        mock_db_api.check_token.assert_called_once_with("token")
+
+    def test_refresh_lists_only_new_tokens(self, mock_db_api, mock_conf):
+        mock_conf.default.revoked_token_refresh_interval = 5
+        mock_conf.default.revoked_token_purge_interval = 600
+        mock_db_api.list_revoked_tokens.return_value = [_row("old", self.now + 60)]
+        mock_db_api.list_new_revoked_tokens.return_value = [_row("new", self.now + 60)]
+        index = RevokedTokenIndex()
+        asyncio.run(index.refresh())
+        asyncio.run(index.refresh())
+
+        mock_db_api.list_revoked_tokens.assert_called_once()
+        watermark = mock_db_api.list_new_revoked_tokens.call_args.kwargs["revoked_since"]
+        assert self.now - CLOCK_SKEW <= watermark < self.now
+        assert len(index) == 2
+
+    def test_refresh_reloads_on_purge_cadence(self, mock_db_api, mock_conf):
+        mock_conf.default.revoked_token_refresh_interval = 5
+        mock_conf.default.revoked_token_purge_interval = 600
+        mock_db_api.list_revoked_tokens.return_value = []
+        index = RevokedTokenIndex()
+        asyncio.run(index.refresh())
+        with patch("skyline_apiserver.core.revocation.time.time", return_value=self.now + 601):
+            asyncio.run(index.refresh())
+
+        assert mock_db_api.list_revoked_tokens.call_count == 2
+        mock_db_api.list_new_revoked_tokens.assert_not_called()
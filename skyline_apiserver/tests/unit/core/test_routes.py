@@ -0,0 +1,52 @@
+# Copyright 2021 99cloud
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import pytest
+
+from skyline_apiserver.core.routes import AUTHENTICATED, UNMATCHED, RouteTable
+from skyline_apiserver.types import constants
+
+
+class TestRouteTable:
+    @pytest.mark.parametrize(
+        "url_path,prefix",
+        [
+            (f"{constants.API_PREFIX}/login", f"{constants.API_PREFIX}/login"),
+            (f"{constants.API_PREFIX}/config", f"{constants.API_PREFIX}/config"),
+            ("/static/js/app.js", "/static"),
+            ("/docs", "/docs"),
+            (f"{constants.API_PREFIX}/extension/servers", None),
+            (f"{constants.API_PREFIX}/profile", None),
+            ("/", None),
+        ],
+    )
+    def test_match_public(self, url_path, prefix) -> None:
+        assert RouteTable().match_public(url_path) == prefix
+
+    def test_extra_prefixes_and_counters(self) -> None:
+        routes = RouteTable()
+        routes.load(routes.prefixes + ("/healthz", "/static/private"))
+
+        routes.match_public("/healthz")
+        routes.match_public("/static/private/x")
+        routes.match_public(f"{constants.API_PREFIX}/profile")
+        routes.match_public(f"{constants.API_PREFIX}/profile")
+        routes.match_public("/other")
+
+        assert routes.stats() == {
+            "/healthz": 1,
+            "/static/private": 1,
+            AUTHENTICATED: 2,
+            UNMATCHED: 1,
+        }
@@ -0,0 +1,199 @@
+# Copyright 2021 99cloud
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import asyncio
+import time
+from datetime import datetime, timedelta, timezone
+from unittest.mock import patch
+
+import pytest
+from jose import JWTError, jwt
+
+from skyline_apiserver import schemas
+from skyline_apiserver.core import security
+from skyline_apiserver.utils.cache import TTLCache
+from skyline_apiserver.utils.executor import BlockingExecutor
+
+
+def _payload(uuid="uuid-1", keystone_token="keystone-token", exp=None):
+    return schemas.Payload(
+        keystone_token=keystone_token,
+        region="RegionOne",
+        exp=exp or int(time.time()) + 3600,
+        uuid=uuid,
+    )
+
+
+def _profile(token, keystone_token_exp):
+    return schemas.Profile(
+        keystone_token=token.keystone_token,
+        region=token.region,
+        exp=token.exp,
+        uuid=token.uuid,
+        project={"id": "p", "name": "p", "domain": {"id": "d", "name": "d"}},
+        user={"id": "u", "name": "u", "domain": {"id": "d", "name": "d"}},
+        roles=[{"id": "r", "name": "member"}],
+        keystone_token_exp=keystone_token_exp.isoformat(),
+        version="0.0.0",
+    )
+
+
+def _expires_in(seconds):
+    return datetime.now(timezone.utc) + timedelta(seconds=seconds)
+
+
+class TestProfileCache:
+    @pytest.fixture(autouse=True)
+    def profile_cache(self):
+        cache = TTLCache(maxsize=16, ttl=300)
+        with patch.object(security, "PROFILE_CACHE", cache):
+            yield cache
+
+    @patch("skyline_apiserver.core.security.generate_profile")
+    def test_repeated_token_skips_keystone(self, mock_generate_profile, profile_cache):
+        token = _payload()
+        mock_generate_profile.return_value = _profile(token, _expires_in(3600))
+
+        first = security.generate_profile_by_token(token)
+        renewed = token.model_copy(update={"exp": token.exp + 60})
+        second = security.generate_profile_by_token(renewed)
+
+        mock_generate_profile.assert_called_once()
+        assert first.user.id == second.user.id
+        assert second.exp == renewed.exp
+        assert profile_cache.stats()["hits"] == 1
+
+    @patch("skyline_apiserver.core.security.generate_profile")
+    def test_different_keystone_token_is_not_shared(self, mock_generate_profile):
+        token = _payload()
+        other = _payload(keystone_token="other-keystone-token")
+        mock_generate_profile.side_effect = [
+            _profile(token, _expires_in(3600)),
+            _profile(other, _expires_in(3600)),
+        ]
+
+        security.generate_profile_by_token(token)
+        security.generate_profile_by_token(other)
+
+        assert mock_generate_profile.call_count == 2
+
+    @patch("skyline_apiserver.core.security.generate_profile")
+    def test_expired_keystone_token_is_not_cached(self, mock_generate_profile, profile_cache):
+        token = _payload()
+        mock_generate_profile.return_value = _profile(token, _expires_in(-10))
+
+        security.generate_profile_by_token(token)
+
+        assert len(profile_cache) == 0
+
+    @patch("skyline_apiserver.core.security.generate_profile")
+    def test_evict_profile(self, mock_generate_profile, profile_cache):
+        token = _payload()
+        mock_generate_profile.return_value = _profile(token, _expires_in(3600))
+
+        security.generate_profile_by_token(token)
+        security.evict_profile(token)
+
+        assert len(profile_cache) == 0
+
+    @patch("skyline_apiserver.core.security.generate_profile")
+    def test_async_profile_uses_identity_executor(self, mock_generate_profile):
+        token = _payload()
+        mock_generate_profile.return_value = _profile(token, _expires_in(3600))
+        executor = BlockingExecutor("identity-test", max_workers=1)
+
+        async def run():
+            await security.async_generate_profile_by_token(token)
+            return await security.async_generate_profile_by_token(token)
+
+        with patch.object(security, "IDENTITY_EXECUTOR", executor):
+            profile = asyncio.run(run())
+        executor.shutdown()
+
+        assert profile.user.id == "u"
+        assert mock_generate_profile.call_count == 1
+        assert executor.stats()["completed"] == 1
+
+
+@patch("skyline_apiserver.core.security.CONF")
+class TestTokenCache:
+    @pytest.fixture(autouse=True)
+    def token_cache(self):
+        cache = TTLCache(maxsize=16, ttl=3600)
+        with patch.object(security, "TOKEN_CACHE", cache):
+            yield cache
+
+    def _encode(self, exp):
+        payload = _payload(exp=exp).toDict()
+        return jwt.encode(payload, "secret", algorithm="HS256")
+
+    def test_repeated_cookie_skips_decode(self, mock_conf, token_cache):
+        mock_conf.default.secret_key = "secret"
+        cookie = self._encode(int(time.time()) + 60)
+
+        with patch.object(security.jwt, "decode", wraps=jwt.decode) as mock_decode:
+            first = security.parse_access_token(cookie)
+            second = security.parse_access_token(cookie)
+
+        mock_decode.assert_called_once()
+        assert first is second
+        assert first.uuid == "uuid-1"
+
+    def test_entry_expires_with_the_token(self, mock_conf, token_cache):
+        mock_conf.default.secret_key = "secret"
+        exp = int(time.time()) + 60
+        cookie = self._encode(exp)
+        security.parse_access_token(cookie)
+
+        with patch.object(token_cache, "timer", return_value=exp + 1):
+            assert token_cache.get(cookie) is None
+
+    def test_invalid_signature_is_not_cached(self, mock_conf, token_cache):
+        mock_conf.default.secret_key = "other-secret"
+        cookie = self._encode(int(time.time()) + 60)
+
+        with pytest.raises(JWTError):
+            security.parse_access_token(cookie)
+        assert len(token_cache) == 0
+
+
+@patch("skyline_apiserver.core.security.CONF")
+class TestTokenRenewals:
+    def test_concurrent_renewals_share_one_token(self, mock_conf):
+        mock_conf.default.access_token_renew = 1800
+        mock_conf.default.access_token_expire = 3600
+        renewals = security.TokenRenewals(maxsize=16)
+        token = _payload(exp=int(time.time()) + 60)
+
+        with patch.object(schemas.Profile, "toJWTPayload", return_value="renewed") as mock_sign:
+            first = renewals.renew(_profile(token, _expires_in(3600)))
+            second = renewals.renew(_profile(token, _expires_in(3600)))
+
+        mock_sign.assert_called_once()
+        assert first == second
+        assert first[1] >= token.exp
+        assert renewals.stats() == {"renewed": 1, "avoided": 1, "size": 1}
+
+    def test_renewed_token_is_renewed_again(self, mock_conf):
+        mock_conf.default.access_token_renew = 1800
+        mock_conf.default.access_token_expire = 3600
+        renewals = security.TokenRenewals(maxsize=16)
+        token = _payload(exp=int(time.time()) + 60)
+        later = token.model_copy(update={"exp": token.exp + 30})
+
+        with patch.object(schemas.Profile, "toJWTPayload", return_value="renewed"):
+            renewals.renew(_profile(token, _expires_in(3600)))
+            renewals.renew(_profile(later, _expires_in(3600)))
+
+        assert renewals.stats()["renewed"] == 2
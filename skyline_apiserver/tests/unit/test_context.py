@@ -0,0 +1,63 @@
+# Copyright 2021 99cloud
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import time
+
+from skyline_apiserver import schemas
+from skyline_apiserver.context import LazyRequestContext, RequestContext
+
+
+def _profile(role="member"):
+    return schemas.Profile(
+        keystone_token="keystone-token",
+        region="RegionOne",
+        exp=int(time.time()) + 3600,
+        uuid="uuid-1",
+        project={"id": "p", "name": "project", "domain": {"id": "pd", "name": "pd"}},
+        user={"id": "u", "name": "user", "domain": {"id": "ud", "name": "ud"}},
+        roles=[{"id": "r", "name": role}],
+        keystone_token_exp="2099-01-01T00:00:00.000000Z",
+        version="0.0.0",
+    )
+
+
+class TestLazyRequestContext:
+    def test_identity_fields_do_not_build_context(self) -> None:
+        context = LazyRequestContext(_profile())
+
+        assert context.user_id == "u"
+        assert context.project_id == "p"
+        assert context.project_name == "project"
+        assert context.user_domain_id == "ud"
+        assert context.project_domain_id == "pd"
+        assert context.roles == ["member"]
+        assert context.auth_token == "keystone-token"
+        assert context.materialized is False
+
+    def test_other_attributes_build_context_once(self) -> None:
+        context = LazyRequestContext(_profile(role="admin"))
+
+        assert context.is_admin is True
+        real = context.materialize()
+        assert isinstance(real, RequestContext)
+        assert context.materialize() is real
+        assert context.to_dict()["project_name"] == "project"
+
+    def test_set_attribute_is_delegated(self) -> None:
+        context = LazyRequestContext(_profile())
+        context.project_id = "other"
+
+        assert context.materialized is True
+        assert context.project_id == "other"
+        assert context.materialize().project_id == "other"
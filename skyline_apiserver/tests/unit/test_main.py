@@ -0,0 +1,67 @@
+# Copyright 2021 99cloud
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import asyncio
+from unittest.mock import MagicMock, patch
+
+from skyline_apiserver import main
+
+
+@patch("skyline_apiserver.main.db_pool_stats", return_value={"in_use": 1})
+@patch("skyline_apiserver.main.http_pool_stats", return_value={"keystone:5000": {"idle": 2}})
+@patch("skyline_apiserver.main.get_identity_executor")
+@patch("skyline_apiserver.main.get_token_renewals")
+@patch("skyline_apiserver.main.PUBLIC_ROUTES")
+class TestRuntimeStats:
+    def test_stats_of_every_pool_and_counter(
+        self,
+        mock_routes,
+        mock_get_token_renewals,
+        mock_get_identity_executor,
+        mock_http_pool_stats,
+        mock_db_pool_stats,
+    ):
+        mock_routes.stats.return_value = {"public": 3}
+        mock_get_token_renewals.return_value.stats.return_value = {"renewed": 1}
+        mock_get_identity_executor.return_value.stats.return_value = {"completed": 4}
+
+        assert main.runtime_stats() == {
+            "routes": {"public": 3},
+            "token_renewals": {"renewed": 1},
+            "identity_executor": {"completed": 4},
+            "openstack_http_pools": {"keystone:5000": {"idle": 2}},
+            "database_pool": {"in_use": 1},
+        }
+
+    def test_stats_are_logged_periodically(
+        self,
+        mock_routes,
+        mock_get_token_renewals,
+        mock_get_identity_executor,
+        mock_http_pool_stats,
+        mock_db_pool_stats,
+    ):
+        mock_routes.stats.return_value = {"public": 3}
+
+        async def run():
+            periodic_tasks = main.PeriodicTasks()
+            periodic_tasks.start("log_runtime_stats", 0.01, main.log_runtime_stats)
+            await asyncio.sleep(0.05)
+            await periodic_tasks.stop()
+
+        with patch.object(main, "LOG", MagicMock()) as mock_log:
+            asyncio.run(run())
+
+        assert mock_log.info.call_count >= 2
+        assert "'routes': {'public': 3}" in mock_log.info.call_args.args[0]
@@ -0,0 +1,76 @@
+# Copyright 2021 99cloud
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from skyline_apiserver.utils.cache import TTLCache
+
+
+class FakeTimer:
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class TestTTLCache:
+    def test_hit_and_miss_counters(self) -> None:
+        cache = TTLCache(maxsize=2, ttl=10)
+        cache.set("a", 1)
+
+        assert cache.get("a") == 1
+        assert cache.get("b") is None
+        assert cache.stats()["hits"] == 1
+        assert cache.stats()["misses"] == 1
+
+    def test_entries_expire_after_ttl(self) -> None:
+        timer = FakeTimer()
+        cache = TTLCache(maxsize=2, ttl=10, timer=timer)
+        cache.set("a", 1)
+
+        timer.now += 9
+        assert cache.get("a") == 1
+        timer.now += 2
+        assert cache.get("a") is None
+        assert len(cache) == 0
+
+    def test_entry_ttl_is_capped_by_default_ttl(self) -> None:
+        timer = FakeTimer()
+        cache = TTLCache(maxsize=2, ttl=10, timer=timer)
+        cache.set("short", 1, ttl=5)
+        cache.set("long", 2, ttl=60)
+        cache.set("expired", 3, ttl=-1)
+
+        timer.now += 6
+        assert cache.get("short") is None
+        assert cache.get("long") == 2
+        assert "expired" not in cache
+
+    def test_least_recently_used_entry_is_evicted(self) -> None:
+        cache = TTLCache(maxsize=2, ttl=10)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.get("a")
+        cache.set("c", 3)
+
+        assert "a" in cache
+        assert "b" not in cache
+        assert "c" in cache
+        assert cache.stats()["evictions"] == 1
+
+    def test_zero_size_disables_cache(self) -> None:
+        cache = TTLCache(maxsize=0, ttl=10)
+        cache.set("a", 1)
+
+        assert not cache.enabled
+        assert cache.get("a") is None
@@ -0,0 +1,83 @@
+# Copyright 2021 99cloud
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import asyncio
+import contextvars
+import threading
+
+import pytest
+
+from skyline_apiserver.utils.executor import BlockingExecutor, ExecutorBusy, bind_context
+
+VALUE: contextvars.ContextVar[str] = contextvars.ContextVar("value", default="unset")
+
+
+def test_bind_context_runs_in_a_copy_of_the_context() -> None:
+    token = VALUE.set("request")
+    try:
+        call = bind_context(lambda suffix: VALUE.get() + suffix, suffix="-1")
+    finally:
+        VALUE.reset(token)
+    results = []
+    thread = threading.Thread(target=lambda: results.append(call()))
+    thread.start()
+    thread.join()
+
+    assert results == ["request-1"]
+    assert VALUE.get() == "unset"
+
+
+class TestBlockingExecutor:
+    def setup_method(self):
+        self.executor = BlockingExecutor("test", max_workers=1, max_queue=1)
+
+    def teardown_method(self):
+        self.executor.shutdown()
+
+    def test_run_returns_result_and_records_latency(self) -> None:
+        result = asyncio.run(self.executor.run(lambda a, b=0: a + b, 1, b=2))
+        stats = self.executor.stats()
+
+        assert result == 3
+        assert stats["completed"] == 1
+        assert stats["queued"] == stats["running"] == 0
+        assert stats["run_max"] >= stats["run_avg"] >= 0
+
+    def test_error_is_raised_and_counted(self) -> None:
+        def fail():
+            raise ValueError("boom")
+
+        with pytest.raises(ValueError):
+            asyncio.run(self.executor.run(fail))
+        assert self.executor.stats()["failed"] == 1
+
+    def test_full_queue_rejects_calls(self) -> None:
+        release = threading.Event()
+
+        async def run():
+            # The first call takes the only thread, the second one waits.
+            calls = []
+            for _ in range(2):
+                calls.append(asyncio.ensure_future(self.executor.run(release.wait)))
+                await asyncio.sleep(0.05)
+            with pytest.raises(ExecutorBusy):
+                await self.executor.run(release.wait)
+            release.set()
+            await asyncio.gather(*calls)
+
+        asyncio.run(run())
+        stats = self.executor.stats()
+        assert stats["rejected"] == 1
+        assert stats["max_queued"] == 1
+        assert stats["completed"] == 2
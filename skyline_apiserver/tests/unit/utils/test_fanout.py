@@ -0,0 +1,86 @@
+# Copyright 2021 99cloud
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from skyline_apiserver.utils.fanout import FanOut
+
+
+class TestFanOut:
+    def setup_method(self):
+        self.executor = ThreadPoolExecutor(max_workers=4)
+
+    def teardown_method(self):
+        self.executor.shutdown()
+
+    def test_phases_run_concurrently(self) -> None:
+        fanout = FanOut(max_concurrency=3, executor=self.executor)
+        barrier = threading.Barrier(3, timeout=5)
+
+        futures = [fanout.submit(phase, barrier.wait) for phase in ("a", "b", "c")]
+        fanout.wait()
+
+        # Every call reached the barrier, so they all ran at the same time.
+        assert sorted(future.result() for future in futures) == [0, 1, 2]
+        assert set(fanout.timings()) == {"a", "b", "c"}
+
+    def test_concurrency_is_limited(self) -> None:
+        fanout = FanOut(max_concurrency=2, executor=self.executor)
+        lock = threading.Lock()
+        running = []
+        peak = []
+
+        def call():
+            with lock:
+                running.append(1)
+                peak.append(len(running))
+            time.sleep(0.02)
+            with lock:
+                running.pop()
+
+        for _ in range(6):
+            fanout.submit("batch", call)
+        fanout.wait()
+
+        assert max(peak) == 2
+        assert len(peak) == 6
+
+    def test_phase_timing_spans_its_calls(self) -> None:
+        fanout = FanOut(max_concurrency=1, executor=self.executor)
+
+        for _ in range(2):
+            fanout.submit("batch", time.sleep, 0.02)
+        with fanout.timer("inline"):
+            pass
+        fanout.wait()
+
+        timings = fanout.timings()
+        assert timings["batch"] >= 40
+        assert "batch;dur=" in fanout.server_timing()
+
+    def test_error_cancels_pending_calls(self) -> None:
+        fanout = FanOut(max_concurrency=1, executor=self.executor)
+
+        def fail():
+            raise ValueError("boom")
+
+        fanout.submit("fail", fail)
+        pending = fanout.submit("pending", time.sleep, 0)
+        with pytest.raises(ValueError):
+            fanout.wait()
+        assert pending.cancelled()
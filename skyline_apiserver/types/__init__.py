@@ -27,6 +27,11 @@ class InterfaceType(str, Enum):
     public = "public"
 
 
+class JSONLibrary(str, Enum):
+    orjson = "orjson"
+    json = "json"
+
+
 SchemaT = Dict[str, Any]
 EnvT = Optional[Dict[str, str]]
 
@@ -37,6 +37,8 @@ EXTENSION_API_LIMIT_GT = 0
 
 ID_UUID_RANGE_STEP = 100
 
+EXTENSION_STREAM_PAGE_SIZE = 500
+
 SETTINGS_HIDDEN_SET: Set = set()
 SETTINGS_RESTART_SET: Set = set()
 
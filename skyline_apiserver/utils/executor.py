@@ -0,0 +1,141 @@
+# Copyright 2021 99cloud
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from __future__ import annotations
+
+import asyncio
+import contextvars
+import functools
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, TypeVar
+
+T = TypeVar("T")
+
+
+def bind_context(func: Callable[..., T], *args: Any, **kwargs: Any) -> Callable[[], T]:
+    """Bind a call to a copy of the current context, to run it in another thread.
+
+    Contextvars such as the current database session stay visible to the call.
+    """
+    return functools.partial(contextvars.copy_context().run, func, *args, **kwargs)
+
+
+class ExecutorBusy(RuntimeError):
+    """Raised when the wait queue of a ``BlockingExecutor`` is full."""
+
+
+class BlockingExecutor:
+    """Bounded thread pool running blocking calls on behalf of async code.
+
+    ``max_workers`` bounds the number of concurrent calls, ``max_queue``
+    bounds the number of calls waiting for a free thread. A ``max_queue``
+    lower than or equal to zero never rejects a call.
+    """
+
+    def __init__(self, name: str, max_workers: int, max_queue: int = 0) -> None:
+        self.name = name
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self.submitted = 0
+        self.rejected = 0
+        self.failed = 0
+        self.queued = 0
+        self.running = 0
+        self.max_queued = 0
+        self._completed = 0
+        self._wait_total = 0.0
+        self._wait_max = 0.0
+        self._run_total = 0.0
+        self._run_max = 0.0
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix=name)
+
+    async def run(self, func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        with self._lock:
+            if 0 < self.max_queue <= self.queued:
+                self.rejected += 1
+                raise ExecutorBusy(f"Too many pending {self.name} calls")
+            self.submitted += 1
+            self.queued += 1
+            self.max_queued = max(self.max_queued, self.queued)
+
+        submitted_at = time.monotonic()
+        call = bind_context(func, *args, **kwargs)
+        dequeued = threading.Event()
+
+        def _dequeue() -> None:
+            # Called with the lock held, either by the thread starting the
+            # call or by a caller cancelled while the call was still waiting.
+            if not dequeued.is_set():
+                dequeued.set()
+                self.queued -= 1
+
+        def _run() -> T:
+            started_at = time.monotonic()
+            with self._lock:
+                _dequeue()
+                self.running += 1
+            ok = False
+            try:
+                result = call()
+                ok = True
+                return result
+            finally:
+                elapsed = time.monotonic() - started_at
+                with self._lock:
+                    self.running -= 1
+                    self._completed += 1
+                    self.failed += not ok
+                    self._record(started_at - submitted_at, elapsed)
+
+        loop = asyncio.get_running_loop()
+        try:
+            return await loop.run_in_executor(self._executor, _run)
+        except asyncio.CancelledError:
+            with self._lock:
+                _dequeue()
+            raise
+
+    def _record(self, wait: float, elapsed: float) -> None:
+        self._wait_total += wait
+        self._wait_max = max(self._wait_max, wait)
+        self._run_total += elapsed
+        self._run_max = max(self._run_max, elapsed)
+
+    def shutdown(self, wait: bool = True) -> None:
+        self._executor.shutdown(wait=wait)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            completed = self._completed
+            return {
+                "max_workers": self.max_workers,
+                "max_queue": self.max_queue,
+                "submitted": self.submitted,
+                "completed": completed,
+                "failed": self.failed,
+                "rejected": self.rejected,
+                "queued": self.queued,
+                "max_queued": self.max_queued,
+                "running": self.running,
+                "wait_avg": self._wait_total / completed if completed else 0.0,
+                "wait_max": self._wait_max,
+                "run_avg": self._run_total / completed if completed else 0.0,
+                "run_max": self._run_max,
+            }
+
+
+__all__ = ("BlockingExecutor", "ExecutorBusy", "bind_context")
@@ -0,0 +1,147 @@
+# Copyright 2021 99cloud
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from __future__ import annotations
+
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_EXCEPTION, Future, ThreadPoolExecutor, wait
+from contextlib import contextmanager
+from typing import Any, Callable, Deque, Dict, Iterator, List, Optional, Tuple
+
+from skyline_apiserver.config import CONF
+from skyline_apiserver.utils.executor import bind_context
+
+FANOUT_EXECUTOR: Optional[ThreadPoolExecutor] = None
+
+
+def get_fanout_executor() -> ThreadPoolExecutor:
+    global FANOUT_EXECUTOR
+    if FANOUT_EXECUTOR is None:
+        FANOUT_EXECUTOR = ThreadPoolExecutor(
+            max_workers=CONF.default.fanout_executor_workers,
+            thread_name_prefix="fanout",
+        )
+    return FANOUT_EXECUTOR
+
+
+def shutdown_fanout_executor() -> None:
+    global FANOUT_EXECUTOR
+    if FANOUT_EXECUTOR is not None:
+        FANOUT_EXECUTOR.shutdown(wait=False)
+        FANOUT_EXECUTOR = None
+
+
+class FanOut:
+    """Run the independent calls of one request concurrently.
+
+    Calls are grouped in named phases, at most ``max_concurrency`` of them
+    run at the same time, the others wait in submission order. The wall
+    time of every phase, from the start of its first call to the end of its
+    last one, is available from ``timings``.
+    """
+
+    def __init__(
+        self,
+        max_concurrency: int,
+        executor: Optional[ThreadPoolExecutor] = None,
+    ) -> None:
+        self.max_concurrency = max(1, max_concurrency)
+        self._executor = executor or get_fanout_executor()
+        self._lock = threading.Lock()
+        self._running = 0
+        self._pending: Deque[Tuple[str, Callable[[], Any], Future]] = deque()
+        self._futures: List[Future] = []
+        self._spans: Dict[str, List[float]] = {}
+
+    def submit(self, phase: str, func: Callable[..., Any], *args: Any, **kwargs: Any) -> Future:
+        future: Future = Future()
+        call = bind_context(func, *args, **kwargs)
+        with self._lock:
+            self._futures.append(future)
+            if self._running >= self.max_concurrency:
+                self._pending.append((phase, call, future))
+                return future
+            self._running += 1
+        self._executor.submit(self._run, phase, call, future)
+        return future
+
+    def _run(self, phase: str, call: Callable[[], Any], future: Future) -> None:
+        if future.set_running_or_notify_cancel():
+            result: Any = None
+            error: Optional[BaseException] = None
+            # The span is recorded before the caller is woken up.
+            with self.timer(phase):
+                try:
+                    result = call()
+                except BaseException as e:
+                    error = e
+            if error is None:
+                future.set_result(result)
+            else:
+                # The request fails anyway, do not start its other calls.
+                self._cancel_pending()
+                future.set_exception(error)
+        with self._lock:
+            following = self._pending.popleft() if self._pending else None
+            if following is None:
+                self._running -= 1
+        if following is not None:
+            self._executor.submit(self._run, *following)
+
+    def _cancel_pending(self) -> None:
+        with self._lock:
+            pending = list(self._pending)
+        for _, _, future in pending:
+            future.cancel()
+
+    @contextmanager
+    def timer(self, phase: str) -> Iterator[None]:
+        """Account the wrapped block to ``phase``."""
+        started_at = time.monotonic()
+        try:
+            yield
+        finally:
+            ended_at = time.monotonic()
+            with self._lock:
+                span = self._spans.setdefault(phase, [started_at, ended_at])
+                span[0] = min(span[0], started_at)
+                span[1] = max(span[1], ended_at)
+
+    def wait(self) -> None:
+        """Wait for every call, raise the first error and cancel the rest."""
+        done, not_done = wait(self._futures, return_when=FIRST_EXCEPTION)
+        for future in done:
+            if not future.cancelled() and future.exception() is not None:
+                for other in not_done:
+                    other.cancel()
+                raise future.exception()  # type: ignore
+
+    def timings(self) -> Dict[str, float]:
+        """Return the wall time of every phase in milliseconds."""
+        with self._lock:
+            return {
+                phase: (ended_at - started_at) * 1e3
+                for phase, (started_at, ended_at) in self._spans.items()
+            }
+
+    def server_timing(self) -> str:
+        """Format ``timings`` as the value of a ``Server-Timing`` header."""
+        return ", ".join(
+            f"{phase};dur={elapsed:.1f}" for phase, elapsed in self.timings().items()
+        )
+
+
+__all__ = ("FanOut", "get_fanout_executor", "shutdown_fanout_executor")
@@ -0,0 +1,68 @@
+# Copyright 2021 99cloud
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from __future__ import annotations
+
+import asyncio
+from typing import Any, Awaitable, Callable, List, Optional
+
+from skyline_apiserver.log import LOG
+
+
+async def run_periodically(
+    name: str,
+    interval: float,
+    func: Callable[[], Awaitable[Any]],
+) -> None:
+    """Await ``func`` every ``interval`` seconds until cancelled.
+
+    Errors are logged and never stop the loop.
+    """
+    while True:
+        try:
+            await func()
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            LOG.warning(f"Periodic task {name} failed: {e}")
+        await asyncio.sleep(interval)
+
+
+class PeriodicTasks:
+    """Background tasks bound to the application lifespan."""
+
+    def __init__(self) -> None:
+        self._tasks: List[asyncio.Task] = []
+
+    def start(
+        self,
+        name: str,
+        interval: float,
+        func: Callable[[], Awaitable[Any]],
+    ) -> Optional[asyncio.Task]:
+        if interval <= 0:
+            LOG.debug(f"Periodic task {name} is disabled")
+            return None
+        task = asyncio.create_task(run_periodically(name, interval, func), name=name)
+        self._tasks.append(task)
+        return task
+
+    async def stop(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks.clear()
+
+
+__all__ = ("PeriodicTasks", "run_periodically")
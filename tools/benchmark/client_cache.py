@@ -0,0 +1,135 @@
+# Copyright 2021 99cloud
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Measure the cost of building the OpenStack clients of one request.
+
+A request of the extension API builds a keystone, nova, cinder, neutron and
+image client. The clients are built from a session authenticated with a
+fixture token, every service is served by a local stub answering the
+version discovery of keystoneclient. The default configuration is used.
+
+Usage: python tools/benchmark/client_cache.py [-n NUMBER]
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import threading
+import timeit
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any
+
+from keystoneauth1 import access
+from keystoneauth1.identity.v3 import Token
+from keystoneauth1.session import Session
+
+from skyline_apiserver.client import utils
+from skyline_apiserver.config import CONF, configure
+from skyline_apiserver.utils.cache import TTLCache
+
+REGION = "RegionOne"
+SERVICES = (
+    ("identity", "keystone", "/identity/v3"),
+    ("compute", "nova", "/compute/v2.1"),
+    ("block-storage", "cinderv3", "/volume/v3"),
+    ("network", "neutron", "/network"),
+    ("image", "glance", "/image"),
+)
+
+
+class _VersionHandler(BaseHTTPRequestHandler):
+    def do_GET(self) -> None:
+        href = f"http://{self.headers['Host']}{self.path}"
+        body = json.dumps(
+            {
+                "version": {
+                    "id": "v3.14",
+                    "status": "stable",
+                    "links": [{"rel": "self", "href": href}],
+                },
+            },
+        ).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args: Any) -> None:
+        pass
+
+
+def _serve() -> str:
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _VersionHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return f"http://127.0.0.1:{server.server_port}"
+
+
+def _session(base_url: str) -> Session:
+    expires_at = datetime.now(timezone.utc) + timedelta(hours=1)
+    catalog = [
+        {
+            "type": service_type,
+            "name": name,
+            "endpoints": [
+                {"interface": "public", "region_id": REGION, "url": f"{base_url}{path}"},
+            ],
+        }
+        for service_type, name, path in SERVICES
+    ]
+    body = {
+        "token": {
+            "expires_at": expires_at.strftime("%Y-%m-%dT%H:%M:%S.000000Z"),
+            "project": {"id": "project", "name": "project", "domain": {"id": "default"}},
+            "user": {"id": "user", "name": "user", "domain": {"id": "default"}},
+            "catalog": catalog,
+        },
+    }
+    auth = Token(auth_url=f"{base_url}/identity/v3", token="token")
+    auth.auth_ref = access.create(body=body, auth_token="token")
+    return Session(auth=auth, session=utils.get_http_session())
+
+
+def _build_clients(session: Session) -> None:
+    utils.keystone_client(session=session, region=REGION)
+    utils.nova_client(session=session, region=REGION)
+    utils.cinder_client(session=session, region=REGION)
+    utils.neutron_client(session=session, region=REGION)
+    utils.image_client(session=session, region=REGION)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("-n", "--number", type=int, default=200)
+    args = parser.parse_args()
+
+    configure("skyline", setup=False)
+    for group in CONF.values():
+        for opt in group.values():
+            opt.load(None)
+    session = _session(_serve())
+
+    results = {}
+    for name, maxsize in (("uncached", 0), ("cached", CONF.default.client_cache_size)):
+        utils.CLIENTS = TTLCache(maxsize=maxsize, ttl=CONF.default.keystone_session_pool_ttl)
+        elapsed = timeit.timeit(lambda: _build_clients(session), number=args.number)
+        results[name] = elapsed / args.number * 1e3
+        print(f"{name:>8}: {results[name]:8.3f} ms per request")
+    print(f" speedup: {results['uncached'] / results['cached']:8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
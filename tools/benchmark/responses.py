@@ -0,0 +1,148 @@
+# Copyright 2021 99cloud
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Measure the serialization throughput of a ServersResponse.
+
+The response lists synthetic servers with the origin data of a nova server
+listing. It is validated once, then written by:
+
+- json: the response model serialized to python objects, written by the
+  json module as the JSONResponse of starlette does,
+- pydantic: the response model serialized to JSON by pydantic, as FastAPI
+  does for the routes of an application without a default response class,
+- orjson: the response model serialized to python objects, written by
+  APIJSONResponse with orjson,
+- trusted: the servers as built by the handler, written by model_response
+  with orjson and validate_responses disabled.
+
+Usage: python tools/benchmark/responses.py [-n NUMBER] [-s SERVERS]
+"""
+
+from __future__ import annotations
+
+import argparse
+import timeit
+import uuid
+from typing import Any, Dict, List
+
+from fastapi.utils import create_model_field
+from starlette.responses import JSONResponse
+
+from skyline_apiserver import schemas
+from skyline_apiserver.api.responses import APIJSONResponse, model_response
+from skyline_apiserver.api.wrapper.skyline import Server
+from skyline_apiserver.config import CONF, configure
+
+
+def _servers(count: int) -> List[Dict[str, Any]]:
+    servers = []
+    for i in range(count):
+        info = {
+            "id": str(uuid.uuid4()),
+            "name": f"server-{i}",
+            "tenant_id": uuid.uuid4().hex,
+            "user_id": uuid.uuid4().hex,
+            "status": "ACTIVE",
+            "image": {"id": str(uuid.uuid4()), "links": []},
+            "flavor": {
+                "original_name": "m1.small",
+                "vcpus": 1,
+                "ram": 2048,
+                "disk": 20,
+                "ephemeral": 0,
+                "swap": 0,
+                "extra_specs": {"hw_rng:allowed": "True"},
+            },
+            "addresses": {
+                "private": [
+                    {
+                        "addr": f"10.0.{i // 250 % 250}.{i % 250}",
+                        "version": 4,
+                        "OS-EXT-IPS:type": "fixed",
+                        "OS-EXT-IPS-MAC:mac_addr": "fa:16:3e:00:00:01",
+                    },
+                    {
+                        "addr": f"172.24.{i // 250 % 250}.{i % 250}",
+                        "version": 4,
+                        "OS-EXT-IPS:type": "floating",
+                        "OS-EXT-IPS-MAC:mac_addr": "fa:16:3e:00:00:01",
+                    },
+                ],
+            },
+            "links": [
+                {"rel": "self", "href": f"http://nova/v2.1/servers/{i}"},
+                {"rel": "bookmark", "href": f"http://nova/servers/{i}"},
+            ],
+            "created": "2021-01-01T00:00:00Z",
+            "updated": "2021-01-01T00:00:00Z",
+            "key_name": None,
+            "locked": False,
+            "metadata": {"owner": "benchmark"},
+            "security_groups": [{"name": "default"}],
+            "OS-EXT-AZ:availability_zone": "nova",
+            "OS-EXT-SRV-ATTR:host": f"compute-{i % 10}",
+            "OS-EXT-SRV-ATTR:hostname": f"server-{i}",
+            "OS-EXT-SRV-ATTR:instance_name": f"instance-{i:08x}",
+            "OS-EXT-SRV-ATTR:root_device_name": "/dev/vda",
+            "OS-EXT-STS:task_state": None,
+            "OS-EXT-STS:vm_state": "active",
+            "OS-EXT-STS:power_state": 1,
+            "OS-SRV-USG:launched_at": "2021-01-01T00:00:00.000000",
+            "os-extended-volumes:volumes_attached": [{"id": str(uuid.uuid4())}],
+        }
+        server, origin_data = Server(info).to_dicts()
+        server["origin_data"] = origin_data
+        server["project_name"] = "benchmark"
+        server["image_name"] = "cirros"
+        servers.append(server)
+    return servers
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("-n", "--number", type=int, default=5)
+    parser.add_argument("-s", "--servers", type=int, default=10000)
+    args = parser.parse_args()
+
+    configure("skyline", setup=False)
+    for group in CONF.values():
+        for opt in group.values():
+            opt.load(False if opt.name == "validate_responses" else None)
+
+    field = create_model_field(
+        name="Response",
+        type_=schemas.ServersResponse,
+        mode="serialization",
+    )
+    servers = _servers(args.servers)
+    response = schemas.ServersResponse(servers=servers)
+    size = len(field.serialize_json(response))
+    print(f"{args.servers} servers, {size / 1e6:.1f} MB")
+
+    writers = (
+        ("json", lambda: JSONResponse(field.serialize(response)).body),
+        ("pydantic", lambda: field.serialize_json(response)),
+        ("orjson", lambda: APIJSONResponse(field.serialize(response)).body),
+        ("trusted", lambda: model_response(schemas.ServersResponse, {"servers": servers}).body),
+    )
+    results = {}
+    for name, write in writers:
+        elapsed = timeit.timeit(write, number=args.number) / args.number
+        results[name] = elapsed
+        print(f"{name:>9}: {elapsed * 1e3:8.1f} ms {size / elapsed / 1e6:8.1f} MB/s")
+    print(f"  speedup: {results['json'] / results['orjson']:8.1f}x over json")
+
+
+if __name__ == "__main__":
+    main()
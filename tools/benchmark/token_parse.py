@@ -0,0 +1,61 @@
+# Copyright 2021 99cloud
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Compare cached and uncached decoding of the session cookie.
+
+The default configuration is used.
+
+Usage: python tools/benchmark/token_parse.py [-n NUMBER]
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+import timeit
+import uuid
+
+from skyline_apiserver import schemas
+from skyline_apiserver.config import CONF, configure
+from skyline_apiserver.core import security
+from skyline_apiserver.utils.cache import TTLCache
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("-n", "--number", type=int, default=20000)
+    args = parser.parse_args()
+
+    configure("skyline", setup=False)
+    for group in CONF.values():
+        for opt in group.values():
+            opt.load(None)
+    cookie = schemas.Payload(
+        keystone_token="gAAAAAB" + "x" * 180,
+        region="RegionOne",
+        exp=int(time.time()) + CONF.default.access_token_expire,
+        uuid=uuid.uuid4().hex,
+    ).toJWTPayload()
+
+    results = {}
+    for name, maxsize in (("uncached", 0), ("cached", 1024)):
+        security.TOKEN_CACHE = TTLCache(maxsize=maxsize, ttl=CONF.default.access_token_expire)
+        elapsed = timeit.timeit(lambda: security.parse_access_token(cookie), number=args.number)
+        results[name] = elapsed / args.number * 1e6
+        print(f"{name:>8}: {results[name]:8.2f} us per call")
+    print(f" speedup: {results['uncached'] / results['cached']:8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
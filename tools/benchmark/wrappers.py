@@ -0,0 +1,120 @@
+# Copyright 2021 99cloud
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Measure the cost of building the server views of /extension/servers.
+
+Every server of the listing is turned into the skyline view and the origin
+data. The servers are novaclient resources built from synthetic payloads.
+The per-field walk the wrappers used to do is kept here as the reference.
+
+Usage: python tools/benchmark/wrappers.py [-n NUMBER] [-s SERVERS]
+"""
+
+from __future__ import annotations
+
+import argparse
+import timeit
+from typing import Any, Dict, List, Tuple
+
+from novaclient.v2.servers import Server as NovaServer
+
+from skyline_apiserver.api.wrapper.openstack import OSServer
+from skyline_apiserver.api.wrapper.skyline import Server
+
+
+def _servers(count: int) -> List[NovaServer]:
+    servers = []
+    for i in range(count):
+        info = {
+            "id": f"00000000-0000-0000-0000-{i:012d}",
+            "name": f"server-{i}",
+            "tenant_id": f"project-{i % 50}",
+            "user_id": "user",
+            "status": "ACTIVE",
+            "image": {"id": f"image-{i % 20}"},
+            "flavor": {"original_name": "m1.small", "vcpus": 1, "ram": 2048, "disk": 20},
+            "addresses": {
+                "private": [
+                    {"addr": f"10.0.{i // 250 % 250}.{i % 250}", "OS-EXT-IPS:type": "fixed"},
+                    {"addr": f"172.24.{i // 250 % 250}.{i % 250}", "OS-EXT-IPS:type": "floating"},
+                ],
+            },
+            "created": "2021-01-01T00:00:00Z",
+            "updated": "2021-01-01T00:00:00Z",
+            "locked": False,
+            "metadata": {},
+            "OS-EXT-SRV-ATTR:host": f"compute-{i % 10}",
+            "OS-EXT-SRV-ATTR:hostname": f"server-{i}",
+            "OS-EXT-SRV-ATTR:root_device_name": "/dev/vda",
+            "OS-EXT-STS:task_state": None,
+            "OS-EXT-STS:vm_state": "active",
+            "OS-EXT-STS:power_state": 1,
+            "os-extended-volumes:volumes_attached": [{"id": f"volume-{i}"}],
+        }
+        servers.append(NovaServer(None, info, loaded=True))
+    return servers
+
+
+def _per_field(server: Any) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+    """The views as built before the extractors were compiled."""
+    origin_data = OSServer(server).to_dict()
+
+    def get_value(key: str) -> Any:
+        if isinstance(server, dict):
+            return server.get(key, None)
+        return getattr(server, key, None)
+
+    obj: Dict[str, Any] = {}
+    for key, value in Server._attrs_mapping.items():
+        if key == "flavor":
+            flavor = get_value("flavor")
+            obj[key] = flavor["original_name"] if flavor else None
+        elif value in ("fixed_addresses", "floating_addresses"):
+            address_type = value.split("_")[0]
+            obj[key] = [
+                address.get("addr")
+                for addresses in get_value("addresses").values()
+                for address in addresses
+                if address.get("OS-EXT-IPS:type") == address_type
+            ]
+        elif value == "image":
+            image = get_value("image")
+            obj[key] = image["id"] if image else None
+        else:
+            obj[key] = get_value(value)
+    return obj, origin_data
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("-n", "--number", type=int, default=5)
+    parser.add_argument("-s", "--servers", type=int, default=10000)
+    args = parser.parse_args()
+
+    servers = _servers(args.servers)
+    assert [_per_field(s) for s in servers[:10]] == [Server(s).to_dicts() for s in servers[:10]]
+
+    results = {}
+    for name, build in (
+        ("per-field", _per_field),
+        ("compiled", lambda server: Server(server).to_dicts()),
+    ):
+        elapsed = timeit.timeit(lambda: [build(s) for s in servers], number=args.number)
+        results[name] = elapsed / args.number * 1e3
+        print(f"{name:>9}: {results[name]:8.1f} ms per {args.servers} servers")
+    print(f"  speedup: {results['per-field'] / results['compiled']:8.1f}x")
+
+
+if __name__ == "__main__":
+    main()